@@ -0,0 +1,68 @@
+# /*************************************************************************
+# *
+# * Copyright 2025 highstreet technologies and others
+# *
+# * Licensed under the Apache License, Version 2.0 (the "License");
+# * you may not use this file except in compliance with the License.
+# * You may obtain a copy of the License at
+# *
+# *     http://www.apache.org/licenses/LICENSE-2.0
+# *
+# * Unless required by applicable law or agreed to in writing, software
+# * distributed under the License is distributed on an "AS IS" BASIS,
+# * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# * See the License for the specific language governing permissions and
+# * limitations under the License.
+# ***************************************************************************/
+
+"""
+Compares the CPU cost of gzip compression with the bytes it saves on the VES bodies sent by PyNTS.
+
+Usage (from /app inside the container):
+    python3 -m benchmark.compression [--iterations N] [--levels 1,6,9]
+"""
+
+import argparse
+import gzip
+import json
+import timeit
+
+from benchmark.serializer import ForwardedNotification, config_change_notification, message_shapes
+from core.ves import VesEvent
+from util import serializer
+
+def bodies() -> dict[str, bytes]:
+    bodies = {}
+    for name, data in message_shapes().items():
+        bodies[name] = serializer.dumps_bytes(data)
+
+    notification = ForwardedNotification(json.loads(config_change_notification(2000)))
+    notification.update()
+    bodies["stndDefined 2000 edits"] = serializer.dumps_bytes(notification.data)
+
+    # a VES eventList holds events of one domain (and stndDefined namespace) only, like the batches of the VES workers
+    events = []
+    for i in range(20):
+        notification = ForwardedNotification(json.loads(config_change_notification(10 + i)))
+        notification.update()
+        events.append(serializer.dumps_bytes(notification.data["event"]))
+    bodies["eventList of 20 stndDefined"] = VesEvent.event_list_body(events)
+    return bodies
+
+def run(iterations: int, levels: list[int]) -> None:
+    print(f"{'body':<30} {'bytes':>8}" + "".join(f" {'L' + str(level) + ' bytes':>10} {'L' + str(level) + ' us':>10}" for level in levels))
+    for name, body in bodies().items():
+        line = f"{name:<30} {len(body):>8}"
+        for level in levels:
+            size = len(gzip.compress(body, compresslevel=level, mtime=0))
+            seconds = timeit.timeit(lambda: gzip.compress(body, compresslevel=level, mtime=0), number=iterations)
+            line = line + f" {size:>10} {seconds / iterations * 1_000_000:>10.2f}"
+        print(line)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="PyNTS VES gzip benchmark")
+    parser.add_argument('--iterations', type=int, default=500, help='compressions per body and level')
+    parser.add_argument('--levels', type=str, default="1,6,9", help='comma-separated gzip levels to compare')
+    args = parser.parse_args()
+
+    run(args.iterations, [int(level) for level in args.levels.split(",")])
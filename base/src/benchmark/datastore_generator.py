@@ -0,0 +1,257 @@
+# /*************************************************************************
+# *
+# * Copyright 2025 highstreet technologies and others
+# *
+# * Licensed under the Apache License, Version 2.0 (the "License");
+# * you may not use this file except in compliance with the License.
+# * You may obtain a copy of the License at
+# *
+# *     http://www.apache.org/licenses/LICENSE-2.0
+# *
+# * Unless required by applicable law or agreed to in writing, software
+# * distributed under the License is distributed on an "AS IS" BASIS,
+# * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# * See the License for the specific language governing permissions and
+# * limitations under the License.
+# ***************************************************************************/
+
+"""
+Synthetic datastore content for scale tests: expands seed templates to the requested number of
+list entries, validates the result with libyang against the YANG modules installed in sysrepo
+(together with the other running seed files of the template directory), and writes it as LYB
+files, <module>-running.lyb, which PyNTS loads from /data like the JSON and XML seed files. It refuses
+to write an LYB file next to a JSON or XML seed file of the same module, as both would be loaded.
+
+The entries of the template are kept, the others are copies of them: the key and all values equal
+to it get a new name, MAC and IPv4 addresses get new, unique values drawn from a random generator
+seeded with --seed, so the same arguments always produce the same content.
+
+Usage (from /app inside the container):
+    python3 -m benchmark.datastore_generator [--interfaces 10000] [--carriers 100] [--components 500] [--seed 1] [--templates /data] [--output /data]
+"""
+
+import argparse
+import copy
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+
+from libyang.util import LibyangError
+
+# scale -> (module, lists to expand as JSON member paths, key of the list entries)
+SCALES = {
+    "interfaces": ("ietf-interfaces", [("ietf-interfaces:interfaces", "interface")], "name"),
+    "carriers": ("o-ran-uplane-conf", [("o-ran-uplane-conf:user-plane-configuration", "tx-array-carriers"),
+                                       ("o-ran-uplane-conf:user-plane-configuration", "rx-array-carriers")], "name"),
+    "components": ("ietf-hardware", [("ietf-hardware:hardware", "component")], "name")
+}
+
+MAC_RE = re.compile(r'^[0-9a-fA-F]{2}(:[0-9a-fA-F]{2}){5}$')
+IPV4_RE = re.compile(r'^(\d{1,3}\.){3}\d{1,3}$')
+
+class GeneratorError(Exception):
+    pass
+
+"""
+DatastoreGenerator
+----
+Expands the seed templates of a directory, see the module description. The context is the
+libyang context of the sysrepo connection, with all YANG modules of the simulated network element.
+"""
+class DatastoreGenerator:
+    def __init__(self, ctx, templates: str, seed: int) -> None:
+        self.ctx = ctx
+        self.templates = templates
+        self.seed = seed
+
+    def find_template(self, module: str) -> str:
+        for name in [f"{module}-running-template.json", f"{module}-template.json", f"{module}-running.json", f"{module}-running.xml"]:
+            path = os.path.join(self.templates, name)
+            if os.path.exists(path):
+                return path
+        raise GeneratorError(f"no template for module {module} in {self.templates}")
+
+    def load_template(self, path: str) -> dict:
+        """Returns the data of a JSON or XML template as a JSON dictionary."""
+        with open(path, 'rb') as file:
+            content = file.read()
+        if path.endswith(".json"):
+            return json.loads(content)
+
+        data = self.ctx.parse_data_mem(content.decode("utf-8"), "xml", parse_only=True)
+        try:
+            return json.loads(data.print_mem("json", with_siblings=True))
+        finally:
+            data.free()
+
+    def expand(self, entries: list, key: str, count: int, rng: random.Random, used: set) -> int:
+        """Appends copies of the entries until there are count of them, returns the number of copies."""
+        prototypes = list(entries)
+        if len(prototypes) == 0:
+            raise GeneratorError("the template list has no entry to copy")
+
+        for i in range(len(prototypes), count):
+            prototype = prototypes[i % len(prototypes)]
+            entries.append(self.copy_entry(prototype, prototype[key], f"{prototype[key]}-{i}", rng, used))
+        return max(0, count - len(prototypes))
+
+    def copy_entry(self, value, name: str, new_name: str, rng: random.Random, used: set):
+        if isinstance(value, dict):
+            return {key: self.copy_entry(child, name, new_name, rng, used) for key, child in value.items()}
+        if isinstance(value, list):
+            return [self.copy_entry(child, name, new_name, rng, used) for child in value]
+        if not isinstance(value, str):
+            return copy.copy(value)
+
+        if value == name:
+            # the key, and the values referring to it, e.g. o-ran-hardware:o-ran-name
+            return new_name
+        if MAC_RE.match(value):
+            return self.unique(used, lambda: "02:" + ":".join(f"{rng.randrange(256):02x}" for _ in range(5)))
+        if IPV4_RE.match(value):
+            return self.unique(used, lambda: f"10.{rng.randrange(256)}.{rng.randrange(256)}.{rng.randrange(1, 255)}")
+        return value
+
+    @staticmethod
+    def unique(used: set, draw) -> str:
+        value = draw()
+        while value in used:
+            value = draw()
+        used.add(value)
+        return value
+
+    def generate(self, scales: dict[str, int]) -> dict[str, dict]:
+        """Returns the generated JSON data per module, for the scales with a count above 0."""
+        generated = {}
+        for scale, count in scales.items():
+            if count <= 0:
+                continue
+            module, paths, key = SCALES[scale]
+            template = self.find_template(module)
+            data = self.load_template(template)
+
+            # a generator per scale, so that the values of one scale do not depend on the others
+            rng = random.Random(f"{self.seed}:{scale}")
+            used: set[str] = set()
+            for path in paths:
+                node = data
+                for name in path[:-1]:
+                    node = node.get(name, {})
+                if path[-1] not in node:
+                    raise GeneratorError(f"template {template} has no list {'/'.join(path)}")
+                added = self.expand(node[path[-1]], key, count, rng, used)
+                print(f"{scale}: {'/'.join(path)} from {template}, {added} entries added to {count - added}")
+            generated[module] = data
+        return generated
+
+    def parse(self, generated: dict[str, dict]) -> dict:
+        """Returns the data tree of each generated module; the trees must be freed by the caller."""
+        trees = {}
+        try:
+            for module, data in generated.items():
+                trees[module] = self.ctx.parse_data_mem(json.dumps(data), "json", parse_only=True, strict=True)
+        except LibyangError:
+            for tree in trees.values():
+                tree.free()
+            raise
+        return trees
+
+    def validate(self, trees: dict) -> None:
+        """Validates the generated trees as running datastore, with the running seed files of the other modules."""
+        from core.netconf import Netconf
+
+        others = []
+        merged = None
+        try:
+            for ds_file in Netconf.get_datastore_files(self.templates, "json|xml|lyb"):
+                if ds_file['datastore'] != "running" or ds_file['module_name'] in trees:
+                    continue
+                with open(ds_file['filename'], 'rb') as file:
+                    others.append(self.ctx.parse_data_file(file, ds_file['extension'], parse_only=True))
+
+            for tree in list(trees.values()) + others:
+                if merged is None:
+                    merged = tree.duplicate(with_siblings=True, recursive=True)
+                else:
+                    merged.merge(tree, with_siblings=True)
+            if merged is not None:
+                merged.validate(no_state=True)
+        finally:
+            if merged is not None:
+                merged.free()
+            for tree in others:
+                tree.free()
+
+    @staticmethod
+    def check_output(modules: list[str], output: str) -> None:
+        """
+        PyNTS loads every seed file of a module, so a generated LYB file must not be written next to a JSON
+        or XML seed file of the same module. An LYB file from an earlier run is overwritten.
+        """
+        for module in modules:
+            for extension in ["json", "xml"]:
+                path = os.path.join(output, f"{module}-running.{extension}")
+                if os.path.exists(path):
+                    raise GeneratorError(f"{path} would be loaded together with the generated {module}-running.lyb, move it away or use another --output directory")
+
+    @staticmethod
+    def write(trees: dict, output: str) -> None:
+        os.makedirs(output, exist_ok=True)
+        for module, tree in trees.items():
+            path = os.path.join(output, f"{module}-running.lyb")
+            fd, tmp_path = tempfile.mkstemp(dir=output, prefix=".generator-", suffix=".tmp")
+            try:
+                with os.fdopen(fd, 'wb') as file:
+                    tree.print_file(file, "lyb", with_siblings=True)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.remove(tmp_path)
+                raise
+            print(f"wrote {path} ({os.path.getsize(path)} bytes)")
+
+def run(scales: dict[str, int], seed: int, templates: str, output: str) -> int:
+    import sysrepo
+
+    try:
+        DatastoreGenerator.check_output([SCALES[scale][0] for scale, count in scales.items() if count > 0], output)
+    except GeneratorError as e:
+        print(f"not generating the data: {e}", file=sys.stderr)
+        return 1
+
+    with sysrepo.SysrepoConnection() as connection:
+        with connection.get_ly_ctx() as ctx:
+            generator = DatastoreGenerator(ctx, templates, seed)
+            try:
+                trees = generator.parse(generator.generate(scales))
+            except (GeneratorError, LibyangError, OSError, ValueError) as e:
+                print(f"could not generate the data: {e}", file=sys.stderr)
+                return 1
+
+            try:
+                generator.validate(trees)
+                generator.write(trees, output)
+            except LibyangError as e:
+                print(f"the generated data is not valid: {e}", file=sys.stderr)
+                return 1
+            except OSError as e:
+                print(f"could not write the generated data: {e}", file=sys.stderr)
+                return 1
+            finally:
+                for tree in trees.values():
+                    tree.free()
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="PyNTS synthetic datastore generator")
+    parser.add_argument('--interfaces', type=int, default=0, help='number of ietf-interfaces interface entries')
+    parser.add_argument('--carriers', type=int, default=0, help='number of o-ran-uplane-conf tx- and rx-array-carriers entries each')
+    parser.add_argument('--components', type=int, default=0, help='number of ietf-hardware component entries')
+    parser.add_argument('--seed', type=int, default=1, help='seed of the random values, the same seed generates the same data')
+    parser.add_argument('--templates', type=str, default="/data", help='directory of the templates and of the other seed files, which the data is validated with')
+    parser.add_argument('--output', type=str, default="/data", help='directory of the generated LYB files')
+    args = parser.parse_args()
+
+    sys.exit(run({scale: getattr(args, scale) for scale in SCALES}, args.seed, args.templates, args.output))
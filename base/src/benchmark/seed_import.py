@@ -0,0 +1,102 @@
+# /*************************************************************************
+# *
+# * Copyright 2025 highstreet technologies and others
+# *
+# * Licensed under the Apache License, Version 2.0 (the "License");
+# * you may not use this file except in compliance with the License.
+# * You may obtain a copy of the License at
+# *
+# *     http://www.apache.org/licenses/LICENSE-2.0
+# *
+# * Unless required by applicable law or agreed to in writing, software
+# * distributed under the License is distributed on an "AS IS" BASIS,
+# * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# * See the License for the specific language governing permissions and
+# * limitations under the License.
+# ***************************************************************************/
+
+"""
+Memory of the batched seed import: writes a synthetic JSON seed file of the given size (an
+ietf-interfaces list), splits it with core.seed_import as a chunked import does, and checks that
+the peak RSS of the process grows by less than --max-rss MiB while splitting, independent of the
+size of the file. The batches are only split, not applied to sysrepo.
+
+Exits with 1 when the bound is exceeded.
+
+Usage (from /app inside the container):
+    python3 -m benchmark.seed_import [--size 512] [--max-rss 64] [--batch-entries 1000] [--batch-bytes 4194304]
+"""
+
+import argparse
+import os
+import resource
+import sys
+import tempfile
+import time
+
+from core.seed_import import split_seed_file
+
+ENTRY = ('{"name":"eth%d","description":"synthetic interface %d","type":"iana-if-type:ethernetCsmacd",'
+         '"enabled":true,"ietf-ip:ipv4":{"address":[{"ip":"10.%d.%d.%d","prefix-length":24}]}}')
+
+def write_seed(path: str, size: int) -> int:
+    """Writes a seed file of at least size bytes, entry by entry, and returns the number of entries."""
+    count = 0
+    written = 0
+    with open(path, 'w') as file:
+        file.write('{"ietf-interfaces:interfaces":{"interface":[')
+        while written < size:
+            chunk = ",".join(ENTRY % (i, i, (i >> 16) & 255, (i >> 8) & 255, i & 255) for i in range(count, count + 10000))
+            if count > 0:
+                chunk = "," + chunk
+            file.write(chunk)
+            written = written + len(chunk)
+            count = count + 10000
+        file.write(']}}')
+    return count
+
+def peak_rss_mib() -> float:
+    # ru_maxrss is in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def run(size_mib: int, max_rss_mib: int, batch_entries: int, batch_bytes: int) -> int:
+    fd, path = tempfile.mkstemp(prefix="pynts-seed-", suffix=".json")
+    os.close(fd)
+    try:
+        count = write_seed(path, size_mib * 1024 * 1024)
+        file_size = os.path.getsize(path)
+
+        baseline = peak_rss_mib()
+        started = time.monotonic()
+        entries = 0
+        batches = 0
+        largest = 0
+        for document, n, _ in split_seed_file(path, "json", batch_entries, batch_bytes):
+            entries = entries + n
+            batches = batches + 1
+            largest = max(largest, len(document))
+        elapsed = time.monotonic() - started
+        growth = peak_rss_mib() - baseline
+    finally:
+        os.remove(path)
+
+    print(f"seed file:   {file_size / 1024 / 1024:.0f} MiB, {count} entries")
+    print(f"split:       {entries} entries in {batches} batches (largest {largest / 1024:.0f} KiB) in {elapsed:.1f} s, {file_size / 1024 / 1024 / elapsed:.0f} MiB/s")
+    print(f"peak RSS:    {baseline:.0f} MiB before, +{growth:.0f} MiB while splitting (bound {max_rss_mib} MiB)")
+    if entries != count:
+        print(f"expected {count} entries", file=sys.stderr)
+        return 1
+    if growth > max_rss_mib:
+        print(f"the peak RSS grew by more than {max_rss_mib} MiB", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="PyNTS seed import memory benchmark")
+    parser.add_argument('--size', type=int, default=512, help='size of the seed file in MiB')
+    parser.add_argument('--max-rss', type=int, default=64, help='bound of the peak RSS growth while splitting, in MiB')
+    parser.add_argument('--batch-entries', type=int, default=1000, help='list entries per batch, as DATASTORE_IMPORT_BATCH_ENTRIES')
+    parser.add_argument('--batch-bytes', type=int, default=4194304, help='bytes per batch, as DATASTORE_IMPORT_BATCH_BYTES')
+    args = parser.parse_args()
+
+    sys.exit(run(args.size, args.max_rss, args.batch_entries, args.batch_bytes))
@@ -0,0 +1,132 @@
+# /*************************************************************************
+# *
+# * Copyright 2025 highstreet technologies and others
+# *
+# * Licensed under the Apache License, Version 2.0 (the "License");
+# * you may not use this file except in compliance with the License.
+# * You may obtain a copy of the License at
+# *
+# *     http://www.apache.org/licenses/LICENSE-2.0
+# *
+# * Unless required by applicable law or agreed to in writing, software
+# * distributed under the License is distributed on an "AS IS" BASIS,
+# * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# * See the License for the specific language governing permissions and
+# * limitations under the License.
+# ***************************************************************************/
+
+"""
+Compares the JSON serializer backends on the VES message shapes sent by PyNTS.
+
+Usage (from /app inside the container):
+    python3 -m benchmark.serializer [--iterations N]
+"""
+
+import argparse
+import json
+import os
+import timeit
+from datetime import datetime, timedelta
+
+from core.config import Config
+from core.ves import VesMessage
+from feature.ves_heartbeat import VesHeartbeat
+from feature.ves_pnfregistration import VesPnfRegistrationSSH
+from performance_management.ves_fileready import VesFileReady
+from util import serializer
+from util.serializer import JsonFragment
+
+class ForwardedNotification(VesMessage):
+    """Same shape as the stndDefined events the O-DU builds for notifications forwarded from an O-RU."""
+    def __init__(self, notification):
+        super().__init__()
+
+        self.data["event"]["stndDefinedFields"] = {
+            "stndDefinedFieldsVersion": "1.0",
+            "schemaReference": "https://o-ran-sc.org/any-standard-defined-message.yaml",
+            "data": notification
+        }
+
+        self.namespace = "urn:ietf:params:xml:ns:yang:ietf-netconf-notifications"
+        self.domain = "stndDefined"
+        self.priority = "Normal"
+        self.event_type = "ORU-YANG/ietf-netconf-notifications:netconf-config-change"
+
+def config_change_notification(edits: int) -> str:
+    """libyang JSON of a netconf-config-change notification, as printed by print_mem()."""
+    return json.dumps({
+        "ietf-netconf-notifications:netconf-config-change": {
+            "changed-by": {"username": "netconf", "session-id": 12},
+            "datastore": "running",
+            "edit": [
+                {
+                    "target": f"/ietf-interfaces:interfaces/interface[name='eth{i}']/o-ran-interfaces:vlan-tagging",
+                    "operation": "replace"
+                } for i in range(edits)
+            ]
+        }
+    }, separators=(",", ":"))
+
+def message_shapes() -> dict:
+    # update() creates Ves(), which must not map the spool of a simulator running in the same container
+    os.environ.setdefault("VES_SPOOL_PATH", "")
+    Config().reload()
+
+    heartbeat = VesHeartbeat(30)
+    pnf_registration = VesPnfRegistrationSSH(830, "netconf", "netconf!")
+    file_ready = VesFileReady("/ftp/A20250101.1200+0000-1215+0000_1_pynts.xml", 123456, datetime.utcnow() + timedelta(hours=1))
+    notification = ForwardedNotification(json.loads(config_change_notification(200)))
+
+    shapes = {}
+    for name, message in [("heartbeat", heartbeat), ("pnfRegistration", pnf_registration), ("fileReady", file_ready), ("stndDefined config-change", notification)]:
+        message.update()
+        shapes[name] = message.data
+
+    shapes["eventList of 50 heartbeats"] = {"eventList": [heartbeat.data["event"]] * 50}
+    return shapes
+
+def run(iterations: int) -> None:
+    backends = [serializer.BACKEND_STDLIB]
+    if serializer.orjson is not None:
+        backends.append(serializer.BACKEND_ORJSON)
+    else:
+        print("orjson is not installed, only the stdlib backend is measured")
+
+    print(f"{'message':<30} {'bytes':>8}" + "".join(f" {backend + ' us':>12}" for backend in backends))
+    for name, data in message_shapes().items():
+        size = len(serializer.dumps_bytes(data))
+        timings = []
+        for backend in backends:
+            serializer.set_backend(backend)
+            seconds = timeit.timeit(lambda: serializer.dumps_bytes(data), number=iterations)
+            timings.append(seconds / iterations * 1_000_000)
+        print(f"{name:<30} {size:>8}" + "".join(f" {timing:>12.2f}" for timing in timings))
+
+    # O-DU notification path: libyang JSON string to VES body
+    notif_json = config_change_notification(200)
+    event_time = "2025-01-01T12:00:00.000Z"
+
+    def reparse():
+        data = {"notifications:notification": {"eventTime": event_time} | serializer.loads(notif_json)}
+        return serializer.dumps_bytes({"data": data})
+
+    def splice():
+        data = {"notifications:notification": JsonFragment('{"eventTime":"' + event_time + '",' + notif_json[1:])}
+        return serializer.dumps_bytes({"data": data})
+
+    print()
+    print(f"{'notification path':<30} {'':>8}" + "".join(f" {backend + ' us':>12}" for backend in backends))
+    for name, function in [("loads + dumps", reparse), ("fragment splice", splice)]:
+        timings = []
+        for backend in backends:
+            serializer.set_backend(backend)
+            seconds = timeit.timeit(function, number=iterations)
+            timings.append(seconds / iterations * 1_000_000)
+        print(f"{name:<30} {'':>8}" + "".join(f" {timing:>12.2f}" for timing in timings))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="PyNTS JSON serializer benchmark")
+    parser.add_argument('--iterations', type=int, default=2000, help='serializations per message shape')
+    args = parser.parse_args()
+
+    run(args.iterations)
@@ -0,0 +1,152 @@
+# /*************************************************************************
+# *
+# * Copyright 2025 highstreet technologies and others
+# *
+# * Licensed under the Apache License, Version 2.0 (the "License");
+# * you may not use this file except in compliance with the License.
+# * You may obtain a copy of the License at
+# *
+# *     http://www.apache.org/licenses/LICENSE-2.0
+# *
+# * Unless required by applicable law or agreed to in writing, software
+# * distributed under the License is distributed on an "AS IS" BASIS,
+# * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# * See the License for the specific language governing permissions and
+# * limitations under the License.
+# ***************************************************************************/
+
+"""
+Minimal VES collector accepting event and eventList posts (plain or gzip encoded) and counting the events per domain.
+
+Usage (from /app inside the container), then point VES_URL at http://<host>:<port>/eventListener/v7:
+    python3 -m benchmark.stub_collector [--host 0.0.0.0] [--port 8443] [--status 202] [--delay-ms 0]
+"""
+
+import argparse
+import asyncio
+import gzip
+import socket
+import threading
+import time
+
+import falcon
+import falcon.asgi
+import uvicorn
+
+from util import serializer
+
+class StubCollectorResource:
+    def __init__(self, collector) -> None:
+        self.collector = collector
+
+    async def on_post(self, req, resp):
+        body = await req.stream.read()
+        if req.get_header("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+
+        try:
+            data = serializer.loads(body)
+            events = data["eventList"] if "eventList" in data else [data["event"]]
+            domains = [event["commonEventHeader"]["domain"] for event in events]
+        except (ValueError, KeyError, TypeError) as e:
+            self.collector.count_invalid()
+            resp.media = {"message": f"invalid VES body: {e}"}
+            resp.status = 400
+            return
+
+        if self.collector.delay > 0:
+            await asyncio.sleep(self.collector.delay)
+
+        self.collector.count(domains, len(body))
+        resp.status = falcon.code_to_http_status(self.collector.status)
+
+class StubCollector:
+    """VES collector running in a uvicorn thread of the current process."""
+    host: str
+    port: int
+    status: int
+    delay: float
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, status: int = 202, delay: float = 0) -> None:
+        self.host = host
+        self.port = port if port != 0 else self.get_free_port(host)
+        self.status = status
+        self.delay = delay
+
+        self.lock = threading.Lock()
+        self.events: dict[str, int] = {}
+        self.requests = 0
+        self.invalid = 0
+        self.bytes = 0
+
+        self.app = falcon.asgi.App()
+        self.app.add_route("/eventListener/v7", StubCollectorResource(self))
+
+        config = uvicorn.Config(self.app, host=self.host, port=self.port, log_level="warning")
+        self.server = uvicorn.Server(config)
+        self.thread = None
+
+    @staticmethod
+    def get_free_port(host: str) -> int:
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+            s.bind((host, 0))
+            return s.getsockname()[1]
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}/eventListener/v7"
+
+    def start(self, timeout: float = 10) -> None:
+        self.thread = threading.Thread(target=self.server.run, name="stub-collector", daemon=True)
+        self.thread.start()
+
+        deadline = time.monotonic() + timeout
+        while not self.server.started:
+            if time.monotonic() > deadline or not self.thread.is_alive():
+                raise Exception(f"stub VES collector did not start on {self.host}:{self.port}")
+            time.sleep(0.01)
+
+    def stop(self) -> None:
+        self.server.should_exit = True
+        if self.thread is not None:
+            self.thread.join(timeout=5)
+
+    def count(self, domains: list[str], size: int) -> None:
+        with self.lock:
+            self.requests = self.requests + 1
+            self.bytes = self.bytes + size
+            for domain in domains:
+                self.events[domain] = self.events.get(domain, 0) + 1
+
+    def count_invalid(self) -> None:
+        with self.lock:
+            self.invalid = self.invalid + 1
+
+    def get_stats(self) -> dict:
+        with self.lock:
+            return {"requests": self.requests, "events": dict(self.events), "invalid": self.invalid, "bytes": self.bytes}
+
+    def reset(self) -> None:
+        with self.lock:
+            self.events = {}
+            self.requests = 0
+            self.invalid = 0
+            self.bytes = 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="PyNTS stub VES collector")
+    parser.add_argument('--host', type=str, default="0.0.0.0", help='address to listen on')
+    parser.add_argument('--port', type=int, default=8443, help='port to listen on')
+    parser.add_argument('--status', type=int, default=202, help='HTTP status code returned for valid posts')
+    parser.add_argument('--delay-ms', type=int, default=0, help='delay before answering, in milliseconds')
+    args = parser.parse_args()
+
+    collector = StubCollector(args.host, args.port, args.status, args.delay_ms / 1000)
+    collector.start()
+    print(f"stub VES collector listening on {collector.url}")
+    try:
+        while True:
+            time.sleep(5)
+            print(collector.get_stats())
+    except KeyboardInterrupt:
+        collector.stop()
@@ -0,0 +1,141 @@
+# /*************************************************************************
+# *
+# * Copyright 2025 highstreet technologies and others
+# *
+# * Licensed under the Apache License, Version 2.0 (the "License");
+# * you may not use this file except in compliance with the License.
+# * You may obtain a copy of the License at
+# *
+# *     http://www.apache.org/licenses/LICENSE-2.0
+# *
+# * Unless required by applicable law or agreed to in writing, software
+# * distributed under the License is distributed on an "AS IS" BASIS,
+# * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# * See the License for the specific language governing permissions and
+# * limitations under the License.
+# ***************************************************************************/
+
+"""
+End-to-end VES throughput: drives messages through Ves.submit() at increasing rates into an
+in-process stub collector, and reports the sustained rate, the latency from submit to the
+collector's answer and the CPU time per event (of the whole process, stub collector included).
+
+The VES_* environment variables (workers, batching, gzip, ...) apply as usual; VES_URL is
+replaced by the stub collector.
+
+Usage (from /app inside the container):
+    python3 -m benchmark.throughput [--rates 100,500,1000,0] [--duration 5] [--messages heartbeat,fileReady,alarm,stndDefined]
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future
+from datetime import datetime, timedelta
+
+from benchmark.stub_collector import StubCollector
+from benchmark.serializer import ForwardedNotification, config_change_notification
+
+MESSAGES = ["heartbeat", "fileReady", "alarm", "stndDefined"]
+
+def message_factories() -> dict:
+    from feature.ves_heartbeat import VesHeartbeat
+    from performance_management.ves_fileready import VesFileReady
+    from fault_management.ves_alarm import VesAlarm
+
+    notification = json.loads(config_change_notification(20))
+    expiry = datetime.utcnow() + timedelta(hours=1)
+    return {
+        "heartbeat": lambda: VesHeartbeat(30),
+        "fileReady": lambda: VesFileReady("/ftp/A20250101.1200+0000-1215+0000_1_pynts.xml", 123456, expiry),
+        "alarm": lambda: VesAlarm(None),    # the alarm payload does not depend on the alarm object yet
+        "stndDefined": lambda: ForwardedNotification(notification)
+    }
+
+def percentile(values: list[float], p: float) -> float:
+    if len(values) == 0:
+        return 0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+def drive(ves, factory, rate: int, duration: float, in_flight: int) -> dict:
+    """Submits messages at rate per second (0: as fast as the pipeline accepts them) for duration seconds."""
+    slots = threading.BoundedSemaphore(in_flight)
+    latencies: list[float] = []
+    failed = [0]
+    lock = threading.Lock()
+
+    def on_done(submitted: float, future: Future) -> None:
+        latency = time.monotonic() - submitted
+        ok = future.exception() is None and future.result() is True
+        with lock:
+            latencies.append(latency)
+            if not ok:
+                failed[0] = failed[0] + 1
+        slots.release()
+
+    cpu_start = time.process_time()
+    start = time.monotonic()
+    submitted = 0
+    while time.monotonic() - start < duration:
+        if rate > 0:
+            delay = start + submitted / rate - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+        # back-pressure instead of overflowing the VES queue
+        slots.acquire()
+        now = time.monotonic()
+        ves.submit(factory(), callback=lambda future, now=now: on_done(now, future))
+        submitted = submitted + 1
+
+    for _ in range(in_flight):
+        slots.acquire()
+    elapsed = time.monotonic() - start
+    cpu = time.process_time() - cpu_start
+
+    return {
+        "submitted": submitted,
+        "rate": submitted / elapsed,
+        "p50": percentile(latencies, 0.50),
+        "p99": percentile(latencies, 0.99),
+        "cpu": cpu / submitted if submitted > 0 else 0,
+        "failed": failed[0]
+    }
+
+def run(rates: list[int], duration: float, messages: list[str]) -> None:
+    collector = StubCollector()
+    collector.start()
+
+    os.environ["VES_URL"] = collector.url
+    os.environ.setdefault("VES_SPOOL_PATH", "")
+
+    from core.config import Config
+    Config().reload()
+    from core.ves import Ves
+    ves = Ves()
+    in_flight = Config().ves_queue_size
+
+    factories = message_factories()
+    print(f"stub collector on {collector.url}, {Config().ves_workers} workers, batch size {Config().ves_batch_size}, gzip {Config().ves_gzip}")
+    print(f"{'message':<12} {'offered/s':>10} {'sent/s':>10} {'p50 ms':>8} {'p99 ms':>8} {'cpu us/ev':>10} {'failed':>7} {'received':>9}")
+    for message in messages:
+        for rate in rates:
+            collector.reset()
+            result = drive(ves, factories[message], rate, duration, in_flight)
+            received = sum(collector.get_stats()["events"].values())
+            offered = str(rate) if rate > 0 else "max"
+            print(f"{message:<12} {offered:>10} {result['rate']:>10.0f} {result['p50'] * 1000:>8.2f} {result['p99'] * 1000:>8.2f} {result['cpu'] * 1_000_000:>10.1f} {result['failed']:>7} {received:>9}")
+
+    collector.stop()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="PyNTS end-to-end VES throughput benchmark")
+    parser.add_argument('--rates', type=str, default="100,500,1000,2000,0", help='comma-separated offered rates in events per second, 0 is as fast as possible')
+    parser.add_argument('--duration', type=float, default=5, help='seconds per message type and rate')
+    parser.add_argument('--messages', type=str, default=",".join(MESSAGES), help=f'comma-separated message types out of {",".join(MESSAGES)}')
+    args = parser.parse_args()
+
+    run([int(rate) for rate in args.rates.split(",")], args.duration, args.messages.split(","))
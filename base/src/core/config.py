@@ -25,6 +25,11 @@ from util.docker import get_hostname, get_ip_from_env
 
 logger = get_pynts_logger("config")
 
+class VesRouting(StrEnum):
+    FANOUT = "fanout"
+    DOMAIN = "domain"
+    SOURCE = "source"
+
 """
 Configuration class
 Singleton
@@ -59,8 +64,48 @@ class Config:
     sdnr_restconf_url: str
 
     ves_url: str
+    ves_urls: list[str]
+    ves_routing: VesRouting = VesRouting.FANOUT
+    ves_routes: dict[str, int]
     ves_username: str
     ves_password: str
+    ves_pool_size: int = 10
+    ves_keepalive: bool = True
+    ves_queue_size: int = 1000
+    ves_workers: int = 4
+    ves_batch_size: int = 1
+    ves_batch_linger_ms: int = 50
+    ves_batch_max_bytes: int = 1048576
+    ves_spool_path: str = "/var/spool/pynts/ves.spool"
+    ves_spool_size: int = 16777216
+    ves_spool_eviction: str = "oldest"
+    ves_cb_window: int = 20
+    ves_cb_failure_rate: int = 50
+    ves_cb_open_seconds: int = 10
+    ves_timeout_min_ms: int = 500
+    ves_timeout_max_ms: int = 5000
+    ves_rate_limit: int = 0
+    ves_rate_burst: int = 10
+    ves_rate_policy: str = "queue"
+    ves_rate_max_delay_ms: int = 10000
+    ves_gzip: bool = False
+    ves_gzip_min_bytes: int = 1024
+    ves_gzip_level: int = 6
+
+    datastore_load_workers: int = 4
+    datastore_cache_path: str = "/var/cache/pynts/lyb"
+    datastore_import_chunked_bytes: int = 33554432
+    datastore_import_batch_entries: int = 1000
+    datastore_import_batch_bytes: int = 4194304
+
+    netconf_cache_size: int = 8388608
+    netconf_session_pool_size: int = 8
+
+    oper_data_ttl_ms: int = 5000
+    oper_data_stale_ms: int = 30000
+
+    o_du_oru_read_timeout_ms: int = 4000
+    o_du_oru_read_workers: int = 64
 
     # json variables
 
@@ -98,8 +143,46 @@ class Config:
         self.sdnr_password: str = os.environ.get("SDNR_PASSWORD", "admin")
 
         self.ves_url = os.environ.get("VES_URL", "")
+        self.ves_urls: list[str] = [url.strip() for url in self.ves_url.split(",") if url.strip() != ""]
+        self.ves_routing: VesRouting = self.get_envvar_ves_routing("VES_ROUTING", VesRouting.FANOUT)
+        self.ves_routes: dict[str, int] = self.get_envvar_ves_routes("VES_ROUTES")
         self.ves_username = os.environ.get("VES_USERNAME", "sample1")
         self.ves_password = os.environ.get("VES_PASSWORD", "sample1")
+        self.ves_pool_size: int = self.get_envvar_int("VES_POOL_SIZE", 10)
+        self.ves_keepalive: bool = self.get_envvar_bool("VES_KEEPALIVE", "True")
+        self.ves_queue_size: int = self.get_envvar_int("VES_QUEUE_SIZE", 1000)
+        self.ves_workers: int = self.get_envvar_int("VES_WORKERS", 4)
+        self.ves_batch_size: int = self.get_envvar_int("VES_BATCH_SIZE", 1)
+        self.ves_batch_linger_ms: int = self.get_envvar_int("VES_BATCH_LINGER_MS", 50)
+        self.ves_batch_max_bytes: int = self.get_envvar_int("VES_BATCH_MAX_BYTES", 1048576)
+        self.ves_spool_path: str = os.environ.get("VES_SPOOL_PATH", "/var/spool/pynts/ves.spool")
+        self.ves_spool_size: int = self.get_envvar_int("VES_SPOOL_SIZE", 16777216)
+        self.ves_spool_eviction: str = os.environ.get("VES_SPOOL_EVICTION", "oldest")
+        self.ves_cb_window: int = self.get_envvar_int("VES_CB_WINDOW", 20)
+        self.ves_cb_failure_rate: int = self.get_envvar_int("VES_CB_FAILURE_RATE", 50)
+        self.ves_cb_open_seconds: int = self.get_envvar_int("VES_CB_OPEN_SECONDS", 10)
+        self.ves_timeout_min_ms: int = self.get_envvar_int("VES_TIMEOUT_MIN_MS", 500)
+        self.ves_timeout_max_ms: int = self.get_envvar_int("VES_TIMEOUT_MAX_MS", 5000)
+        self.ves_rate_limit: int = self.get_envvar_int("VES_RATE_LIMIT", 0)
+        self.ves_rate_burst: int = self.get_envvar_int("VES_RATE_BURST", 10)
+        self.ves_rate_policy: str = os.environ.get("VES_RATE_POLICY", "queue")
+        self.ves_rate_max_delay_ms: int = self.get_envvar_int("VES_RATE_MAX_DELAY_MS", 10000)
+        self.ves_gzip: bool = self.get_envvar_bool("VES_GZIP", "False")
+        self.ves_gzip_min_bytes: int = self.get_envvar_int("VES_GZIP_MIN_BYTES", 1024)
+        self.ves_gzip_level: int = min(9, max(1, self.get_envvar_int("VES_GZIP_LEVEL", 6)))
+
+        self.datastore_load_workers: int = self.get_envvar_int("DATASTORE_LOAD_WORKERS", 4)
+        self.datastore_cache_path: str = os.environ.get("DATASTORE_CACHE_PATH", "/var/cache/pynts/lyb")
+        self.datastore_import_chunked_bytes: int = self.get_envvar_int("DATASTORE_IMPORT_CHUNKED_BYTES", 33554432)
+        self.datastore_import_batch_entries: int = self.get_envvar_int("DATASTORE_IMPORT_BATCH_ENTRIES", 1000)
+        self.datastore_import_batch_bytes: int = self.get_envvar_int("DATASTORE_IMPORT_BATCH_BYTES", 4194304)
+        self.netconf_cache_size: int = self.get_envvar_int("NETCONF_CACHE_SIZE", 8388608)
+        self.netconf_session_pool_size: int = self.get_envvar_int("NETCONF_SESSION_POOL_SIZE", 8)
+        self.oper_data_ttl_ms: int = self.get_envvar_int("OPER_DATA_TTL_MS", 5000)
+        self.oper_data_stale_ms: int = self.get_envvar_int("OPER_DATA_STALE_MS", 30000)
+
+        self.o_du_oru_read_timeout_ms: int = self.get_envvar_int("O_DU_ORU_READ_TIMEOUT_MS", 4000)
+        self.o_du_oru_read_workers: int = max(1, self.get_envvar_int("O_DU_ORU_READ_WORKERS", 64))
 
     @staticmethod
     def get_envvar_bool(varname: str, default_value: str) -> bool:
@@ -109,6 +192,39 @@ class Config:
 
         return value.lower() in truthy_values
 
+    @staticmethod
+    def get_envvar_int(varname: str, default_value: int) -> int:
+        value = os.environ.get(varname, default_value)
+        try:
+            return int(value)
+        except ValueError:
+            logger.error(f"Got config {varname}={value}, which is not integer. Defaulted to {default_value}.")
+            return default_value
+
+    @staticmethod
+    def get_envvar_ves_routing(varname: str, default_value: VesRouting) -> VesRouting:
+        value = os.environ.get(varname, default_value)
+        try:
+            return VesRouting(value.lower())
+        except ValueError:
+            logger.error(f"Got config {varname}={value}, which is not one of {[str(r) for r in VesRouting]}. Defaulted to {default_value}.")
+            return default_value
+
+    @staticmethod
+    def get_envvar_ves_routes(varname: str) -> dict[str, int]:
+        """Parses routes like "3GPP-FaultSupervision=0,HeartBeat=1" into a map of routing key to collector index."""
+        routes = {}
+        value = os.environ.get(varname, "")
+        for route in value.split(","):
+            if route.strip() == "":
+                continue
+            key, _, index = route.partition("=")
+            try:
+                routes[key.strip()] = int(index)
+            except ValueError:
+                logger.error(f"Got config {varname} route {route}, which has no integer collector index. Ignoring it.")
+        return routes
+
     def is_tls_enabled(self) -> bool:
         return self.tls_listen_endpoint or self.tls_callhome_endpoint
 
@@ -17,7 +17,6 @@
 
 from util.logging import get_pynts_logger
 from pathlib import Path
-from libyang.util import LibyangError
 
 from core.extension import Extension
 from core.rest import Rest
@@ -25,6 +24,9 @@ from core.netconf import Netconf, Datastore
 from core.config import Config
 from core.netconf_server import NetconfServer
 from core.ietf_hardware import IetfHardware
+from core.lyb_cache import LybCache
+from core.seed_manifest import SeedManifest
+from core.ves import VesRateLimitRest
 
 from fault_management.fault_management import FaultManagement
 from performance_management.performance_management import PerformanceManagement
@@ -49,16 +51,30 @@ class Core(Extension):
         self.fault_management: FaultManagement = FaultManagement()
         self.performance_management: PerformanceManagement = PerformanceManagement()
 
+        self.rest.add_route("/ves/rate-limit", VesRateLimitRest())
+
+    def create_lyb_cache(self) -> LybCache|None:
+        if self.config.datastore_cache_path == "":
+            return None
+
+        try:
+            return LybCache(self.config.datastore_cache_path)
+        except OSError as e:
+            logger.error(f"could not open LYB cache {self.config.datastore_cache_path}, parsing all data files. Error: {e}")
+            return None
+
     def startup(self) -> None:
-        # load IetfKeystoreTruststoreFeature
-        logger.info("loading IetfKeystoreTruststoreFeature")
-        self.ietf_keystore_truststore_feature: IetfKeystoreTruststoreFeature = IetfKeystoreTruststoreFeature()
-        self.ietf_keystore_truststore_feature.configure()
-        
-        # load IetfSystemFeature
-        logger.info("loading IetfSystemFeature")
-        self.ietf_system_feature: IetfSystemFeature = IetfSystemFeature()
-        self.ietf_system_feature.configure()
+        # the features' edits are committed together, once per datastore
+        with self.netconf.transaction():
+            # load IetfKeystoreTruststoreFeature
+            logger.info("loading IetfKeystoreTruststoreFeature")
+            self.ietf_keystore_truststore_feature: IetfKeystoreTruststoreFeature = IetfKeystoreTruststoreFeature()
+            self.ietf_keystore_truststore_feature.configure()
+
+            # load IetfSystemFeature
+            logger.info("loading IetfSystemFeature")
+            self.ietf_system_feature: IetfSystemFeature = IetfSystemFeature()
+            self.ietf_system_feature.configure()
 
         # # load NetconfAcmFeature
         # logger.info("loading NetconfAcmFeature")
@@ -74,17 +90,12 @@ class Core(Extension):
         # populate all data
         logger.info("attempting to populate netconf data")
         if Path("/data").exists():
-            ds_files = self.netconf.get_datastore_files("/data", "json|xml")
-            for ds_file in ds_files:
-                try:
-                    self.netconf.set_data_from_path(Datastore(ds_file['datastore']), ds_file['module_name'], ds_file['extension'], ds_file['filename'])
-                except LibyangError as e:
-                    logger.error(f"Could not load {ds_file['extension']} data in {ds_file['datastore']} for module {ds_file['module_name']} from {ds_file['filename']}")
-                    logger.error(f"Exception: {e}")
+            ds_files = self.netconf.get_datastore_files("/data", "json|xml|lyb")
+            self.netconf.load_datastore_files(ds_files, self.config.datastore_load_workers, self.create_lyb_cache(), SeedManifest("/data"))
         
         self.ietf_hardware.check_ietf_hardware()
         
-        with self.netconf.connection.start_session("startup") as sess_start:
+        with self.netconf.session("startup") as sess_start:
           logger.debug(f"Copying contents of running datastore into startup...")
           sess_start.copy_config("running")
           sess_start.apply_changes()
@@ -50,7 +50,7 @@ class IetfHardware:
         self.namespace = uuid.NAMESPACE_URL
                 
     def check_ietf_hardware(self):
-      hardware = self.netconf.running.get_data("/ietf-hardware:hardware")
+      hardware = self.netconf.get_data(Datastore.RUNNING, "/ietf-hardware:hardware")
       # logger.debug(f"Found hardware: {hardware}")
       
       components = hardware
@@ -84,8 +84,11 @@ class IetfHardware:
           logger.error(f"List not at the expected level in {hardware}. Error: {e}")
           
       # logger.debug(f"New hardware is: {hardware}")
-      self.netconf.running.edit_batch(hardware, "ietf-hardware")
-      self.netconf.running.apply_changes()
-      with self.netconf.connection.start_session("operational") as sess:
-        sess.edit_batch(hardware, "ietf-hardware")
-        sess.apply_changes()
+      # nothing is written when all components already have their alias, asset-id and uri
+      if not self.netconf.set_data(Datastore.RUNNING, "ietf-hardware", hardware, diff=True):
+        logger.debug("ietf-hardware components are up to date")
+      with self.netconf.edit_session(Datastore.OPERATIONAL) as sess:
+        edit = self.netconf.get_module_edit(sess, "ietf-hardware", hardware)
+        if edit is not None:
+          sess.edit_batch(edit, "ietf-hardware")
+          sess.apply_changes()
@@ -0,0 +1,130 @@
+# /*************************************************************************
+# *
+# * Copyright 2025 highstreet technologies and others
+# *
+# * Licensed under the Apache License, Version 2.0 (the "License");
+# * you may not use this file except in compliance with the License.
+# * You may obtain a copy of the License at
+# *
+# *     http://www.apache.org/licenses/LICENSE-2.0
+# *
+# * Unless required by applicable law or agreed to in writing, software
+# * distributed under the License is distributed on an "AS IS" BASIS,
+# * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# * See the License for the specific language governing permissions and
+# * limitations under the License.
+# ***************************************************************************/
+
+from util.logging import get_pynts_logger
+import hashlib
+import os
+import tempfile
+import threading
+
+from libyang.util import LibyangError, c2str
+
+logger = get_pynts_logger("lyb-cache")
+
+"""
+LybCache
+----
+Keeps the parsed form of the /data seed files in libyang's binary LYB format, so that
+unchanged files are loaded on the next start without parsing JSON or XML again.
+Entries are keyed by the hash of the file content and by the hash of the set of
+YANG modules (with their revisions) of the context, which the LYB data depends on.
+"""
+class LybCache:
+    path: str
+    hits: int
+    misses: int
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.lock = threading.Lock()
+        self.used: set[str] = set()
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(path, exist_ok=True)
+
+    @staticmethod
+    def get_context_key(ctx) -> str:
+        modules = sorted(f"{module.name()}@{c2str(module.cdata.revision) or ''}:{int(module.implemented())}" for module in ctx)
+        return hashlib.sha256("\n".join(modules).encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def get_content_key(content: bytes, format: str) -> str:
+        return LybCache.get_hash_key(hashlib.sha256(content).hexdigest(), format)
+
+    @staticmethod
+    def get_hash_key(sha256: str, format: str) -> str:
+        """Content key of a file of which the SHA-256 hash is already known, e.g. from the seed manifest."""
+        return hashlib.sha256(f"{format}\0{sha256}".encode("utf-8")).hexdigest()
+
+    def get_entry_path(self, context_key: str, content_key: str) -> str:
+        return os.path.join(self.path, f"{context_key[:16]}-{content_key}.lyb")
+
+    def keep(self, context_key: str, content_key: str) -> None:
+        """Marks an entry as used without loading it, so that prune() keeps it."""
+        with self.lock:
+            self.used.add(self.get_entry_path(context_key, content_key))
+
+    def load(self, ctx, context_key: str, content_key: str):
+        """Returns the cached data tree, or None when there is no usable entry."""
+        entry = self.get_entry_path(context_key, content_key)
+        with self.lock:
+            self.used.add(entry)
+
+        try:
+            with open(entry, 'rb') as file:
+                data = ctx.parse_data_file(file, "lyb", parse_only=True)
+        except FileNotFoundError:
+            with self.lock:
+                self.misses = self.misses + 1
+            return None
+        except (LibyangError, OSError) as e:
+            logger.warning(f"discarding unreadable LYB cache entry {entry}. Error: {e}")
+            self.remove(entry)
+            with self.lock:
+                self.misses = self.misses + 1
+            return None
+
+        with self.lock:
+            self.hits = self.hits + 1
+        return data
+
+    def store(self, context_key: str, content_key: str, data) -> None:
+        entry = self.get_entry_path(context_key, content_key)
+        tmp_path = None
+        try:
+            # write to a temporary file first, so that an interrupted start never leaves a truncated entry
+            fd, tmp_path = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+            with os.fdopen(fd, 'wb') as file:
+                data.print_file(file, "lyb", with_siblings=True)
+            os.replace(tmp_path, entry)
+        except (LibyangError, OSError) as e:
+            logger.warning(f"could not write LYB cache entry {entry}. Error: {e}")
+            if tmp_path is not None:
+                self.remove(tmp_path)
+
+    @staticmethod
+    def remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def prune(self) -> None:
+        """Removes the entries which were not used since the cache was created, e.g. of changed seed files."""
+        with self.lock:
+            used = set(self.used)
+
+        for name in os.listdir(self.path):
+            entry = os.path.join(self.path, name)
+            if entry not in used and (name.endswith(".lyb") or name.endswith(".tmp")):
+                logger.debug(f"removing stale LYB cache entry {entry}")
+                self.remove(entry)
+
+    def get_stats(self) -> dict:
+        with self.lock:
+            return {"hits": self.hits, "misses": self.misses}
@@ -0,0 +1,175 @@
+# /*************************************************************************
+# *
+# * Copyright 2025 highstreet technologies and others
+# *
+# * Licensed under the Apache License, Version 2.0 (the "License");
+# * you may not use this file except in compliance with the License.
+# * You may obtain a copy of the License at
+# *
+# *     http://www.apache.org/licenses/LICENSE-2.0
+# *
+# * Unless required by applicable law or agreed to in writing, software
+# * distributed under the License is distributed on an "AS IS" BASIS,
+# * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# * See the License for the specific language governing permissions and
+# * limitations under the License.
+# ***************************************************************************/
+
+from util.logging import get_pynts_logger
+import bisect
+import threading
+from typing import Callable
+
+logger = get_pynts_logger("metrics")
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# latency buckets in seconds, from sub-millisecond serialization to slow collectors
+DEFAULT_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+def escape_label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+def format_labels(names: tuple, values: tuple, extra: str = "") -> str:
+    labels = [f'{name}="{escape_label(value)}"' for name, value in zip(names, values)]
+    if extra != "":
+        labels.append(extra)
+    return "{" + ",".join(labels) + "}" if len(labels) > 0 else ""
+
+def format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+class Metric:
+    type = ""
+
+    def __init__(self, name: str, help: str, labels: tuple = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.lock = threading.Lock()
+
+    def render(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"] + self.render_samples()
+
+    def render_samples(self) -> list[str]:
+        raise NotImplementedError
+
+class Counter(Metric):
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labels: tuple = ()) -> None:
+        super().__init__(name, help, labels)
+        self.values: dict[tuple, float] = {}
+
+    def inc(self, *labels, amount: float = 1) -> None:
+        with self.lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+    def get(self, *labels) -> float:
+        return self.values.get(labels, 0)
+
+    def render_samples(self) -> list[str]:
+        with self.lock:
+            return [f"{self.name}{format_labels(self.labels, labels)} {format_value(value)}" for labels, value in sorted(self.values.items())]
+
+class Gauge(Counter):
+    type = "gauge"
+
+    def set(self, *labels, value: float) -> None:
+        with self.lock:
+            self.values[labels] = value
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, help: str, labels: tuple = (), buckets: tuple = DEFAULT_BUCKETS) -> None:
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+        self.counts: dict[tuple, list[int]] = {}
+        self.sums: dict[tuple, float] = {}
+
+    def observe(self, *labels, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            counts = self.counts.get(labels)
+            if counts is None:
+                counts = self.counts[labels] = [0] * (len(self.buckets) + 1)
+                self.sums[labels] = 0.0
+            counts[index] = counts[index] + 1
+            self.sums[labels] = self.sums[labels] + value
+
+    def render_samples(self) -> list[str]:
+        lines = []
+        with self.lock:
+            for labels, counts in sorted(self.counts.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), counts):
+                    cumulative = cumulative + count
+                    le = 'le="' + format_value(bound) + '"'
+                    lines.append(f"{self.name}_bucket{format_labels(self.labels, labels, le)} {cumulative}")
+                lines.append(f"{self.name}_sum{format_labels(self.labels, labels)} {format_value(self.sums[labels])}")
+                lines.append(f"{self.name}_count{format_labels(self.labels, labels)} {cumulative}")
+        return lines
+
+"""
+Metrics
+Singleton
+----
+Registry of the metrics exposed in Prometheus text format on the /metrics REST route.
+Collectors registered with add_collector() are called before rendering, to update gauges
+which are cheaper to read on scrape than to maintain on every change.
+"""
+class Metrics:
+    _instance = None
+    metrics: dict[str, Metric]
+    collectors: list[Callable[[], None]]
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance.lock = threading.Lock()
+            cls._instance.metrics = {}
+            cls._instance.collectors = []
+        return cls._instance
+
+    def register(self, metric: Metric) -> Metric:
+        with self.lock:
+            existing = self.metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self.metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, help: str, labels: tuple = ()) -> Counter:
+        return self.register(Counter(name, help, labels))
+
+    def gauge(self, name: str, help: str, labels: tuple = ()) -> Gauge:
+        return self.register(Gauge(name, help, labels))
+
+    def histogram(self, name: str, help: str, labels: tuple = (), buckets: tuple = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help, labels, buckets))
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        with self.lock:
+            if collector not in self.collectors:
+                self.collectors.append(collector)
+
+    def render(self) -> str:
+        for collector in list(self.collectors):
+            try:
+                collector()
+            except Exception as e:
+                logger.error(f"metrics collector failed. Error: {e}")
+
+        lines = []
+        for metric in list(self.metrics.values()):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+class MetricsRest:
+    async def on_get(self, req, resp):
+        resp.text = Metrics().render()
+        resp.content_type = PROMETHEUS_CONTENT_TYPE
+        resp.status = 200
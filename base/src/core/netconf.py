@@ -17,19 +17,60 @@
 
 from util.logging import get_pynts_logger, get_pynts_log_level
 import logging
+from abc import ABC, abstractmethod
 from strenum import StrEnum
 import sysrepo
 from sysrepo.session import SysrepoSession
+from libyang.util import LibyangError
+from libyang.keyed_list import py_to_yang
 import json
 import os
 import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any
+from concurrent.futures import ThreadPoolExecutor
+from core.lyb_cache import LybCache
+from core.netconf_cache import NetconfReadCache
+from core.session_pool import SessionPool
+from core.seed_manifest import SeedManifest
+from core.seed_import import SeedSplitError, split_seed_file
+from core.config import Config
 
 logger = get_pynts_logger("netconf")
 
+# data of this module defines the mount points needed to parse the data of other modules
+SCHEMA_MOUNT_MODULE = "ietf-yang-schema-mount"
+
 class Datastore(StrEnum):
     RUNNING = "running"
     OPERATIONAL = "operational"
 
+class NetconfEdit:
+    """One set_data() edit of a module (or of a single leaf, when data is a string) in a datastore."""
+    def __init__(self, datastore: Datastore, xpath: str, data: dict | str, operation: str = "merge") -> None:
+        self.datastore = datastore
+        self.xpath = xpath
+        self.data = data
+        self.operation = operation
+
+    def stage(self, sess: SysrepoSession) -> None:
+        if type(self.data) is str:
+            sess.set_item(self.xpath, self.data)
+        else:
+            sess.edit_batch(self.data, self.xpath, default_operation=self.operation)
+
+    def __str__(self) -> str:
+        return f"{self.datastore}:'{self.xpath}' ({self.operation})"
+
+class NetconfTransactionError(Exception):
+    """Raised at the end of a Netconf.transaction() when edits could not be applied."""
+    def __init__(self, failed: list[tuple[NetconfEdit, Exception]]) -> None:
+        self.failed = failed
+        super().__init__("; ".join(f"edit {edit} failed: {error}" for edit, error in failed))
+
 class Netconf:
     _instance = None
 
@@ -40,6 +81,7 @@ class Netconf:
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
+            cls._instance.local = threading.local()
             sysrepo.configure_logging(
                 stderr_level=logging.INFO,
                 # stderr_level=get_pynts_log_level(),
@@ -56,83 +98,287 @@ class Netconf:
         self.connection = sysrepo.SysrepoConnection()
         self.running = self.connection.start_session(datastore="running")
         self.operational = self.connection.start_session(datastore="operational")
+        self.operational_lock = threading.RLock()
+        self.pools: dict[str, SessionPool] = {}
+        self.pools_lock = threading.Lock()
+        cache_size = Config().netconf_cache_size
+        self.read_cache = NetconfReadCache(self.connection, cache_size) if cache_size > 0 else None
         logger.info("connected to sysrepo")
 
     def disconnect(self) -> None:
+        for pool in self.pools.values():
+            pool.close()
         self.connection.disconnect()
         logger.info("disconnected from sysrepo")
 
-    def set_data(self, datastore: Datastore, xpath: str | None, data: dict | str, default_operation: str = "merge") -> None:
-        if xpath is None or xpath == "":
-            logger.info("setting multiple modules at once")
-            for module in data:
-                self.set_data(datastore, module, data[module], f"!{default_operation}")
-        else:
-            if xpath.endswith("/"):
-                xpath = xpath[:-1]
-
-            logger.info(f"setting {datastore}:'{xpath}'")
-            logger.debug(f"to '{data}'")
-
-            if type(data) is str:
-                if datastore == Datastore.RUNNING:
-                    self.running.set_item(xpath, data)
-                elif datastore == Datastore.OPERATIONAL:
-                    self.operational.set_item(xpath, data)
-                else:
-                    raise Exception(f"invalid datastore {datastore}")
-
-            elif type(data) is dict:
-                oper = default_operation
-                if oper.startswith("!"):
-                    oper = oper[1:]
-
-                if xpath.startswith("/"):
-                    xpath = xpath[1:]
-
-                if datastore == Datastore.RUNNING:
-                    self.running.edit_batch(data, xpath, default_operation=oper)
-                elif datastore == Datastore.OPERATIONAL:
-                    self.operational.edit_batch(data, xpath, default_operation=oper)
-                else:
-                    raise Exception(f"invalid datastore {datastore}")
-
-        if not default_operation.startswith("!"):
-            logger.info(f"applying datastore {datastore} changes")
-            if datastore == Datastore.RUNNING:
-                self.running.apply_changes()
-            elif datastore == Datastore.OPERATIONAL:
-                self.operational.apply_changes()
+    def set_data(self, datastore: Datastore, xpath: str | None, data: dict | str, default_operation: str = "merge", diff: bool = False) -> bool:
+        """
+        Edits the datastore, and applies the changes unless default_operation starts with "!".
+        With diff, a merge of dict data only edits the nodes which are missing or different in the
+        current data of the module, and no transaction is started at all when nothing would change.
+        Inside a transaction(), the edit is collected and applied when the transaction ends.
+        Returns whether changes were edited.
+        """
+        transaction = getattr(self.local, "transaction", None)
+        # nested calls of the thread get the same session
+        with self.edit_session(datastore) as sess:
+            changed = True
+            if xpath is None or xpath == "":
+                logger.info("setting multiple modules at once")
+                changed = False
+                for module in data:
+                    changed = self.set_data(datastore, module, data[module], f"!{default_operation}", diff) or changed
             else:
-                raise Exception(f"invalid datastore {datastore}")
+                if xpath.endswith("/"):
+                    xpath = xpath[:-1]
 
-    def get_data(self, datastore: Datastore, xpath: str) -> dict:
+                logger.info(f"setting {datastore}:'{xpath}'")
+                logger.debug(f"to '{data}'")
+
+                edit = None
+                if type(data) is str:
+                    edit = NetconfEdit(datastore, xpath, data)
+
+                elif type(data) is dict:
+                    oper = default_operation
+                    if oper.startswith("!"):
+                        oper = oper[1:]
+
+                    if xpath.startswith("/"):
+                        xpath = xpath[1:]
+
+                    if diff and oper == "merge":
+                        data = self.get_module_edit(sess, xpath, data)
+                        if data is None:
+                            logger.debug(f"skipping {datastore}:'{xpath}', data is already present")
+                            changed = False
+
+                    edit = NetconfEdit(datastore, xpath, data, oper)
+
+                if edit is not None and changed:
+                    if transaction is not None:
+                        transaction.append(edit)
+                    else:
+                        edit.stage(sess)
+
+            if not default_operation.startswith("!") and changed and transaction is None:
+                logger.info(f"applying datastore {datastore} changes")
+                sess.apply_changes()
+                self.invalidate_read_cache(datastore)
+
+        return changed
+
+    @contextmanager
+    def transaction(self):
+        """
+        Collects the set_data() edits of the current thread, of any module and datastore, and applies
+        them with a single commit per datastore when the block ends, instead of one commit per edit.
+        Nested transactions join the outer one. When the block raises, the collected edits are dropped.
+        When the combined commit of a datastore fails, its edits are applied one by one and
+        NetconfTransactionError names the edits which failed.
+        """
+        if getattr(self.local, "transaction", None) is not None:
+            yield
+            return
+
+        edits: list[NetconfEdit] = []
+        self.local.transaction = edits
+        try:
+            yield
+        except BaseException:
+            logger.warning(f"dropping {len(edits)} edits of the failed transaction")
+            raise
+        finally:
+            self.local.transaction = None
+
+        self.commit(edits)
+
+    def commit(self, edits: list[NetconfEdit]) -> None:
+        failed: list[tuple[NetconfEdit, Exception]] = []
+        for datastore in Datastore:
+            datastore_edits = [edit for edit in edits if edit.datastore == datastore]
+            if len(datastore_edits) > 0:
+                with self.edit_session(datastore) as sess:
+                    failed = failed + self.commit_datastore(sess, datastore, datastore_edits)
+
+        if len(failed) > 0:
+            raise NetconfTransactionError(failed)
+
+    def commit_datastore(self, sess: SysrepoSession, datastore: Datastore, edits: list[NetconfEdit]) -> list[tuple[NetconfEdit, Exception]]:
+        failed: list[tuple[NetconfEdit, Exception]] = []
+        staged = []
+        for edit in edits:
+            try:
+                edit.stage(sess)
+                staged.append(edit)
+            except (sysrepo.SysrepoError, LibyangError) as e:
+                logger.error(f"edit {edit} failed: {e}")
+                failed.append((edit, e))
+
+        if len(staged) == 0:
+            return failed
+
+        logger.info(f"applying {len(staged)} edits to datastore {datastore}")
+        try:
+            sess.apply_changes()
+            self.invalidate_read_cache(datastore)
+        except sysrepo.SysrepoError as e:
+            logger.warning(f"combined commit to datastore {datastore} failed, applying the edits one by one. Error: {e}")
+            sess.discard_changes()
+            for edit in staged:
+                try:
+                    edit.stage(sess)
+                    sess.apply_changes()
+                except (sysrepo.SysrepoError, LibyangError) as e:
+                    logger.error(f"edit {edit} failed: {e}")
+                    sess.discard_changes()
+                    failed.append((edit, e))
+            self.invalidate_read_cache(datastore)
+        return failed
+
+    def get_pool(self, datastore: str) -> SessionPool:
+        with self.pools_lock:
+            if datastore not in self.pools:
+                self.pools[datastore] = SessionPool(self.connection, datastore, Config().netconf_session_pool_size)
+            return self.pools[datastore]
+
+    @contextmanager
+    def session(self, datastore: str):
+        """Checks a session of the datastore (running, operational, startup, ...) out of the session pool for the current thread."""
+        with self.get_pool(datastore).session() as sess:
+            yield sess
+
+    @contextmanager
+    def edit_session(self, datastore: Datastore):
+        """
+        Session to edit the datastore with. Operational data pushed by a session belongs to that
+        session, so all operational edits go through the shared operational session, one thread at a time.
+        """
         if datastore == Datastore.RUNNING:
-            return self.running.get_data(xpath)
+            with self.session(datastore) as sess:
+                yield sess
         elif datastore == Datastore.OPERATIONAL:
-            return self.operational.get_data(xpath)
+            with self.operational_lock:
+                yield self.operational
         else:
             raise Exception(f"invalid datastore {datastore}")
 
+    @staticmethod
+    def get_module_edit(sess: SysrepoSession, module_name: str, data: dict) -> dict | None:
+        """Returns the minimal merge edit of the module towards data, or None when the session already has it."""
+        try:
+            current = sess.get_data(f"/{module_name}:*")
+        except sysrepo.SysrepoNotFoundError:
+            return data
+
+        return Netconf.diff_data(current, data)
+
+    @staticmethod
+    def diff_data(current, new):
+        """
+        Returns the part of new which is missing or different in current (as returned by get_data), or
+        None when merging new into current would not change anything. A merge never removes nodes, so
+        nodes which are only in current are not part of the result.
+        """
+        if isinstance(new, dict):
+            if not isinstance(current, dict):
+                return new
+
+            # get_data strips the module prefixes, the data to set may have them
+            current_children = {key.split(":")[-1]: value for key, value in current.items()}
+            edit = {}
+            for key, value in new.items():
+                name = key.split(":")[-1]
+                if name not in current_children:
+                    edit[key] = value
+                    continue
+
+                child = Netconf.diff_data(current_children[name], value)
+                if child is not None:
+                    edit[key] = child
+            return edit if edit else None
+
+        if isinstance(new, list):
+            if not isinstance(current, list):
+                return new if new else None
+
+            if len(new) > 0 and all(isinstance(entry, dict) for entry in new):
+                return Netconf.diff_list(current, new)
+
+            # leaf-list
+            current_values = {py_to_yang(value) for value in current}
+            edit = [value for value in new if py_to_yang(value) not in current_values]
+            return edit if edit else None
+
+        if current is not None and py_to_yang(current) == py_to_yang(new):
+            return None
+        return new
+
+    @staticmethod
+    def diff_list(current: list, new: list) -> list | None:
+        key_names = getattr(current, "_key_name", None)
+        if key_names is None:
+            # keyless list, entries can only be compared as a whole
+            edit = [entry for entry in new if all(Netconf.diff_data(existing, entry) is not None for existing in current)]
+            return edit if edit else None
+
+        if isinstance(key_names, str):
+            key_names = (key_names,)
+
+        index = {}
+        for entry in current:
+            if isinstance(entry, dict):
+                index[tuple(py_to_yang(entry.get(key_name)) for key_name in key_names)] = entry
+
+        edit = []
+        for entry in new:
+            keys = {key.split(":")[-1]: value for key, value in entry.items() if key.split(":")[-1] in key_names}
+            existing = index.get(tuple(py_to_yang(keys.get(key_name)) for key_name in key_names))
+            if len(keys) != len(key_names) or existing is None:
+                edit.append(entry)
+                continue
+
+            child = Netconf.diff_data(existing, entry)
+            if child is not None:
+                # the keys identify the entry to merge into
+                edit.append({**{key: value for key, value in entry.items() if key.split(":")[-1] in key_names}, **child})
+        return edit if edit else None
+
+    def get_data(self, datastore: Datastore, xpath: str) -> dict:
+        """Reads of the running datastore are cached, see NETCONF_CACHE_SIZE."""
+        with self.session(datastore) as sess:
+            if datastore == Datastore.RUNNING and self.read_cache is not None:
+                return self.read_cache.get_data(sess, xpath)
+            return sess.get_data(xpath)
+
+    def invalidate_read_cache(self, datastore: Datastore) -> None:
+        # the change subscription of the cache is notified asynchronously, do not return stale data of own changes until then
+        if datastore == Datastore.RUNNING and self.read_cache is not None:
+            self.read_cache.invalidate()
+
 
     def set_data_from_path(self, datastore: Datastore, module_name: str, format: str, file_path: str) -> None:
         logger.debug(f"Loading {format} data for {module_name} in datastore {datastore} from file {file_path}")
+        if self.is_chunked_import(os.path.getsize(file_path)):
+            if datastore == Datastore.RUNNING:
+                with self.session(Datastore.RUNNING) as sess:
+                    if self.has_module_data(sess, module_name):
+                        logger.debug(f"Skipping loading data from file {file_path} into module {module_name}. Data already present...")
+                        return
+            self.import_datastore_file({'filename': file_path, 'module_name': module_name, 'datastore': datastore, 'extension': format})
+            return
+
         with open(file_path, 'r') as file:
 
             if datastore == Datastore.OPERATIONAL:
-                with self.connection.start_session("operational") as sess:
+                with self.edit_session(Datastore.OPERATIONAL) as sess:
                     with self.connection.get_ly_ctx() as ctx:
                         data = ctx.parse_data_file(file, format, parse_only=True)
                         sess.edit_batch_ly(data)
                         sess.apply_changes()
             elif datastore == Datastore.RUNNING:
-                with self.connection.start_session("running") as sess:
-                    try:
-                      data = sess.get_data(f"/{module_name}:*")
-                    except sysrepo.SysrepoNotFoundError:
-                      logger.debug(f"Did not find data for /{module_name}:*")
-                      data = None
-                    if not data:
+                with self.session(Datastore.RUNNING) as sess:
+                    if not self.has_module_data(sess, module_name):
                       with self.connection.get_ly_ctx() as ctx:
                           data = ctx.parse_data_file(file, format, parse_only=True)
                           # start with a fresh datastore, erase anything that was before
@@ -142,6 +388,235 @@ class Netconf:
                     else:
                       logger.debug(f"Skipping loading data from file {file_path} into module {module_name}. Data already present...")
 
+    @staticmethod
+    def has_module_data(sess: SysrepoSession, module_name: str) -> bool:
+        try:
+            return bool(sess.get_data(f"/{module_name}:*"))
+        except sysrepo.SysrepoNotFoundError:
+            logger.debug(f"Did not find data for /{module_name}:*")
+            return False
+
+    def load_datastore_files(self, ds_files: list, workers: int = 4, cache: LybCache|None = None, manifest: SeedManifest|None = None) -> None:
+        """
+        Loads the files listed by get_datastore_files(), like set_data_from_path() does for each of them:
+        the files are parsed concurrently, then all edits of a datastore are applied in a single batch.
+        ietf-yang-schema-mount files are loaded first, as the mount points they define are needed to parse the others.
+        With a cache, unchanged files are loaded from their LYB snapshot instead of being parsed.
+        With a manifest, the files are loaded in the order it records (by default that of the YANG imports of
+        their modules), the files of the same order together, the largest files are parsed first, and the LYB
+        snapshots of unchanged files are found without reading the files.
+        """
+        if manifest is not None:
+            with self.connection.get_ly_ctx() as ctx:
+                ds_files = manifest.index(ds_files, ctx, first=(SCHEMA_MOUNT_MODULE,))
+
+        mount_files = [ds_file for ds_file in ds_files if ds_file['module_name'] == SCHEMA_MOUNT_MODULE]
+        other_files = [ds_file for ds_file in ds_files if ds_file['module_name'] != SCHEMA_MOUNT_MODULE]
+        large_files = [ds_file for ds_file in other_files if ds_file['extension'] != "lyb" and self.is_chunked_import(self.get_file_size(ds_file))]
+        other_files = [ds_file for ds_file in other_files if ds_file not in large_files]
+
+        for files in [mount_files] + self.group_by_order(other_files):
+            if len(files) > 0:
+                self.load_datastore_group(files, workers, cache)
+
+        # after all others, as their entries may refer to the data of the other files
+        for ds_file in large_files:
+            if ds_file['datastore'] == Datastore.RUNNING:
+                with self.session(Datastore.RUNNING) as sess:
+                    if self.has_module_data(sess, ds_file['module_name']):
+                        logger.debug(f"Skipping loading data from file {ds_file['filename']} into module {ds_file['module_name']}. Data already present...")
+                        continue
+            self.import_datastore_file(ds_file)
+
+        if cache is not None:
+            cache.prune()
+            logger.info(f"LYB cache: {cache.get_stats()}")
+
+    @staticmethod
+    def group_by_order(ds_files: list) -> list[list]:
+        """The files of each 'order' of the manifest, in ascending order; one group of all files without a manifest."""
+        groups: dict[int, list] = {}
+        for ds_file in ds_files:
+            groups.setdefault(ds_file.get('order', 0), []).append(ds_file)
+        return [groups[order] for order in sorted(groups)]
+
+    def load_datastore_group(self, ds_files: list, workers: int, cache: LybCache|None) -> None:
+        # like set_data_from_path(), running data is only loaded for modules which have none yet
+        with self.session(Datastore.RUNNING) as sess:
+            skipped = [ds_file for ds_file in ds_files if ds_file['datastore'] == Datastore.RUNNING and self.has_module_data(sess, ds_file['module_name'])]
+        for ds_file in skipped:
+            logger.debug(f"Skipping loading data from file {ds_file['filename']} into module {ds_file['module_name']}. Data already present...")
+        ds_files = [ds_file for ds_file in ds_files if ds_file not in skipped]
+
+        with self.connection.get_ly_ctx() as ctx:
+            context_key = None
+            if cache is not None:
+                context_key = cache.get_context_key(ctx)
+                for ds_file in skipped:
+                    self.keep_cached_file(cache, context_key, ds_file)
+
+            # libyang releases the GIL while parsing, and a context may be shared by parsers;
+            # the largest files (when their size is known) start first, so that they do not finish last
+            schedule = sorted(range(len(ds_files)), key=lambda i: -ds_files[i].get('size', 0))
+            parsed = [None] * len(ds_files)
+            with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="datastore-loader") as executor:
+                for i, data in zip(schedule, executor.map(lambda i: self.parse_datastore_file(ctx, ds_files[i], cache, context_key), schedule)):
+                    parsed[i] = data
+
+            for datastore in Datastore:
+                entries = [(ds_file, data) for ds_file, data in zip(ds_files, parsed) if data is not None and ds_file['datastore'] == datastore]
+                if len(entries) > 0:
+                    self.apply_datastore_files(datastore, entries)
+
+    @staticmethod
+    def get_file_size(ds_file: dict) -> int:
+        if 'size' in ds_file:
+            return ds_file['size']
+        try:
+            return os.path.getsize(ds_file['filename'])
+        except OSError:
+            return 0
+
+    @staticmethod
+    def is_chunked_import(size: int) -> bool:
+        threshold = Config().datastore_import_chunked_bytes
+        return threshold > 0 and size >= threshold
+
+    def import_datastore_file(self, ds_file: dict) -> bool:
+        """
+        Imports a large seed file in batches of the entries of its top-level lists (see core.seed_import),
+        each batch parsed and applied on its own, so that neither the whole data tree nor the whole edit is
+        ever held in memory. Every batch must be valid together with the data already in the datastore, and
+        is validated without the batches after it: a leafref (or must/when condition) referring to an entry of a
+        later batch fails the import, so such entries have to come first in the file, or the file must be small
+        enough to be loaded whole. Running data is only imported into a module without any (as checked by the
+        callers); when a batch fails, the module data of the batches applied before it is removed again, so that
+        the file is not skipped as already loaded on the next start.
+        """
+        config = Config()
+        datastore = ds_file['datastore']
+        logger.info(f"importing {ds_file['filename']} into {datastore} in batches of at most {config.datastore_import_batch_entries} entries")
+
+        entries = 0
+        batches = 0
+        reported = 0.0
+        try:
+            for document, count, progress in split_seed_file(ds_file['filename'], ds_file['extension'], config.datastore_import_batch_entries, config.datastore_import_batch_bytes):
+                with self.connection.get_ly_ctx() as ctx:
+                    data = ctx.parse_data_mem(document, ds_file['extension'], parse_only=True)
+                    if data is None:
+                        continue
+                    try:
+                        with self.edit_session(datastore) as sess:
+                            try:
+                                sess.edit_batch_ly(data)
+                                sess.apply_changes()
+                            except sysrepo.SysrepoError:
+                                sess.discard_changes()
+                                raise
+                    finally:
+                        data.free()
+
+                entries = entries + count
+                batches = batches + 1
+                if progress - reported >= 0.1:
+                    logger.info(f"importing {ds_file['filename']}: {progress:.0%}, {entries} entries in {batches} batches")
+                    reported = progress
+        except (SeedSplitError, LibyangError, sysrepo.SysrepoError, OSError, UnicodeDecodeError) as e:
+            logger.error(f"Could not import {ds_file['extension']} data in {datastore} for module {ds_file['module_name']} from {ds_file['filename']} after {entries} entries in {batches} batches")
+            logger.error(f"Exception: {e}")
+            if batches > 0 and datastore == Datastore.RUNNING:
+                self.rollback_import(ds_file)
+            return False
+        finally:
+            self.invalidate_read_cache(datastore)
+
+        logger.info(f"imported {ds_file['filename']}: {entries} entries in {batches} batches")
+        return True
+
+    def rollback_import(self, ds_file: dict) -> None:
+        """Removes the running data of the module of a partially imported file, which had none before the import."""
+        try:
+            with self.session(Datastore.RUNNING) as sess:
+                sess.replace_config(None, ds_file['module_name'])
+            logger.info(f"removed the partially imported data of module {ds_file['module_name']}")
+        except sysrepo.SysrepoError as e:
+            logger.error(f"Could not remove the partially imported data of module {ds_file['module_name']}, {ds_file['filename']} is skipped on the next start. Exception: {e}")
+
+    @staticmethod
+    def keep_cached_file(cache: LybCache, context_key: str, ds_file: dict) -> None:
+        if 'sha256' in ds_file:
+            cache.keep(context_key, cache.get_hash_key(ds_file['sha256'], ds_file['extension']))
+            return
+        try:
+            with open(ds_file['filename'], 'rb') as file:
+                cache.keep(context_key, cache.get_content_key(file.read(), ds_file['extension']))
+        except OSError:
+            pass
+
+    def parse_datastore_file(self, ctx, ds_file: dict, cache: LybCache|None = None, context_key: str|None = None):
+        logger.debug(f"Parsing {ds_file['extension']} data for {ds_file['module_name']} in datastore {ds_file['datastore']} from file {ds_file['filename']}")
+        try:
+            if ds_file['extension'] == "lyb":
+                # already parsed, e.g. by benchmark.datastore_generator; bound to the YANG modules it was written with
+                with open(ds_file['filename'], 'rb') as file:
+                    return ctx.parse_data_file(file, "lyb", parse_only=True)
+
+            if cache is not None and 'sha256' in ds_file:
+                # the hash of the manifest, the file is not read at all when its snapshot is cached
+                content_key = cache.get_hash_key(ds_file['sha256'], ds_file['extension'])
+                data = cache.load(ctx, context_key, content_key)
+                if data is not None:
+                    return data
+
+            with open(ds_file['filename'], 'rb') as file:
+                content = file.read()
+
+            if cache is not None and 'sha256' not in ds_file:
+                content_key = cache.get_content_key(content, ds_file['extension'])
+                data = cache.load(ctx, context_key, content_key)
+                if data is not None:
+                    return data
+
+            data = ctx.parse_data_mem(content.decode("utf-8"), ds_file['extension'], parse_only=True)
+            if cache is not None and data is not None:
+                cache.store(context_key, content_key, data)
+            return data
+        except (LibyangError, OSError, UnicodeDecodeError) as e:
+            logger.error(f"Could not load {ds_file['extension']} data in {ds_file['datastore']} for module {ds_file['module_name']} from {ds_file['filename']}")
+            logger.error(f"Exception: {e}")
+            return None
+
+    def apply_datastore_files(self, datastore: Datastore, entries: list) -> None:
+        logger.info(f"applying {len(entries)} data files to datastore {datastore}")
+        merged = entries[0][1].duplicate(with_siblings=True, recursive=True)
+        try:
+            for _, data in entries[1:]:
+                merged.merge(data, with_siblings=True)
+
+            with self.edit_session(datastore) as sess:
+                try:
+                    sess.edit_batch_ly(merged)
+                    sess.apply_changes()
+                    return
+                except sysrepo.SysrepoError as e:
+                    logger.error(f"Could not apply the data files to datastore {datastore} in one batch, applying them one by one. Error: {e}")
+                    sess.discard_changes()
+
+                # find out which file is broken, and load the others anyway
+                for ds_file, data in entries:
+                    try:
+                        sess.edit_batch_ly(data)
+                        sess.apply_changes()
+                    except sysrepo.SysrepoError as e:
+                        sess.discard_changes()
+                        logger.error(f"Could not load {ds_file['extension']} data in {ds_file['datastore']} for module {ds_file['module_name']} from {ds_file['filename']}")
+                        logger.error(f"Exception: {e}")
+        finally:
+            merged.free()
+            for _, data in entries:
+                data.free()
+
     @staticmethod
     def get_datastore_files(directory: str, filter=None) -> list:
         extensions = ['json', 'xml']
@@ -179,3 +654,110 @@ class Netconf:
         ordered_results = top_entries + other_entries
 
         return ordered_results
+
+"""
+OperDataProvider
+----
+Base of the providers of operational data: subclasses implement load(), which computes the data of
+a requested xpath, e.g. by asking other network elements (see load() for its contract). Results are
+kept per requested xpath; an entry is fresh for ttl seconds (None: until invalidated) and as long as
+the version did not change, invalidate() bumps the version when the underlying state changes. An
+expired entry is still served for stale more seconds while a background thread loads it again, so
+that polling clients never wait for a reload; invalidated and older entries are loaded while the
+request waits.
+"""
+class OperDataProvider(ABC):
+    module: str
+    xpath: str
+    ttl: float | None
+    stale: float
+
+    max_entries: int = 64
+
+    def __init__(self, module: str, xpath: str, ttl: float | None = None, stale: float = 0) -> None:
+        self.module = module
+        self.xpath = xpath
+        self.ttl = ttl
+        self.stale = stale
+
+        self.lock = threading.Lock()
+        # requested xpath -> (version, time loaded, data)
+        self.entries: OrderedDict[str, tuple[int, float, Any]] = OrderedDict()
+        self.version = 0
+        self.refreshing: set[str] = set()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    @abstractmethod
+    def load(self, xpath: str) -> Any:
+        """
+        Returns the data of the requested xpath, as render() expects it.
+
+        Called without the lock, on the thread of a request or of a background refresh, so loads of the
+        same or of different xpaths may run concurrently. The result is shared by all the requests it is
+        served to until it expires, and must not be modified afterwards. An exception fails the request
+        which is waiting for the data; a failed refresh keeps serving the previous data.
+        """
+
+    def render(self, data: Any) -> dict | None:
+        """Returns the answer to a request from loaded data; by default the data itself, which must then not be modified."""
+        return data
+
+    def subscribe(self, **kwargs) -> None:
+        with Netconf().edit_session(Datastore.OPERATIONAL) as sess:
+            sess.subscribe_oper_data_request(self.module, self.xpath, self.provide, **kwargs)
+
+    def provide(self, xpath: str, private_data: Any, **kwargs) -> dict | None:
+        return self.render(self.get(xpath or self.xpath))
+
+    def get(self, xpath: str) -> Any:
+        with self.lock:
+            version = self.version
+            entry = self.entries.get(xpath)
+            if entry is not None and entry[0] == version:
+                age = time.monotonic() - entry[1]
+                if self.ttl is None or age < self.ttl:
+                    self.hits = self.hits + 1
+                    self.entries.move_to_end(xpath)
+                    return entry[2]
+                if age < self.ttl + self.stale:
+                    self.stale_hits = self.stale_hits + 1
+                    self.entries.move_to_end(xpath)
+                    if xpath not in self.refreshing:
+                        self.refreshing.add(xpath)
+                        threading.Thread(target=self.refresh, args=(xpath, version), name=f"oper-refresh-{self.module}", daemon=True).start()
+                    return entry[2]
+            self.misses = self.misses + 1
+
+        data = self.load(xpath)
+        self.store(xpath, version, data)
+        return data
+
+    def refresh(self, xpath: str, version: int) -> None:
+        try:
+            self.store(xpath, version, self.load(xpath))
+        except Exception as e:
+            logger.warning(f"could not refresh operational data of {xpath}, serving the previous data. Error: {e}")
+        finally:
+            with self.lock:
+                self.refreshing.discard(xpath)
+
+    def store(self, xpath: str, version: int, data: Any) -> None:
+        with self.lock:
+            if self.version != version:
+                # invalidated while loading, the data may already be outdated
+                return
+            self.entries[xpath] = (version, time.monotonic(), data)
+            self.entries.move_to_end(xpath)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def invalidate(self) -> None:
+        with self.lock:
+            self.version = self.version + 1
+            self.entries.clear()
+
+    def get_stats(self) -> dict:
+        with self.lock:
+            return {"entries": len(self.entries), "hits": self.hits, "stale_hits": self.stale_hits, "misses": self.misses}
@@ -0,0 +1,163 @@
+# /*************************************************************************
+# *
+# * Copyright 2025 highstreet technologies and others
+# *
+# * Licensed under the Apache License, Version 2.0 (the "License");
+# * you may not use this file except in compliance with the License.
+# * You may obtain a copy of the License at
+# *
+# *     http://www.apache.org/licenses/LICENSE-2.0
+# *
+# * Unless required by applicable law or agreed to in writing, software
+# * distributed under the License is distributed on an "AS IS" BASIS,
+# * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# * See the License for the specific language governing permissions and
+# * limitations under the License.
+# ***************************************************************************/
+
+from util.logging import get_pynts_logger
+import copy
+import re
+import threading
+from collections import OrderedDict
+
+import sysrepo
+from sysrepo.session import SysrepoSession
+
+logger = get_pynts_logger("netconf-cache")
+
+MODULE_XPATH_RE = re.compile(r"^/([^/:\[]+):")
+
+"""
+NetconfReadCache
+----
+Keeps the results of running datastore reads per xpath, so that repeated reads of the same
+subtree are served without a round trip to sysrepo. The first read of a module subscribes to
+its changes; any change of the module drops its entries. Entries are evicted least recently
+used first once their (approximate) size exceeds the budget.
+"""
+class NetconfReadCache:
+    budget: int
+    size: int
+    hits: int
+    misses: int
+
+    def __init__(self, connection: sysrepo.SysrepoConnection, budget: int) -> None:
+        self.connection = connection
+        self.budget = budget
+        self.lock = threading.Lock()
+        self.subscribe_lock = threading.Lock()
+
+        # xpath -> (module, size, data)
+        self.entries: OrderedDict[str, tuple[str, int, dict]] = OrderedDict()
+        self.size = 0
+        # bumped on every change of a module, a read started before a change must not be cached
+        self.generations: dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+
+        self.session: SysrepoSession | None = None
+
+    @staticmethod
+    def get_module(xpath: str) -> str | None:
+        match = MODULE_XPATH_RE.match(xpath)
+        return match.group(1) if match else None
+
+    def get_data(self, sess: SysrepoSession, xpath: str) -> dict:
+        """Returns a copy of the cached data of xpath, reading it through sess on a miss."""
+        module = self.get_module(xpath)
+        if module is None:
+            return sess.get_data(xpath)
+
+        with self.lock:
+            entry = self.entries.get(xpath)
+            if entry is not None:
+                self.entries.move_to_end(xpath)
+                self.hits = self.hits + 1
+                data = entry[2]
+            else:
+                self.misses = self.misses + 1
+                data = None
+            generation = self.generations.get(module)
+
+        # callers modify the returned data, e.g. before writing it back
+        if data is not None:
+            return copy.deepcopy(data)
+
+        if generation is None:
+            # subscribe before reading, so that no change after the read goes unnoticed
+            if not self.subscribe(module):
+                return sess.get_data(xpath)
+            with self.lock:
+                generation = self.generations[module]
+
+        data = sess.get_data(xpath)
+        self.store(module, generation, xpath, copy.deepcopy(data))
+        return data
+
+    def subscribe(self, module: str) -> bool:
+        with self.subscribe_lock:
+            with self.lock:
+                if module in self.generations:
+                    return True
+
+            try:
+                if self.session is None:
+                    self.session = self.connection.start_session("running")
+                self.session.subscribe_module_change_unsafe(module, None, self.module_change_cb, passive=True, done_only=True, private_data=module)
+            except sysrepo.SysrepoError as e:
+                logger.warning(f"not caching reads of module {module}, could not subscribe to its changes. Error: {e}")
+                return False
+
+            with self.lock:
+                self.generations[module] = 0
+            logger.debug(f"caching reads of module {module}")
+            return True
+
+    def module_change_cb(self, session, event: str, req_id: int, private_data) -> None:
+        self.invalidate(private_data)
+
+    @staticmethod
+    def estimate_size(data) -> int:
+        """Approximates the size of the data as text, walking it as KeyedList is not a real list."""
+        if isinstance(data, dict):
+            return sum(len(key) + NetconfReadCache.estimate_size(value) for key, value in data.items()) + 2
+        if isinstance(data, list):
+            return sum(NetconfReadCache.estimate_size(value) for value in data) + 2
+        if isinstance(data, str):
+            return len(data) + 2
+        return 8
+
+    def store(self, module: str, generation: int, xpath: str, data: dict) -> None:
+        size = self.estimate_size(data)
+        if size > self.budget:
+            return
+
+        with self.lock:
+            if self.generations.get(module) != generation:
+                return
+
+            self.remove(xpath)
+            self.entries[xpath] = (module, size, data)
+            self.size = self.size + size
+            while self.size > self.budget:
+                self.remove(next(iter(self.entries)))
+
+    def remove(self, xpath: str) -> None:
+        """Removes the entry of xpath, the lock must be held."""
+        entry = self.entries.pop(xpath, None)
+        if entry is not None:
+            self.size = self.size - entry[1]
+
+    def invalidate(self, module: str | None = None) -> None:
+        """Drops the entries of the module, or all entries."""
+        with self.lock:
+            for name in self.generations:
+                if module is None or name == module:
+                    self.generations[name] = self.generations[name] + 1
+            for xpath in [xpath for xpath, entry in self.entries.items() if module is None or entry[0] == module]:
+                self.remove(xpath)
+
+    def get_stats(self) -> dict:
+        with self.lock:
+            return {"entries": len(self.entries), "size": self.size, "budget": self.budget, "hits": self.hits, "misses": self.misses}
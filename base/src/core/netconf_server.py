@@ -65,7 +65,8 @@ class NetconfServer:
 
     def set_config(self) -> None:
         self.netconf: Netconf = Netconf()
-        self.netconf.running.copy_config("startup", "ietf-netconf-server")  # reset the ietf-netconf-server module
+        with self.netconf.session("running") as sess:
+            sess.copy_config("startup", "ietf-netconf-server")  # reset the ietf-netconf-server module
         self.config: Config = Config()
 
         self.crypto: CryptoUtils = CryptoUtils()
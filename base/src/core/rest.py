@@ -17,9 +17,14 @@
 
 from util.logging import get_pynts_logger
 import threading
+import falcon
 import falcon.asgi
+import falcon.media
 import uvicorn
 
+from util import serializer
+from core.metrics import MetricsRest
+
 logger = get_pynts_logger("rest")
 
 class Rest:
@@ -51,7 +56,12 @@ class Rest:
     def init(self) -> None:
         self.routes = {}
         self.app = falcon.asgi.App()
+
+        json_handler = falcon.media.JSONHandler(dumps=serializer.dumps, loads=serializer.loads)
+        self.app.req_options.media_handlers.update({falcon.MEDIA_JSON: json_handler})
+        self.app.resp_options.media_handlers.update({falcon.MEDIA_JSON: json_handler})
         self.app.add_route("/", self.DefaultRoute(self))
+        self.add_route("/metrics", MetricsRest())
 
         # uvicorn server
         config = uvicorn.Config(self.app, host="0.0.0.0", port=8080, log_level="info")
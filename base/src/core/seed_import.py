@@ -0,0 +1,427 @@
+# /*************************************************************************
+# *
+# * Copyright 2025 highstreet technologies and others
+# *
+# * Licensed under the Apache License, Version 2.0 (the "License");
+# * you may not use this file except in compliance with the License.
+# * You may obtain a copy of the License at
+# *
+# *     http://www.apache.org/licenses/LICENSE-2.0
+# *
+# * Unless required by applicable law or agreed to in writing, software
+# * distributed under the License is distributed on an "AS IS" BASIS,
+# * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# * See the License for the specific language governing permissions and
+# * limitations under the License.
+# ***************************************************************************/
+
+from typing import Generator, Iterator
+import codecs
+import json
+import mmap
+import os
+import re
+import xml.parsers.expat
+
+# a whole string (or one up to the end of the buffer, then group 1 matches), or a structural character
+TOKEN = re.compile(r'"[^"\\]*(?:\\[\s\S][^"\\]*)*(?:"|\\?(\Z))|[{}\[\],:]')
+# within a value copied whole: everything up to the next bracket (group 1), or up to a string which
+# continues beyond the buffer (group 2) or the end of the buffer
+SKIP_RUN = re.compile(r'(?:[^"{}\[\]]+|"[^"\\]*(?:\\[\s\S][^"\\]*)*")*(?:([{}\[\]])|(")|\Z)')
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+JSON_READ_SIZE = 1024 * 1024
+XML_READ_SIZE = 1024 * 1024
+XML_WRAPPER = b"<pynts-seed>"
+
+class SeedSplitError(Exception):
+    pass
+
+"""
+JsonFrame
+----
+An object or array of a JSON seed document which the splitter looks into: the root object, the
+top-level containers and the top-level lists. mark is where the current member or entry starts,
+the part of the document which must be kept in the buffer.
+"""
+class JsonFrame:
+    def __init__(self, kind: str, path: list[str], mark: int) -> None:
+        self.kind = kind
+        self.path = path
+        self.mark = mark
+        self.key: str | None = None
+        self.state = "key"
+        self.handled = False
+        self.entries = 0
+
+"""
+JsonSeedSplitter
+----
+Splits a JSON seed document into batches of the entries of its top-level lists (lists which are
+top-level nodes, or children of top-level containers). Each batch is a JSON document of its own,
+holding the entries of the batch below the same top-level nodes; other members are kept whole.
+The file is read in blocks of JSON_READ_SIZE bytes and scanned incrementally, keeping track of
+strings and of the nesting depth, so only the current entry or member is kept beyond the block.
+An entry is copied as text once it is decoded whole from the buffer, or else scanned up to its end.
+"""
+class JsonSeedSplitter:
+    def __init__(self, file, size: int, max_entries: int, max_bytes: int) -> None:
+        self.file = file
+        self.file_size = max(1, size)
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max_bytes
+        self.decoder = json.JSONDecoder()
+
+        # the text read and not yet split, a BOM is left out
+        self.text_decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self.buffer = ""
+        self.base = 0           # position of the buffer in the text
+        self.bytes_read = 0
+        self.eof = False
+        self.frames: list[JsonFrame] = []
+        self.new_batch()
+
+    def new_batch(self) -> None:
+        self.members: dict = {}
+        self.entries = 0
+        self.size = 0
+
+    def add(self, path: list[str], value: str | None, is_entry: bool = False) -> None:
+        members = self.members
+        for key in path[:-1]:
+            members = members.setdefault(key, {})
+        if value is None:
+            # a container, kept even when empty
+            members.setdefault(path[-1], {})
+            return
+
+        if is_entry:
+            members.setdefault(path[-1], []).append(value)
+            self.entries = self.entries + 1
+        else:
+            members[path[-1]] = value
+        self.size = self.size + len(value)
+
+    def is_full(self) -> bool:
+        return self.entries >= self.max_entries or (self.max_bytes > 0 and self.size >= self.max_bytes)
+
+    @staticmethod
+    def render(members: dict) -> str:
+        parts = []
+        for key, value in members.items():
+            if isinstance(value, dict):
+                value = JsonSeedSplitter.render(value)
+            elif isinstance(value, list):
+                value = "[" + ",".join(value) + "]"
+            parts.append(json.dumps(key) + ":" + value)
+        return "{" + ",".join(parts) + "}"
+
+    def read(self, pos: int) -> int:
+        """Reads the next block, drops what is no longer needed from the buffer and returns pos in the new buffer."""
+        keep = self.base + pos
+        if len(self.frames) == 0:
+            keep = self.base
+        elif self.frames[-1].kind == "[" or (self.frames[-1].state == "value" and not self.frames[-1].handled):
+            keep = min(keep, self.frames[-1].mark)
+
+        block = self.file.read(JSON_READ_SIZE)
+        self.bytes_read = self.bytes_read + len(block)
+        self.eof = len(block) == 0
+        self.buffer = self.buffer[keep - self.base:] + self.text_decoder.decode(block, self.eof)
+        pos = pos - (keep - self.base)
+        self.base = keep
+        return pos
+
+    def progress(self, pos: int) -> float:
+        """The part of the file scanned up to pos in the buffer, exact for ASCII text."""
+        return min(1.0, self.bytes_read / self.file_size * (self.base + pos) / max(1, self.base + len(self.buffer)))
+
+    def text(self, start: int, end: int) -> str:
+        """The text of the member or entry between the positions start and end."""
+        return self.buffer[start - self.base:end - self.base].strip()
+
+    def end_of_document(self) -> SeedSplitError:
+        return SeedSplitError(f"unexpected end of the document at character {self.base + len(self.buffer)}")
+
+    def take_entries(self, frame: JsonFrame, pos: int) -> Generator[tuple[str, int, float], None, int]:
+        """
+        Adds the list entries from pos (after '[' or ',') on which are whole in the buffer, as most are, yields
+        the batches which get full, and returns the position from which the rest of the list is scanned.
+        """
+        buffer = self.buffer
+        while True:
+            start = WHITESPACE.match(buffer, pos).end()
+            if start >= len(buffer) or buffer[start] == "]":
+                return pos
+            try:
+                end = self.decoder.raw_decode(buffer, start)[1]
+            except ValueError:
+                # incomplete or not valid
+                return pos
+            after = WHITESPACE.match(buffer, end).end()
+            if after >= len(buffer) or buffer[after] not in ",]":
+                # e.g. a number, which may continue in the next block
+                return pos
+
+            self.add(frame.path, buffer[start:end], is_entry=True)
+            frame.entries = frame.entries + 1
+            if buffer[after] == "]":
+                frame.handled = True
+                frame.mark = self.base + end
+                return after
+
+            pos = after + 1
+            frame.mark = self.base + pos
+            if self.is_full():
+                yield self.render(self.members), self.entries, self.progress(pos)
+                self.new_batch()
+
+    def split(self) -> Iterator[tuple[str, int, float]]:
+        """Yields (document, entries, progress) per batch, progress is the part of the file scanned (0 to 1)."""
+        pos = self.read(0)
+        skip = 0    # depth within a value which is copied whole
+        while True:
+            if skip > 0:
+                match = SKIP_RUN.match(self.buffer, pos)
+                if match.group(1) is None:
+                    if self.eof:
+                        raise self.end_of_document()
+                    pos = self.read(match.end() if match.group(2) is None else match.start(2))
+                    continue
+                pos = match.end()
+                skip = skip + 1 if match.group(1) in "{[" else skip - 1
+                continue
+
+            match = TOKEN.search(self.buffer, pos)
+            if match is None or match.group(1) is not None:
+                # no token, or a string up to the end of the buffer
+                if self.eof:
+                    raise self.end_of_document()
+                pos = self.read(len(self.buffer) if match is None else match.start())
+                continue
+
+            char = match.group()[0]
+            at = self.base + match.start()
+            pos = match.end()
+
+            if len(self.frames) == 0:
+                if char != "{" or self.buffer[:match.start()].strip() != "":
+                    raise SeedSplitError(f"expected '{{' at character {at}")
+                self.frames.append(JsonFrame("{", [], at + 1))
+                continue
+
+            frame = self.frames[-1]
+            if frame.kind == "[":
+                if char in "{[":
+                    skip = 1
+                elif char in ",]":
+                    value = self.text(frame.mark, at)
+                    if frame.handled:
+                        if value != "":
+                            raise SeedSplitError(f"expected ',' at character {frame.mark}")
+                    elif value != "":
+                        self.add(frame.path, value, is_entry=True)
+                        frame.entries = frame.entries + 1
+                    elif char == "," or frame.entries > 0:
+                        raise SeedSplitError(f"expected a value at character {at}")
+                    frame.handled = False
+
+                    if self.is_full():
+                        yield self.render(self.members), self.entries, self.progress(match.start())
+                        self.new_batch()
+
+                    if char == "]":
+                        if frame.entries == 0:
+                            self.add(frame.path, "[]")
+                        self.frames.pop()
+                        continue
+                    frame.mark = at + 1
+                elif char != '"':
+                    raise SeedSplitError(f"unexpected '{char}' at character {at}")
+                if char == ",":
+                    pos = yield from self.take_entries(frame, pos)
+                continue
+
+            if char == '"':
+                if frame.state == "key":
+                    try:
+                        frame.key = json.loads(match.group())
+                    except ValueError as e:
+                        raise SeedSplitError(f"invalid key at character {at}: {e}")
+                    frame.state = "colon"
+                elif frame.state != "value":
+                    raise SeedSplitError(f"expected ':' at character {at}")
+            elif char == ":":
+                if frame.state != "colon":
+                    raise SeedSplitError(f"unexpected ':' at character {at}")
+                frame.state = "value"
+                frame.mark = at + 1
+                frame.handled = False
+            elif char in "{[":
+                if frame.state != "value":
+                    raise SeedSplitError(f"unexpected '{char}' at character {at}")
+                path = frame.path + [frame.key]
+                if frame.handled or self.text(frame.mark, at) != "":
+                    skip = 1
+                elif char == "{" and len(path) == 1:
+                    self.add(path, None)
+                    frame.handled = True
+                    self.frames.append(JsonFrame("{", path, at + 1))
+                elif char == "[" and len(path) <= 2:
+                    frame.handled = True
+                    self.frames.append(JsonFrame("[", path, at + 1))
+                    pos = yield from self.take_entries(self.frames[-1], pos)
+                else:
+                    skip = 1
+            elif char in ",}":
+                if frame.state == "value":
+                    if not frame.handled:
+                        value = self.text(frame.mark, at)
+                        if value == "":
+                            raise SeedSplitError(f"expected a value at character {at}")
+                        self.add(frame.path + [frame.key], value)
+                elif frame.state == "colon" or char == ",":
+                    raise SeedSplitError(f"unexpected '{char}' at character {at}")
+                frame.key = None
+                frame.state = "key"
+                if char == "}":
+                    self.frames.pop()
+                    if len(self.frames) == 0:
+                        break
+            else:
+                raise SeedSplitError(f"unexpected '{char}' at character {at}")
+
+        if len(self.members) > 0:
+            yield self.render(self.members), self.entries, 1.0
+
+"""
+XmlSeedSplitter
+----
+Splits an XML seed document (any number of top-level elements) the same way: a batch holds whole
+small top-level elements, and the start tag, a bounded number of child elements and the end tag
+of large ones. Elements are copied byte by byte, so namespace prefixes, also those used in values,
+are kept. The data (e.g. a memory-mapped file) is scanned by expat in bounded reads.
+"""
+class XmlSeedSplitter:
+    def __init__(self, data, max_entries: int, max_bytes: int) -> None:
+        self.data = data
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max_bytes
+
+        # a prolog may only be at the very beginning, it is left out of the wrapped document
+        self.offset = 0
+        if data[:3] == b"\xef\xbb\xbf":
+            self.offset = 3
+        if data[self.offset:self.offset + 5] == b"<?xml":
+            self.offset = data.find(b"?>", self.offset) + 2
+
+        self.parser = xml.parsers.expat.ParserCreate()
+        self.parser.StartElementHandler = self.start_element
+        self.parser.EndElementHandler = self.end_element
+        self.depth = 0
+        self.ready: list[tuple[str, int, float]] = []
+
+        self.top_name = ""
+        self.top_start = 0
+        self.top_tag = b""
+        self.top_children = 0
+        self.child_start = 0
+        self.children: list[bytes] = []
+        self.new_batch()
+
+    def new_batch(self) -> None:
+        self.parts: list[bytes] = []
+        self.children = []
+        self.entries = 0
+        self.size = 0
+
+    def position(self) -> int:
+        """Position of the current expat event in data."""
+        return self.parser.CurrentByteIndex - len(XML_WRAPPER) + self.offset
+
+    def tag_end(self, i: int) -> int:
+        return self.data.find(b">", i) + 1
+
+    def element_end(self, start: int) -> int:
+        """End of the element starting at start, when expat reports its end."""
+        start_tag_end = self.tag_end(start)
+        if self.data[start_tag_end - 2:start_tag_end] == b"/>":
+            # an empty element, expat reports its end after the tag
+            return start_tag_end
+        return self.tag_end(self.position())
+
+    def is_full(self) -> bool:
+        return self.entries >= self.max_entries or (self.max_bytes > 0 and self.size >= self.max_bytes)
+
+    def start_element(self, name: str, attributes: dict) -> None:
+        self.depth = self.depth + 1
+        if self.depth == 2:
+            self.top_name = name
+            self.top_start = self.position()
+            self.top_tag = self.data[self.top_start:self.tag_end(self.top_start)]
+            self.top_children = 0
+        elif self.depth == 3:
+            self.child_start = self.position()
+
+    def end_element(self, name: str) -> None:
+        if self.depth == 3:
+            end = self.element_end(self.child_start)
+            self.children.append(self.data[self.child_start:end])
+            self.entries = self.entries + 1
+            self.size = self.size + end - self.child_start
+            self.top_children = self.top_children + 1
+            if self.is_full():
+                self.flush(end)
+        elif self.depth == 2:
+            end = self.element_end(self.top_start)
+            if self.top_children == 0:
+                # a top-level leaf or an empty container, copied whole
+                self.parts.append(self.data[self.top_start:end])
+                self.size = self.size + end - self.top_start
+            elif len(self.children) > 0:
+                self.parts.append(self.render_top())
+            self.children = []
+            if self.is_full():
+                self.flush(end)
+        self.depth = self.depth - 1
+
+    def render_top(self) -> bytes:
+        return self.top_tag + b"".join(self.children) + b"</" + self.top_name.encode("utf-8") + b">"
+
+    def flush(self, position: int) -> None:
+        document = b"".join(self.parts)
+        if len(self.children) > 0:
+            document = document + self.render_top()
+        self.ready.append((document.decode("utf-8"), self.entries, position / len(self.data)))
+        self.new_batch()
+
+    def split(self) -> Iterator[tuple[str, int, float]]:
+        """Yields (document, entries, progress) per batch, progress is the part of the data scanned (0 to 1)."""
+        try:
+            self.parser.Parse(XML_WRAPPER, False)
+            for i in range(self.offset, len(self.data), XML_READ_SIZE):
+                self.parser.Parse(self.data[i:i + XML_READ_SIZE], False)
+                yield from self.ready
+                self.ready = []
+            self.parser.Parse(b"</" + XML_WRAPPER[1:], True)
+        except xml.parsers.expat.ExpatError as e:
+            raise SeedSplitError(str(e))
+
+        if len(self.parts) > 0:
+            self.flush(len(self.data))
+        yield from self.ready
+
+def split_seed_file(path: str, format: str, max_entries: int, max_bytes: int) -> Iterator[tuple[str, int, float]]:
+    """
+    Yields (document, entries, progress) for each batch of the seed file, see JsonSeedSplitter and XmlSeedSplitter.
+    A batch holds at most max_entries list entries, and stops taking entries once it reaches max_bytes (0 is no limit).
+    """
+    with open(path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return
+        if format == "json":
+            yield from JsonSeedSplitter(file, os.fstat(file.fileno()).st_size, max_entries, max_bytes).split()
+        elif format == "xml":
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                yield from XmlSeedSplitter(data, max_entries, max_bytes).split()
+        else:
+            raise SeedSplitError(f"unsupported format {format}")
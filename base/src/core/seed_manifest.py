@@ -0,0 +1,180 @@
+# /*************************************************************************
+# *
+# * Copyright 2025 highstreet technologies and others
+# *
+# * Licensed under the Apache License, Version 2.0 (the "License");
+# * you may not use this file except in compliance with the License.
+# * You may obtain a copy of the License at
+# *
+# *     http://www.apache.org/licenses/LICENSE-2.0
+# *
+# * Unless required by applicable law or agreed to in writing, software
+# * distributed under the License is distributed on an "AS IS" BASIS,
+# * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# * See the License for the specific language governing permissions and
+# * limitations under the License.
+# ***************************************************************************/
+
+from util.logging import get_pynts_logger
+import hashlib
+import json
+import os
+import tempfile
+
+logger = get_pynts_logger("seed-manifest")
+
+MANIFEST_FILENAME = "manifest.json"
+MANIFEST_VERSION = 2
+
+"""
+SeedManifest
+----
+Index of the /data seed files, kept in <directory>/manifest.json: module, datastore, format,
+size, SHA-256 hash and load order of each file. It is generated on the first start and
+updated whenever files are added, removed or changed. A file whose size and modification
+time did not change keeps its recorded hash without being read again.
+Files are loaded in ascending order, the files of the same order together. The order follows
+the YANG imports between the seeded modules, so that the data of imported modules is loaded
+before the data of the modules which import them; an order edited in the manifest is kept as
+long as the content of the file does not change.
+"""
+class SeedManifest:
+    directory: str
+    path: str
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        self.path = os.path.join(directory, MANIFEST_FILENAME)
+        self.entries: dict[str, dict] = self.read()
+
+    def read(self) -> dict[str, dict]:
+        try:
+            with open(self.path, 'r') as file:
+                manifest = json.load(file)
+        except FileNotFoundError:
+            logger.info(f"no seed manifest {self.path} yet, generating it")
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"ignoring unreadable seed manifest {self.path}. Error: {e}")
+            return {}
+
+        if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION:
+            logger.warning(f"ignoring seed manifest {self.path} of an unknown version")
+            return {}
+        return {entry["filename"]: entry for entry in manifest.get("files", []) if isinstance(entry, dict) and "filename" in entry}
+
+    def index(self, ds_files: list, ctx, first: tuple[str, ...] = ()) -> list:
+        """
+        Adds 'size', 'sha256' and 'order' to the files listed by Netconf.get_datastore_files() and
+        returns them in load order. The order is the import level of the module (see get_levels(),
+        the modules in first before all others), or the order recorded for the file when its hash
+        did not change. The manifest is written back when anything changed.
+        """
+        entries = {}
+        indexed = []
+        kept_orders: dict[str, int] = {}
+        for ds_file in ds_files:
+            filename = os.path.basename(ds_file['filename'])
+            try:
+                stat = os.stat(ds_file['filename'])
+            except OSError as e:
+                logger.error(f"cannot index seed file {ds_file['filename']}. Error: {e}")
+                continue
+
+            recorded = self.entries.get(filename)
+            entry = recorded
+            if entry is None or entry.get("size") != stat.st_size or entry.get("mtime_ns") != stat.st_mtime_ns or "sha256" not in entry:
+                try:
+                    entry = {"sha256": self.hash_file(ds_file['filename'])}
+                except OSError as e:
+                    logger.error(f"cannot index seed file {ds_file['filename']}. Error: {e}")
+                    continue
+                logger.debug(f"indexed seed file {filename}")
+            if recorded is not None and recorded.get("sha256") == entry["sha256"] and isinstance(recorded.get("order"), int):
+                kept_orders[filename] = recorded["order"]
+
+            entries[filename] = {
+                "filename": filename,
+                "module": ds_file['module_name'],
+                "datastore": ds_file['datastore'],
+                "format": ds_file['extension'],
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+                "sha256": entry["sha256"]
+            }
+            indexed.append({**ds_file, 'size': stat.st_size, 'sha256': entry["sha256"]})
+
+        levels = self.get_levels(ctx, {ds_file['module_name'] for ds_file in indexed}, first)
+        for ds_file in indexed:
+            filename = os.path.basename(ds_file['filename'])
+            order = levels[ds_file['module_name']] + 1
+            if filename in kept_orders:
+                if kept_orders[filename] != order:
+                    logger.info(f"loading seed file {filename} in the order {kept_orders[filename]} of the manifest, instead of {order}")
+                order = kept_orders[filename]
+            ds_file['order'] = order
+            entries[filename]["order"] = order
+        indexed.sort(key=lambda ds_file: (ds_file['order'], ds_file['module_name'], ds_file['datastore']))
+
+        if entries != self.entries:
+            self.entries = entries
+            self.write()
+        return indexed
+
+    @staticmethod
+    def hash_file(path: str) -> str:
+        sha256 = hashlib.sha256()
+        with open(path, 'rb') as file:
+            for chunk in iter(lambda: file.read(1024 * 1024), b""):
+                sha256.update(chunk)
+        return sha256.hexdigest()
+
+    @staticmethod
+    def get_levels(ctx, modules: set[str], first: tuple[str, ...] = ()) -> dict[str, int]:
+        """
+        Level 0 are the modules importing none of the other seeded modules, level n the ones importing
+        seeded modules of lower levels only. The modules in first get level -1.
+        """
+        imports: dict[str, set[str]] = {}
+
+        def get_imports(name: str) -> set[str]:
+            # transitive imports of the module
+            if name not in imports:
+                imports[name] = set()
+                try:
+                    direct = [module_import.name() for module_import in ctx.get_module(name).imports()]
+                except Exception as e:
+                    # e.g. no module of that name, or its parsed form is not kept by the context
+                    logger.debug(f"cannot get the imports of module {name}. Error: {e}")
+                    direct = []
+                for module_name in direct:
+                    imports[name] = imports[name] | {module_name} | get_imports(module_name)
+            return imports[name]
+
+        levels: dict[str, int] = {}
+
+        def get_level(name: str) -> int:
+            if name not in levels:
+                levels[name] = 0    # YANG imports have no cycles, this only guards against broken contexts
+                dependencies = [module_name for module_name in get_imports(name) if module_name in modules and module_name != name]
+                levels[name] = 1 + max([get_level(module_name) for module_name in dependencies], default=-1)
+            return levels[name]
+
+        return {name: -1 if name in first else get_level(name) for name in modules}
+
+    def write(self) -> None:
+        files = sorted(self.entries.values(), key=lambda entry: (entry.get("order", 0), entry["filename"]))
+        tmp_path = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".manifest-", suffix=".tmp")
+            with os.fdopen(fd, 'w') as file:
+                json.dump({"version": MANIFEST_VERSION, "files": files}, file, indent=2)
+            os.replace(tmp_path, self.path)
+            logger.info(f"updated seed manifest {self.path} with {len(files)} files")
+        except OSError as e:
+            logger.warning(f"could not write seed manifest {self.path}, e.g. /data is read-only. Error: {e}")
+            if tmp_path is not None:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
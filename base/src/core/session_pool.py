@@ -0,0 +1,134 @@
+# /*************************************************************************
+# *
+# * Copyright 2025 highstreet technologies and others
+# *
+# * Licensed under the Apache License, Version 2.0 (the "License");
+# * you may not use this file except in compliance with the License.
+# * You may obtain a copy of the License at
+# *
+# *     http://www.apache.org/licenses/LICENSE-2.0
+# *
+# * Unless required by applicable law or agreed to in writing, software
+# * distributed under the License is distributed on an "AS IS" BASIS,
+# * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# * See the License for the specific language governing permissions and
+# * limitations under the License.
+# ***************************************************************************/
+
+from util.logging import get_pynts_logger
+import threading
+import time
+from contextlib import contextmanager
+
+import sysrepo
+from sysrepo.session import SysrepoSession
+
+logger = get_pynts_logger("session-pool")
+
+"""
+SessionPool
+----
+Bounded pool of reusable sysrepo sessions of one datastore. A session is used by one thread at a
+time: checkout() blocks while all sessions are in use, and a thread checking out again before its
+checkin gets the session it already holds. A thread preferably gets back the session it used
+last. Uncommitted changes are discarded on the final checkin.
+"""
+class SessionPool:
+    datastore: str
+    size: int
+
+    def __init__(self, connection: sysrepo.SysrepoConnection, datastore: str, size: int) -> None:
+        self.connection = connection
+        self.datastore = datastore
+        self.size = max(1, size)
+
+        self.condition = threading.Condition()
+        self.idle: list[SysrepoSession] = []
+        self.sessions: list[SysrepoSession] = []
+        self.local = threading.local()
+        self.waits = 0
+
+    def checkout(self, timeout: float | None = None) -> SysrepoSession:
+        held = getattr(self.local, "held", None)
+        if held is not None:
+            self.local.depth = self.local.depth + 1
+            return held
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.condition:
+            while True:
+                last = getattr(self.local, "last", None)
+                if last is not None and last in self.idle:
+                    session = last
+                    self.idle.remove(session)
+                    break
+                if len(self.idle) > 0:
+                    session = self.idle.pop()
+                    break
+                if len(self.sessions) < self.size:
+                    session = self.connection.start_session(self.datastore)
+                    self.sessions.append(session)
+                    logger.debug(f"started {self.datastore} session {len(self.sessions)} of {self.size}")
+                    break
+
+                self.waits = self.waits + 1
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError(f"no {self.datastore} session available within {timeout}s")
+                self.condition.wait(remaining)
+
+        self.local.held = session
+        self.local.depth = 1
+        self.local.last = session
+        return session
+
+    def checkin(self, session: SysrepoSession) -> None:
+        if getattr(self.local, "held", None) is not session:
+            raise Exception(f"{self.datastore} session is not checked out by this thread")
+
+        self.local.depth = self.local.depth - 1
+        if self.local.depth > 0:
+            return
+        self.local.held = None
+
+        try:
+            session.discard_changes()
+        except sysrepo.SysrepoError as e:
+            logger.warning(f"could not discard changes of {self.datastore} session, replacing it. Error: {e}")
+            with self.condition:
+                self.sessions.remove(session)
+                self.condition.notify()
+            self.local.last = None
+            self.stop_session(session)
+            return
+
+        with self.condition:
+            self.idle.append(session)
+            self.condition.notify()
+
+    @contextmanager
+    def session(self, timeout: float | None = None):
+        session = self.checkout(timeout)
+        try:
+            yield session
+        finally:
+            self.checkin(session)
+
+    @staticmethod
+    def stop_session(session: SysrepoSession) -> None:
+        try:
+            session.stop()
+        except sysrepo.SysrepoError as e:
+            logger.debug(f"could not stop session. Error: {e}")
+
+    def close(self) -> None:
+        with self.condition:
+            idle = list(self.idle)
+            self.idle = []
+            self.sessions = [session for session in self.sessions if session not in idle]
+        for session in idle:
+            self.stop_session(session)
+
+    def get_stats(self) -> dict:
+        with self.condition:
+            return {"sessions": len(self.sessions), "idle": len(self.idle), "size": self.size, "waits": self.waits}
@@ -16,16 +16,72 @@
 # ***************************************************************************/
 
 from util.logging import get_pynts_logger
-import json
+import gzip
+import itertools
+import logging
+import queue
+import socket
 import threading
+import time
+import zlib
+from collections import deque
+from concurrent.futures import Future
+from typing import Callable
 
-from core.config import Config
-from util.docker import get_container_ip, get_hostname, get_container_mac_address
+from core.config import Config, VesRouting
+from util.docker import HostIdentity
 from util.datetime import timestamp_in_microseconds, yang_timestamp_with_miliseconds
+from util.threading import stop_event, sa_sleep
+from util import serializer
+from core.ves_spool import VesSpool, SpoolEviction
+from core.ves_circuit_breaker import VesCircuitBreaker, CircuitState
+from core.ves_rate_limiter import VesRateLimiter, RateLimitPolicy
+from core.metrics import Metrics
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
 
 logger = get_pynts_logger("ves")
-lock = threading.Lock()
+
+# static part of the commonEventHeader, built once per message type and host identity
+common_header_cache: dict[tuple, dict] = {}
+COMMON_HEADER_CACHE_SIZE = 1024
+
+# seconds between spool replay attempts while the collector is unreachable
+SPOOL_BACKOFF_MIN = 1
+SPOOL_BACKOFF_MAX = 60
+
+metrics = Metrics()
+EVENTS_SENT = metrics.counter("pynts_ves_events_sent_total", "VES events accepted by a collector", ("domain",))
+EVENTS_FAILED = metrics.counter("pynts_ves_events_failed_total", "VES events rejected by a collector or not sent because of an error", ("domain",))
+EVENTS_RETRIED = metrics.counter("pynts_ves_events_retried_total", "VES events sent again from the spool", ("domain",))
+EVENTS_DROPPED = metrics.counter("pynts_ves_events_dropped_total", "VES events discarded without being sent", ("domain", "reason"))
+BYTES_SENT = metrics.counter("pynts_ves_bytes_sent_total", "bytes of VES request bodies sent to a collector", ("collector",))
+SERIALIZE_SECONDS = metrics.histogram("pynts_ves_serialize_seconds", "time to serialize a VES event", ("domain",))
+QUEUE_WAIT_SECONDS = metrics.histogram("pynts_ves_queue_wait_seconds", "time a VES event waited in the send queue", ("domain",))
+REQUEST_SECONDS = metrics.histogram("pynts_ves_request_seconds", "HTTP round trip time of VES requests", ("collector",))
+QUEUE_DEPTH = metrics.gauge("pynts_ves_queue_depth", "VES events waiting in the send queue", ("collector",))
+SPOOL_RECORDS = metrics.gauge("pynts_ves_spool_records", "undelivered VES bodies waiting in the spool", ("collector",))
+CIRCUIT_OPEN = metrics.gauge("pynts_ves_circuit_open", "1 while the circuit breaker of the collector is not closed", ("collector",))
+
+VES_HEADERS = {
+    'Content-Type': 'application/json',
+    'Accept': 'application/json',
+    'X-MinorVersion': '1'
+}
+
+def get_domain_key(domain: str, namespace: str|None) -> str:
+    """Domain used for routing, rate limiting and metrics: the stndDefinedNamespace for stndDefined events, else the VES domain."""
+    if domain == "stndDefined" and namespace:
+        return namespace
+    return domain
+
+def get_body_domain_key(body: bytes) -> tuple[str, int]:
+    """Returns the domain key and the number of events of a serialized event or eventList body."""
+    data = serializer.loads(body)
+    events = data["eventList"] if "eventList" in data else [data["event"]]
+    header = events[0]["commonEventHeader"]
+    return get_domain_key(header["domain"], header.get("stndDefinedNamespace")), len(events)
 
 class VesMessage():
     data: dict
@@ -34,6 +90,7 @@ class VesMessage():
     event_type: str
     priority: str
     namespace: str|None
+    sequence: int
 
     timestampMicrosec: int
     timestampISO3milisec: int
@@ -72,40 +129,515 @@ class VesMessage():
         }
 
     def get(self) -> str:
-        return json.dumps(self.data)
+        return serializer.dumps(self.data)
+
+    def get_event(self) -> bytes:
+        """Returns only the serialized event object, to be wrapped in an event or eventList body."""
+        return serializer.dumps_bytes(self.data["event"])
 
     def update(self) -> None:
         ves = Ves()
+        identity = HostIdentity()
 
         self.timestampMicrosec = timestamp_in_microseconds()
         self.timestampISO3milisec = yang_timestamp_with_miliseconds()
-        self.hostname = get_hostname() if self.append_port is False else get_hostname() + "_" + str(self.port)
-        self.mac_address = get_container_mac_address()
-        self.ipv4 = get_container_ip()
+        self.hostname = identity.get_hostname() if self.append_port is False else identity.get_hostname() + "_" + str(self.port)
+        self.mac_address = identity.get_mac_address()
+        self.ipv4 = identity.get_ipv4()
         self.ipv6 = None # checkAL
 
+        header = self.get_static_header(ves.vendor).copy()
+        header["sequence"] = 0  # assigned by set_sequence()
+        header["startEpochMicrosec"] = self.timestampMicrosec
+        header["lastEpochMicrosec"] = self.timestampMicrosec
+        self.data["event"]["commonEventHeader"] = header
+
+    def get_domain_key(self) -> str:
+        return get_domain_key(self.domain, self.namespace)
 
-        self.data["event"]["commonEventHeader"]["domain"] = self.domain
-        self.data["event"]["commonEventHeader"]["eventId"] = "ManagedElement=" + self.hostname + "_" + self.domain
-        self.data["event"]["commonEventHeader"]["eventName"] = self.domain + "_" + self.event_type
-        self.data["event"]["commonEventHeader"]["eventType"] = self.event_type
-        self.data["event"]["commonEventHeader"]["sequence"] = ves.seq_id
-        self.data["event"]["commonEventHeader"]["priority"] = self.priority
-        self.data["event"]["commonEventHeader"]["reportingEntityName"] = "ManagementElement=" + self.hostname
-        self.data["event"]["commonEventHeader"]["sourceId"] = "ManagementElement=" + self.hostname
-        self.data["event"]["commonEventHeader"]["sourceName"] = self.hostname
-        self.data["event"]["commonEventHeader"]["startEpochMicrosec"] = self.timestampMicrosec
-        self.data["event"]["commonEventHeader"]["lastEpochMicrosec"] = self.timestampMicrosec
+    def get_source_name(self) -> str:
+        return self.data["event"]["commonEventHeader"]["sourceName"]
 
-        self.data["event"]["commonEventHeader"]["nfVendorName"] = ves.vendor
+    def set_sequence(self, sequence: int) -> None:
+        """Called after update() with the next sequence number of the sourceName of the message."""
+        self.sequence = sequence
+        self.data["event"]["commonEventHeader"]["sequence"] = sequence
+
+    def get_static_header(self, vendor: str) -> dict:
+        key = (type(self), self.hostname, self.domain, self.event_type, self.priority, self.namespace, vendor)
+        header = common_header_cache.get(key)
+        if header is not None:
+            return header
+
+        header = self.build_static_header(vendor)
+        if len(common_header_cache) >= COMMON_HEADER_CACHE_SIZE:
+            common_header_cache.clear()
+        common_header_cache[key] = header
+        return header
+
+    def build_static_header(self, vendor: str) -> dict:
+        """Builds the part of the commonEventHeader which is the same for every event of this message type and host."""
+        header = dict(self.data["event"]["commonEventHeader"])
+        header["domain"] = self.domain
+        header["eventId"] = "ManagedElement=" + self.hostname + "_" + self.domain
+        header["eventName"] = self.domain + "_" + self.event_type
+        header["eventType"] = self.event_type
+        header["priority"] = self.priority
+        header["reportingEntityName"] = "ManagementElement=" + self.hostname
+        header["sourceId"] = "ManagementElement=" + self.hostname
+        header["sourceName"] = self.hostname
+
+        header["nfVendorName"] = vendor
         if self.namespace:
-            self.data["event"]["commonEventHeader"]["stndDefinedNamespace"] = self.namespace
+            header["stndDefinedNamespace"] = self.namespace
+        return header
+
+"""
+VesSequencer
+----
+Allocates the commonEventHeader sequence numbers, counting separately for each sourceName,
+so that events forwarded on behalf of O-RUs get their own gap-free sequences. Allocation
+takes no lock: next() on an itertools.count is atomic, and so is dict.setdefault().
+"""
+class VesSequencer:
+    counters: dict[str, itertools.count]
+
+    def __init__(self) -> None:
+        self.counters = {}
+
+    def next(self, source: str) -> int:
+        counter = self.counters.get(source)
+        if counter is None:
+            counter = self.counters.setdefault(source, itertools.count())
+        return next(counter)
+
+    def get_stats(self) -> dict:
+        return {"sources": len(self.counters)}
+
+class VesEvent:
+    """A prepared VES event waiting in the send queue of a collector."""
+    event: bytes
+    domain: str
+    namespace: str|None
+    future: Future
+    enqueued: float
+    not_before: float
+
+    def __init__(self, event: bytes, domain: str, namespace: str|None, future: Future, delay: float = 0):
+        self.event = event
+        self.domain = domain
+        self.namespace = namespace
+        self.future = future
+        self.enqueued = time.monotonic()
+        # set by the rate limiter, the event is not sent before (time.monotonic())
+        self.not_before = self.enqueued + delay
+
+    def get_domain_key(self) -> str:
+        return get_domain_key(self.domain, self.namespace)
+
+    def batch_key(self) -> tuple:
+        # a VES eventList may only contain events of the same domain (and stndDefined namespace)
+        return (self.domain, self.namespace)
+
+    @staticmethod
+    def event_body(event: bytes) -> bytes:
+        return b'{"event":' + event + b'}'
+
+    @staticmethod
+    def event_list_body(events: list[bytes]) -> bytes:
+        return b'{"eventList":[' + b','.join(events) + b']}'
+
+class VesCircuitOpenError(requests.RequestException):
+    """Raised instead of sending while the circuit breaker of the VES collector is open."""
+
+class VesHTTPAdapter(HTTPAdapter):
+    """HTTP adapter keeping the connections (and their TLS sessions) to the VES collector open between events."""
+    def __init__(self, keepalive: bool = True, **kwargs):
+        self.keepalive = keepalive
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        if self.keepalive:
+            kwargs["socket_options"] = HTTPConnection.default_socket_options + [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+        super().init_poolmanager(*args, **kwargs)
+
+"""
+VesCollector
+----
+Delivery to one VES collector: its own connection pool, send queue, worker threads,
+circuit breaker and spool of undelivered events. Events delayed by the rate limiter are
+held per domain until they are due and only then queued, so the workers never wait for them.
+"""
+class VesCollector:
+    config: Config
+    index: int
+    url: str
+    session: requests.Session
+
+    queue: queue.Queue
+    held: dict[str, deque[VesEvent]]
+    workers: list[threading.Thread]
+    dropped: int
+    spool: VesSpool|None
+    breaker: VesCircuitBreaker
+
+    def __init__(self, index: int, url: str) -> None:
+        self.config = Config()
+        self.index = index
+        self.url = url
+        self.lock = threading.Lock()
+
+        self.session = self.create_session()
+
+        self.queue = queue.Queue(maxsize=self.config.ves_queue_size)
+        self.held = {}
+        self.held_condition = threading.Condition()
+        self.workers = []
+        self.dropped = 0
+        self.spool = self.create_spool()
+        self.breaker = VesCircuitBreaker(
+            window=self.config.ves_cb_window,
+            failure_rate=self.config.ves_cb_failure_rate,
+            open_seconds=self.config.ves_cb_open_seconds,
+            min_timeout=self.config.ves_timeout_min_ms / 1000,
+            max_timeout=self.config.ves_timeout_max_ms / 1000)
+
+        if self.spool is not None and len(self.spool) > 0:
+            self.start_workers()   # replay what is left from a previous run
+
+    def create_spool(self) -> VesSpool|None:
+        path = self.config.ves_spool_path
+        if self.url == "":
+            # nothing is ever delivered nor spooled without a collector
+            return None
+
+        if path == "":
+            logger.info(f"VES spool disabled, undeliverable events for {self.url} are dropped")
+            return None
+
+        if len(self.config.ves_urls) > 1:
+            path = f"{path}.{self.index}"
+
+        try:
+            return VesSpool(path, self.config.ves_spool_size, SpoolEviction(self.config.ves_spool_eviction))
+        except (OSError, ValueError) as e:
+            logger.error(f"could not open VES spool {path}, undeliverable events for {self.url} are dropped. Error: {e}")
+            return None
+
+    def create_session(self) -> requests.Session:
+        session = requests.Session()
+        adapter = VesHTTPAdapter(keepalive=self.config.ves_keepalive, pool_connections=1, pool_maxsize=self.config.ves_pool_size, pool_block=True)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+
+        session.headers.update(VES_HEADERS)
+        if not self.config.ves_keepalive:
+            session.headers["Connection"] = "close"
+        session.verify = False
+
+        if self.config.ves_username != "" and self.config.ves_password != "":
+            session.auth = (self.config.ves_username, self.config.ves_password)
+
+        logger.info(f"created VES session for {self.url} with pool size {self.config.ves_pool_size} and keepalive {self.config.ves_keepalive}")
+        return session
+
+    def start_workers(self) -> None:
+        with self.lock:
+            if len(self.workers) > 0:
+                return
+
+            logger.info(f"starting {self.config.ves_workers} VES workers for {self.url} with a queue of {self.config.ves_queue_size} messages")
+            for i in range(self.config.ves_workers):
+                thread = threading.Thread(target=self.worker_task, name=f"ves-worker-{self.index}-{i}", daemon=True)
+                thread.start()
+                self.workers.append(thread)
+
+            thread = threading.Thread(target=self.hold_task, name=f"ves-rate-hold-{self.index}", daemon=True)
+            thread.start()
+            self.workers.append(thread)
+
+            if self.spool is not None:
+                thread = threading.Thread(target=self.spool_replay_task, name=f"ves-spool-replay-{self.index}", daemon=True)
+                thread.start()
+                self.workers.append(thread)
+
+    def enqueue(self, event: VesEvent) -> bool:
+        if event.not_before > time.monotonic():
+            return self.hold(event)
+
+        try:
+            self.queue.put_nowait(event)
+            return True
+        except queue.Full:
+            self.dropped = self.dropped + 1
+            EVENTS_DROPPED.inc(event.get_domain_key(), "queue-full")
+            logger.error(f"VES queue for {self.url} is full ({self.queue.maxsize} messages), dropping {event.domain} message")
+            event.future.set_result(False)
+            return False
+
+    def hold(self, event: VesEvent) -> bool:
+        """Holds an event delayed by the rate limiter back until it is due. The rate limiter bounds the held events."""
+        with self.held_condition:
+            self.held.setdefault(event.get_domain_key(), deque()).append(event)
+            self.held_condition.notify()
+        return True
+
+    def hold_task(self) -> None:
+        """Queues held events once they are due. Events of a domain are due in the order they were held."""
+        while not stop_event.is_set():
+            due: list[VesEvent] = []
+            with self.held_condition:
+                now = time.monotonic()
+                timeout = 1.0
+                for key in list(self.held):
+                    events = self.held[key]
+                    while len(events) > 0 and events[0].not_before <= now:
+                        due.append(events.popleft())
+                    if len(events) > 0:
+                        timeout = min(timeout, events[0].not_before - now)
+                    else:
+                        del self.held[key]
+
+                if len(due) == 0:
+                    self.held_condition.wait(timeout)
+                    continue
+
+            for event in due:
+                self.enqueue(event)
+
+        logger.info("thread finished")
+
+    def worker_task(self) -> None:
+        pending: VesEvent|None = None
+        while not stop_event.is_set():
+            if pending is None:
+                try:
+                    pending = self.queue.get(timeout=1)
+                except queue.Empty:
+                    continue
+
+            batch, pending = self.collect_batch(pending)
+            self.deliver(batch)
+
+            for _ in batch:
+                self.queue.task_done()
+
+        logger.info("thread finished")
+
+    def collect_batch(self, first: VesEvent) -> tuple[list[VesEvent], VesEvent|None]:
+        """Collects queued events after first until the batch is full or the linger time expired. Returns the batch and the event which did not fit anymore, if any."""
+        batch = [first]
+        if self.config.ves_batch_size <= 1:
+            return batch, None
+
+        size = len(first.event)
+        deadline = time.monotonic() + self.config.ves_batch_linger_ms / 1000
+        while len(batch) < self.config.ves_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+
+            try:
+                event = self.queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+
+            if size + len(event.event) > self.config.ves_batch_max_bytes:
+                return batch, event
+
+            batch.append(event)
+            size = size + len(event.event)
+
+        return batch, None
+
+    def deliver(self, batch: list[VesEvent]) -> None:
+        groups: dict[tuple, list[VesEvent]] = {}
+        for event in batch:
+            groups.setdefault(event.batch_key(), []).append(event)
+
+        now = time.monotonic()
+        for events in groups.values():
+            events = [event for event in events if event.future.set_running_or_notify_cancel()]
+            if len(events) == 0:
+                continue
+
+            key = events[0].get_domain_key()
+            for event in events:
+                QUEUE_WAIT_SECONDS.observe(key, value=now - event.enqueued)
+
+            if len(events) == 1:
+                body = VesEvent.event_body(events[0].event)
+            else:
+                body = VesEvent.event_list_body([event.event for event in events])
+                logger.debug(f"sending batch of {len(events)} {events[0].domain} events")
+
+            try:
+                response = self.send(body)
+                result = self.is_success(response)
+                (EVENTS_SENT if result else EVENTS_FAILED).inc(key, amount=len(events))
+                if not result and self.is_retryable(response):
+                    # a spooled body is replayed, its events are not to be sent again by their producers
+                    result = self.spool_body(body, key, len(events))
+                for event in events:
+                    event.future.set_result(result)
+            except requests.RequestException as e:
+                if isinstance(e, VesCircuitOpenError):
+                    logger.debug(f"VES collector circuit open, not sending {len(events)} {events[0].domain} events")
+                else:
+                    logger.error(f"could not send VES message. Error: {e}")
+                EVENTS_FAILED.inc(key, amount=len(events))
+                spooled = self.spool_body(body, key, len(events), "circuit-open" if isinstance(e, VesCircuitOpenError) else "undeliverable")
+                for event in events:
+                    if spooled:
+                        event.future.set_result(True)
+                    else:
+                        event.future.set_exception(e)
+            except Exception as e:
+                logger.error(f"could not send VES message. Error: {e}")
+                EVENTS_FAILED.inc(key, amount=len(events))
+                for event in events:
+                    event.future.set_exception(e)
+
+    def spool_body(self, body: bytes, key: str, events: int, reason: str = "undeliverable") -> bool:
+        """
+        Keeps an undelivered body for replay, or drops and counts it with reason when the spool is disabled.
+        Returns whether the body was spooled; the spool then owns its delivery.
+        """
+        if self.spool is None:
+            self.dropped = self.dropped + events
+            EVENTS_DROPPED.inc(key, reason, amount=events)
+            return False
+
+        if not self.spool.append(body):
+            return False
+
+        logger.info(f"spooled undelivered VES message, {len(self.spool)} waiting for replay to {self.url}")
+        # also for messages of execute(), which does not use the workers otherwise
+        self.start_workers()
+        return True
+
+    def spool_replay_task(self) -> None:
+        backoff = SPOOL_BACKOFF_MIN
+        while not stop_event.is_set():
+            record = self.spool.peek()
+            if record is None:
+                sa_sleep(SPOOL_BACKOFF_MIN)
+                continue
+
+            record_id, body = record
+            try:
+                key, events = get_body_domain_key(body)
+            except (ValueError, KeyError, IndexError, TypeError):
+                key, events = "unknown", 1
+
+            try:
+                response = self.send(body)
+                EVENTS_RETRIED.inc(key, amount=events)
+                if self.is_success(response):
+                    EVENTS_SENT.inc(key, amount=events)
+                delivered = self.is_success(response) or not self.is_retryable(response)
+                if not self.is_success(response):
+                    logger.error(f"replay of spooled message failed with status code {response.status_code}")
+            except requests.RequestException as e:
+                if not isinstance(e, VesCircuitOpenError):
+                    EVENTS_RETRIED.inc(key, amount=events)
+                logger.debug(f"replay of spooled message failed. Error: {e}")
+                delivered = False
+
+            if delivered:
+                self.spool.pop(record_id)
+                backoff = SPOOL_BACKOFF_MIN
+            else:
+                logger.debug(f"VES collector {self.url} still unavailable, retrying spooled messages in {backoff}s")
+                sa_sleep(backoff)
+                backoff = min(backoff * 2, SPOOL_BACKOFF_MAX)
+
+        self.spool.flush()
+        logger.info("thread finished")
+
+    def send(self, body: bytes|str) -> requests.Response|None:
+        """Sends an already serialized event or eventList body to the collector. Returns None when no collector is configured."""
+        url = self.url
+        if type(body) is str:
+            body = body.encode("utf-8")
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"POST {url} -> {body.decode('utf-8')}")
+
+        if url == "":
+            return None
+
+        if not self.breaker.allow_request():
+            raise VesCircuitOpenError(f"circuit to VES collector {url} is open")
+
+        try:
+            headers = None
+            if self.config.ves_gzip and len(body) >= self.config.ves_gzip_min_bytes:
+                body = gzip.compress(body, compresslevel=self.config.ves_gzip_level, mtime=0)
+                headers = {"Content-Encoding": "gzip"}
+
+            start = time.monotonic()
+            try:
+                response = self.session.post(url, data=body, headers=headers, timeout=self.breaker.get_timeout())
+            finally:
+                BYTES_SENT.inc(url, amount=len(body))
+        except BaseException:
+            # whatever failed after allow_request(), a half-open breaker must not wait for its probe forever
+            self.breaker.record_failure()
+            raise
+
+        latency = time.monotonic() - start
+        REQUEST_SECONDS.observe(url, value=latency)
+        if response.status_code >= 500:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success(latency)
+
+        if not self.is_success(response):
+            logger.error(f"request to {url} failed with status code {response.status_code} and response {response.text}")
+
+        return response
+
+    @staticmethod
+    def is_success(response: requests.Response|None) -> bool:
+        return response is None or (response.status_code >= 200 and response.status_code < 300)
+
+    @staticmethod
+    def is_retryable(response: requests.Response|None) -> bool:
+        # client errors other than timeouts and throttling will not go away by sending again
+        return response is not None and (response.status_code >= 500 or response.status_code in (408, 429))
+
+    def post(self, message_str: bytes|str) -> bool:
+        return self.is_success(self.send(message_str))
+
+    def collect_metrics(self) -> None:
+        QUEUE_DEPTH.set(self.url, value=self.queue.qsize())
+        SPOOL_RECORDS.set(self.url, value=len(self.spool) if self.spool is not None else 0)
+        CIRCUIT_OPEN.set(self.url, value=0 if self.breaker.state == CircuitState.CLOSED else 1)
+
+    def get_held(self) -> int:
+        with self.held_condition:
+            return sum(len(events) for events in self.held.values())
+
+    def get_stats(self) -> dict:
+        return {
+            "url": self.url,
+            "queue-depth": self.queue.qsize(),
+            "queue-size": self.queue.maxsize,
+            "held": self.get_held(),
+            "dropped": self.dropped,
+            "workers": len(self.workers),
+            "spool": self.spool.get_stats() if self.spool is not None else None,
+            "circuit-breaker": self.breaker.get_stats()
+        }
 
 class Ves:
     _instance = None
     config: Config
+    collectors: list[VesCollector]
+    rate_limiter: VesRateLimiter
 
-    seq_id = 0
+    sequencer: VesSequencer
     vendor = ""
 
     def __new__(cls):
@@ -113,43 +645,209 @@ class Ves:
             cls._instance = super().__new__(cls)
 
             cls._instance.config = Config()
-            cls._instance.seq_id = 0
+            cls._instance.sequencer = VesSequencer()
             cls._instance.vendor = "pynts"
+            cls._instance.rate_limiter = cls._instance.create_rate_limiter()
+            metrics.add_collector(cls._instance.collect_metrics)
+
+            urls = cls._instance.config.ves_urls if len(cls._instance.config.ves_urls) > 0 else [""]
+            cls._instance.collectors = [VesCollector(index, url) for index, url in enumerate(urls)]
+            if len(cls._instance.collectors) > 1:
+                logger.info(f"routing VES events to {len(cls._instance.collectors)} collectors by {cls._instance.config.ves_routing}")
         return cls._instance
 
+    def create_rate_limiter(self) -> VesRateLimiter:
+        try:
+            policy = RateLimitPolicy(self.config.ves_rate_policy)
+        except ValueError:
+            logger.error(f"invalid VES rate limit policy {self.config.ves_rate_policy}, using {RateLimitPolicy.QUEUE}")
+            policy = RateLimitPolicy.QUEUE
 
-    def execute(self, message: VesMessage) -> bool:
-        result = False
-        with lock:
-            url = self.config.ves_url
-
-            headers = {
-                'Content-Type': 'application/json',
-                'Accept': 'application/json',
-                'X-MinorVersion': '1'
-            }
+        return VesRateLimiter(self.config.ves_rate_limit, self.config.ves_rate_burst, policy, self.config.ves_rate_max_delay_ms / 1000)
 
-            auth = None
-            if self.config.ves_username != "" and self.config.ves_password != "":
-                auth = (self.config.ves_username, self.config.ves_password)
+    def route(self, message: VesMessage) -> list[VesCollector]:
+        """Returns the collectors which should receive the (already prepared) message."""
+        if len(self.collectors) == 1:
+            return self.collectors
 
-            message.update()
-            message_str = message.get()
+        routing = self.config.ves_routing
+        if routing == VesRouting.FANOUT:
+            return self.collectors
 
-            logger.debug(f"POST {url} -> {message_str}")
+        if routing == VesRouting.DOMAIN:
+            # stndDefined events are routed by their namespace, so that e.g. faults and fileReady can go to different collectors
+            index = self.config.ves_routes.get(message.get_domain_key(), 0)
+        else:
+            index = zlib.crc32(message.get_source_name().encode("utf-8"))
 
-            if url != "":
-                response = requests.post(url, headers=headers, auth=auth, data=message_str, verify=False, timeout=5.0)
+        return [self.collectors[index % len(self.collectors)]]
 
-                if response.status_code >= 200 and response.status_code < 300:
-                    result = True
-                else:
-                    logger.error(f"request failed with status code {response.status_code} and response {response.text}")
-            else:
-                result = True
+    def prepare(self, message: VesMessage) -> None:
+        """Fills in the message header and assigns the next sequence number of its sourceName."""
+        message.update()
+        message.set_sequence(self.sequencer.next(message.get_source_name()))
+
+    def execute(self, message: VesMessage) -> bool:
+        """
+        Sends the message synchronously. When the rate limiter delays it, it is sent once its token is due.
+        Like queued messages, messages which could not be delivered (see VES_SPOOL_PATH) are spooled.
+        Returns True when every collector accepted the message or it was spooled for replay to that collector,
+        so callers which retry until True do not spool the same message again.
+        """
+        key = message.get_domain_key()
+        delay = self.rate_limiter.acquire(key)
+        if delay is None:
+            logger.debug(f"VES rate limit of {key} reached, dropping message")
+            EVENTS_DROPPED.inc(key, "rate-limit")
+            return False
 
-            if result:
-                self.seq_id = self.seq_id + 1
+        self.prepare(message)
+        start = time.monotonic()
+        message_str = message.get()
+        SERIALIZE_SECONDS.observe(key, value=time.monotonic() - start)
 
+        if delay > 0:
+            stop_event.wait(delay)
+
+        result = True
+        collectors = self.route(message)
+        errors: list[requests.RequestException] = []
+        for collector in collectors:
+            try:
+                response = collector.send(message_str)
+                sent = collector.is_success(response)
+                (EVENTS_SENT if sent else EVENTS_FAILED).inc(key)
+                if not sent and collector.is_retryable(response):
+                    sent = collector.spool_body(message_str.encode("utf-8"), key, 1)
+            except VesCircuitOpenError:
+                # not sent, but kept (or dropped and counted) like a queued event
+                logger.debug(f"VES collector circuit of {collector.url} open, not sending {message.domain} message")
+                EVENTS_FAILED.inc(key)
+                sent = collector.spool_body(message_str.encode("utf-8"), key, 1, "circuit-open")
+            except requests.RequestException as e:
+                # a failing collector must not keep the message from the others
+                logger.error(f"could not send VES message to {collector.url}. Error: {e}")
+                EVENTS_FAILED.inc(key)
+                sent = collector.spool_body(message_str.encode("utf-8"), key, 1)
+                if not sent:
+                    errors.append(e)
+            result = sent and result
+
+        if len(errors) > 0 and len(errors) == len(collectors):
+            raise errors[0]
         return result
 
+    def submit(self, message: VesMessage, callback: Callable[[Future], None] | None = None) -> Future:
+        """
+        Queues the message for sending by the worker pool(s), never blocking the caller. The returned future
+        resolves to the same result as execute(). Events delayed by the rate limiter are held by the collector.
+        """
+        key = message.get_domain_key()
+        delay = self.rate_limiter.acquire(key)
+        if delay is None:
+            logger.debug(f"VES rate limit of {key} reached, dropping message")
+            EVENTS_DROPPED.inc(key, "rate-limit")
+            future = Future()
+            future.set_result(False)
+            if callback is not None:
+                future.add_done_callback(callback)
+            return future
+
+        self.prepare(message)
+        start = time.monotonic()
+        event = message.get_event()
+        SERIALIZE_SECONDS.observe(key, value=time.monotonic() - start)
+
+        futures = []
+        for collector in self.route(message):
+            collector.start_workers()
+            future = Future()
+            collector.enqueue(VesEvent(event, message.domain, message.namespace, future, delay))
+            futures.append(future)
+
+        future = futures[0] if len(futures) == 1 else self.combine(futures)
+        if callback is not None:
+            future.add_done_callback(callback)
+
+        return future
+
+    @staticmethod
+    def combine(futures: list[Future]) -> Future:
+        """Returns a future resolving to True once all futures resolved to True, or to the first exception raised."""
+        combined = Future()
+        remaining = [len(futures)]
+        remaining_lock = threading.Lock()
+
+        def done(_: Future) -> None:
+            with remaining_lock:
+                remaining[0] = remaining[0] - 1
+                if remaining[0] > 0:
+                    return
+
+            for future in futures:
+                if future.exception() is not None:
+                    combined.set_exception(future.exception())
+                    return
+            combined.set_result(all(future.result() for future in futures))
+
+        for future in futures:
+            future.add_done_callback(done)
+
+        return combined
+
+    def collect_metrics(self) -> None:
+        for collector in self.collectors:
+            collector.collect_metrics()
+
+    def get_queue_stats(self) -> dict:
+        return {
+            "routing": str(self.config.ves_routing),
+            "collectors": [collector.get_stats() for collector in self.collectors],
+            "sequencer": self.sequencer.get_stats(),
+            "rate-limit": self.rate_limiter.get_stats()
+        }
+
+class VesRateLimitRest:
+    """GET returns the VES rate limits and counters, POST changes them, DELETE removes the limit of a domain."""
+    ves: Ves
+
+    def __init__(self) -> None:
+        self.ves = Ves()
+
+    def get_state(self) -> dict:
+        return self.ves.rate_limiter.get_config() | {"counters": self.ves.rate_limiter.get_stats()}
+
+    async def on_get(self, req, resp):
+        resp.media = self.get_state()
+        resp.status = 200
+
+    async def on_post(self, req, resp):
+        data = await req.get_media()
+        try:
+            rate = float(data["rate"]) if "rate" in data else None
+            burst = int(data["burst"]) if "burst" in data else None
+            policy = RateLimitPolicy(data["policy"]) if "policy" in data else None
+        except (TypeError, ValueError) as e:
+            resp.media = {"message": f"invalid rate limit: {e}"}
+            resp.status = 400
+            return
+
+        if (rate is not None and rate < 0) or (burst is not None and burst < 1):
+            resp.media = {"message": "rate must be >= 0 (0 is unlimited) and burst must be >= 1"}
+            resp.status = 400
+            return
+
+        self.ves.rate_limiter.configure(rate=rate, burst=burst, policy=policy, domain=data.get("domain"))
+        resp.media = self.get_state()
+        resp.status = 200
+
+    async def on_delete(self, req, resp):
+        domain = req.get_param("domain")
+        if domain is None:
+            resp.media = {"message": "missing domain parameter"}
+            resp.status = 400
+            return
+
+        self.ves.rate_limiter.remove(domain)
+        resp.media = self.get_state()
+        resp.status = 200
@@ -0,0 +1,137 @@
+# /*************************************************************************
+# *
+# * Copyright 2025 highstreet technologies and others
+# *
+# * Licensed under the Apache License, Version 2.0 (the "License");
+# * you may not use this file except in compliance with the License.
+# * You may obtain a copy of the License at
+# *
+# *     http://www.apache.org/licenses/LICENSE-2.0
+# *
+# * Unless required by applicable law or agreed to in writing, software
+# * distributed under the License is distributed on an "AS IS" BASIS,
+# * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# * See the License for the specific language governing permissions and
+# * limitations under the License.
+# ***************************************************************************/
+
+from util.logging import get_pynts_logger
+import threading
+import time
+from collections import deque
+
+from strenum import StrEnum
+
+logger = get_pynts_logger("ves-circuit-breaker")
+
+# minimum number of requests in the window before the failure rate is evaluated
+CB_MIN_REQUESTS = 5
+# number of successful request latencies kept for the adaptive timeout
+LATENCY_SAMPLES = 200
+# the timeout is this many times the observed p99 latency
+TIMEOUT_P99_FACTOR = 3
+
+class CircuitState(StrEnum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+"""
+VesCircuitBreaker
+----
+Tracks the outcome of the last requests to a VES collector.
+- closed: requests are sent; opens when the failure rate over the window reaches the threshold
+- open: requests are rejected without being sent, until the open time expired
+- half-open: a single probe request is sent; success closes the breaker, failure opens it again
+The request timeout adapts to the p99 latency of the successful requests.
+"""
+class VesCircuitBreaker:
+    state: CircuitState
+    rejected: int
+
+    def __init__(self, window: int, failure_rate: int, open_seconds: float, min_timeout: float, max_timeout: float) -> None:
+        self.window = window
+        self.failure_rate = failure_rate
+        self.open_seconds = open_seconds
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+
+        self.lock = threading.Lock()
+        self.state = CircuitState.CLOSED
+        self.outcomes: deque[bool] = deque(maxlen=window)
+        self.latencies: deque[float] = deque(maxlen=LATENCY_SAMPLES)
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+        self.rejected = 0
+
+        self.timeout = max_timeout
+        self.samples_since_timeout = 0
+
+    def allow_request(self) -> bool:
+        with self.lock:
+            if self.state == CircuitState.CLOSED:
+                return True
+
+            if self.state == CircuitState.OPEN and time.monotonic() >= self.opened_at + self.open_seconds:
+                logger.info("VES collector circuit half-open, sending probe request")
+                self.state = CircuitState.HALF_OPEN
+                self.probe_in_flight = False
+
+            if self.state == CircuitState.HALF_OPEN and not self.probe_in_flight:
+                self.probe_in_flight = True
+                return True
+
+            self.rejected = self.rejected + 1
+            return False
+
+    def record_success(self, latency: float) -> None:
+        with self.lock:
+            self.outcomes.append(True)
+            self.latencies.append(latency)
+
+            self.samples_since_timeout = self.samples_since_timeout + 1
+            if self.samples_since_timeout >= CB_MIN_REQUESTS:
+                self.update_timeout()
+
+            if self.state == CircuitState.HALF_OPEN:
+                logger.info("VES collector answered, circuit closed")
+                self.state = CircuitState.CLOSED
+                self.outcomes.clear()
+
+    def record_failure(self) -> None:
+        with self.lock:
+            self.outcomes.append(False)
+
+            if self.state == CircuitState.HALF_OPEN:
+                self.open()
+                return
+
+            if self.state == CircuitState.CLOSED and len(self.outcomes) >= min(CB_MIN_REQUESTS, self.window):
+                failures = self.outcomes.count(False)
+                if failures * 100 >= self.failure_rate * len(self.outcomes):
+                    self.open()
+
+    def open(self) -> None:
+        logger.warning(f"VES collector failing, circuit open for {self.open_seconds}s")
+        self.state = CircuitState.OPEN
+        self.opened_at = time.monotonic()
+        self.probe_in_flight = False
+
+    def update_timeout(self) -> None:
+        latencies = sorted(self.latencies)
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        self.timeout = min(self.max_timeout, max(self.min_timeout, p99 * TIMEOUT_P99_FACTOR))
+        self.samples_since_timeout = 0
+
+    def get_timeout(self) -> float:
+        return self.timeout
+
+    def get_stats(self) -> dict:
+        with self.lock:
+            return {
+                "state": str(self.state),
+                "failures": self.outcomes.count(False),
+                "requests": len(self.outcomes),
+                "rejected": self.rejected,
+                "timeout": self.timeout
+            }
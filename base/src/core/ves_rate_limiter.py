@@ -0,0 +1,204 @@
+# /*************************************************************************
+# *
+# * Copyright 2025 highstreet technologies and others
+# *
+# * Licensed under the Apache License, Version 2.0 (the "License");
+# * you may not use this file except in compliance with the License.
+# * You may obtain a copy of the License at
+# *
+# *     http://www.apache.org/licenses/LICENSE-2.0
+# *
+# * Unless required by applicable law or agreed to in writing, software
+# * distributed under the License is distributed on an "AS IS" BASIS,
+# * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# * See the License for the specific language governing permissions and
+# * limitations under the License.
+# ***************************************************************************/
+
+from util.logging import get_pynts_logger
+import threading
+import time
+
+from strenum import StrEnum
+
+logger = get_pynts_logger("ves-rate-limiter")
+
+class RateLimitPolicy(StrEnum):
+    DROP = "drop"
+    QUEUE = "queue"
+
+class TokenBucket:
+    """Allows rate events per second on average, and bursts of up to burst events."""
+    rate: float
+    burst: int
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self.lock = threading.Lock()
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def take(self) -> float:
+        """Takes a token if one is available. Returns 0 on success, else the seconds until the next token."""
+        with self.lock:
+            now = time.monotonic()
+            self.refill(now)
+            if self.tokens >= 1:
+                self.tokens = self.tokens - 1
+                return 0
+
+            return (1 - self.tokens) / self.rate
+
+    def reserve(self, max_delay: float = 0) -> float|None:
+        """
+        Takes a token, borrowing it from the future when none is available. Returns the seconds until it is due
+        (0: now), or None without taking it when it would be due later than max_delay seconds (0: no bound).
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.refill(now)
+            if max_delay > 0 and (1 - self.tokens) / self.rate > max_delay:
+                return None
+
+            self.tokens = self.tokens - 1
+            if self.tokens >= 0:
+                return 0
+
+            return -self.tokens / self.rate
+
+    def reconfigure(self, rate: float, burst: int) -> None:
+        with self.lock:
+            self.refill(time.monotonic())
+            self.rate = rate
+            self.burst = max(1, burst)
+            self.tokens = min(self.tokens, self.burst)
+
+"""
+VesRateLimiter
+----
+Token-bucket rate limiting of outbound VES events, with one bucket per domain
+(stndDefinedNamespace for stndDefined events). Domains without an explicit limit use
+the default limit; a rate of 0 means unlimited. Events over the limit are either
+dropped, or delayed until their token is due. The limiter never blocks: delayed
+events are held back by whoever sends them, e.g. the VES collectors. An event which
+would be delayed by more than max_delay seconds is dropped, so that the reserved
+tokens, and the events held back, stay bounded.
+"""
+class VesRateLimiter:
+    policy: RateLimitPolicy
+    default_rate: float
+    default_burst: int
+    max_delay: float
+
+    limits: dict[str, tuple[float, int]]
+    buckets: dict[str, TokenBucket]
+    passed: dict[str, int]
+    dropped: dict[str, int]
+    delayed: dict[str, int]
+
+    def __init__(self, rate: float, burst: int, policy: RateLimitPolicy, max_delay: float = 0) -> None:
+        self.lock = threading.Lock()
+        self.policy = policy
+        self.max_delay = max_delay
+        self.default_rate = rate
+        self.default_burst = burst
+
+        self.limits = {}
+        self.buckets = {}
+        self.passed = {}
+        self.dropped = {}
+        self.delayed = {}
+
+    def get_limit(self, key: str) -> tuple[float, int]:
+        return self.limits.get(key, (self.default_rate, self.default_burst))
+
+    def get_bucket(self, key: str) -> TokenBucket|None:
+        rate, burst = self.get_limit(key)
+        if rate <= 0:
+            return None
+
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            with self.lock:
+                bucket = self.buckets.setdefault(key, TokenBucket(rate, burst))
+        return bucket
+
+    def acquire(self, key: str) -> float|None:
+        """
+        Takes a token for an event of the domain key, without blocking. Returns None when the event is to be
+        dropped, else the seconds for which its sending is to be delayed (0: not delayed). With the queue
+        policy, events over the limit reserve the next tokens, so delayed events keep their order, and are
+        dropped when their token is due later than max_delay.
+        """
+        bucket = self.get_bucket(key)
+        if bucket is None:
+            return 0
+
+        if self.policy == RateLimitPolicy.DROP:
+            if bucket.take() > 0:
+                self.count(self.dropped, key)
+                return None
+            delay = 0.0
+        else:
+            delay = bucket.reserve(self.max_delay)
+            if delay is None:
+                self.count(self.dropped, key)
+                return None
+            if delay > 0:
+                self.count(self.delayed, key)
+
+        self.count(self.passed, key)
+        return delay
+
+    def count(self, counters: dict[str, int], key: str) -> None:
+        with self.lock:
+            counters[key] = counters.get(key, 0) + 1
+
+    def configure(self, rate: float|None = None, burst: int|None = None, policy: RateLimitPolicy|None = None, domain: str|None = None) -> None:
+        """Changes the limit of a domain, or the default limit when no domain is given. Unset values are kept."""
+        with self.lock:
+            if policy is not None:
+                self.policy = policy
+
+            if domain is None:
+                self.default_rate = rate if rate is not None else self.default_rate
+                self.default_burst = burst if burst is not None else self.default_burst
+                keys = [key for key in self.buckets if key not in self.limits]
+            else:
+                current_rate, current_burst = self.get_limit(domain)
+                self.limits[domain] = (rate if rate is not None else current_rate, burst if burst is not None else current_burst)
+                keys = [domain]
+
+            for key in keys:
+                rate, burst = self.get_limit(key)
+                if rate <= 0:
+                    self.buckets.pop(key, None)
+                elif key in self.buckets:
+                    self.buckets[key].reconfigure(rate, burst)
+
+        logger.info(f"VES rate limit of {domain if domain is not None else 'all domains'} set to {self.get_limit(domain) if domain is not None else (self.default_rate, self.default_burst)} with policy {self.policy}")
+
+    def remove(self, domain: str) -> None:
+        """Removes the limit of a domain, which then uses the default limit again."""
+        with self.lock:
+            self.limits.pop(domain, None)
+            self.buckets.pop(domain, None)
+
+    def get_config(self) -> dict:
+        with self.lock:
+            return {
+                "policy": str(self.policy),
+                "max-delay": self.max_delay,
+                "default": {"rate": self.default_rate, "burst": self.default_burst},
+                "domains": {key: {"rate": rate, "burst": burst} for key, (rate, burst) in self.limits.items()}
+            }
+
+    def get_stats(self) -> dict:
+        with self.lock:
+            keys = set(self.passed) | set(self.dropped) | set(self.delayed)
+            return {key: {"passed": self.passed.get(key, 0), "dropped": self.dropped.get(key, 0), "delayed": self.delayed.get(key, 0)} for key in sorted(keys)}
@@ -0,0 +1,189 @@
+# /*************************************************************************
+# *
+# * Copyright 2025 highstreet technologies and others
+# *
+# * Licensed under the Apache License, Version 2.0 (the "License");
+# * you may not use this file except in compliance with the License.
+# * You may obtain a copy of the License at
+# *
+# *     http://www.apache.org/licenses/LICENSE-2.0
+# *
+# * Unless required by applicable law or agreed to in writing, software
+# * distributed under the License is distributed on an "AS IS" BASIS,
+# * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# * See the License for the specific language governing permissions and
+# * limitations under the License.
+# ***************************************************************************/
+
+from util.logging import get_pynts_logger
+import mmap
+import os
+import struct
+import threading
+
+from strenum import StrEnum
+
+logger = get_pynts_logger("ves-spool")
+
+SPOOL_MAGIC = b"PYNTSVS1"
+SPOOL_HEADER = struct.Struct("<8sQQQ")  # magic, head offset, tail offset, record count
+SPOOL_RECORD = struct.Struct("<I")      # record length, followed by the record itself
+
+class SpoolEviction(StrEnum):
+    OLDEST = "oldest"
+    NEWEST = "newest"
+
+"""
+VesSpool
+----
+Append-only, memory-mapped spool file holding VES bodies which could not be delivered.
+Records are appended at the tail and consumed in order from the head. When the end of
+the file is reached, the remaining records are moved back to the start of the file.
+When the spool is full, either the oldest records are evicted or the new record is dropped.
+"""
+class VesSpool:
+    path: str
+    capacity: int
+    eviction: SpoolEviction
+
+    head: int
+    tail: int
+    count: int
+    evicted: int
+
+    def __init__(self, path: str, size: int, eviction: SpoolEviction = SpoolEviction.OLDEST) -> None:
+        self.path = path
+        self.capacity = size
+        self.eviction = eviction
+        self.lock = threading.Lock()
+
+        self.evicted = 0
+        self.head_id = 0    # in-memory id of the record at head, to detect evictions between peek() and pop()
+
+        directory = os.path.dirname(path)
+        if directory != "":
+            os.makedirs(directory, exist_ok=True)
+
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            current_size = os.fstat(fd).st_size
+            header = os.pread(fd, SPOOL_HEADER.size, 0)
+
+            valid = False
+            if len(header) == SPOOL_HEADER.size:
+                magic, head, tail, count = SPOOL_HEADER.unpack(header)
+                valid = magic == SPOOL_MAGIC and SPOOL_HEADER.size <= head <= tail <= min(current_size, self.capacity)
+                if not valid and magic == SPOOL_MAGIC:
+                    logger.warning(f"spool {path} does not fit in {self.capacity} bytes, discarding it")
+
+            if current_size != self.capacity:
+                os.ftruncate(fd, self.capacity)
+
+            self.mm = mmap.mmap(fd, self.capacity)
+        finally:
+            os.close(fd)
+
+        if valid:
+            self.head, self.tail, self.count = head, tail, count
+            logger.info(f"opened spool {path} with {self.count} undelivered records")
+        else:
+            self.reset()
+            logger.info(f"created spool {path} of {self.capacity} bytes")
+
+    def reset(self) -> None:
+        self.head = SPOOL_HEADER.size
+        self.tail = SPOOL_HEADER.size
+        self.count = 0
+        self.write_header()
+
+    def write_header(self) -> None:
+        SPOOL_HEADER.pack_into(self.mm, 0, SPOOL_MAGIC, self.head, self.tail, self.count)
+
+    def record_length(self, offset: int) -> int:
+        return SPOOL_RECORD.unpack_from(self.mm, offset)[0]
+
+    def drop_head(self) -> None:
+        self.head = self.head + SPOOL_RECORD.size + self.record_length(self.head)
+        self.count = self.count - 1
+        self.head_id = self.head_id + 1
+
+    def compact(self) -> None:
+        if self.head == SPOOL_HEADER.size:
+            return
+
+        used = self.tail - self.head
+        self.mm.move(SPOOL_HEADER.size, self.head, used)
+        self.head = SPOOL_HEADER.size
+        self.tail = self.head + used
+
+    def append(self, data: bytes) -> bool:
+        record_size = SPOOL_RECORD.size + len(data)
+        if record_size > self.capacity - SPOOL_HEADER.size:
+            logger.error(f"VES body of {len(data)} bytes does not fit in spool {self.path}, dropping it")
+            self.evicted = self.evicted + 1
+            return False
+
+        with self.lock:
+            if self.tail + record_size > self.capacity:
+                if self.eviction == SpoolEviction.OLDEST:
+                    while self.count > 0 and (self.tail - self.head) + record_size > self.capacity - SPOOL_HEADER.size:
+                        self.drop_head()
+                        self.evicted = self.evicted + 1
+                    if self.count == 0:
+                        self.head = self.tail = SPOOL_HEADER.size
+                self.compact()
+
+            if self.tail + record_size > self.capacity:
+                logger.warning(f"spool {self.path} is full, dropping newest record")
+                self.evicted = self.evicted + 1
+                self.write_header()
+                return False
+
+            SPOOL_RECORD.pack_into(self.mm, self.tail, len(data))
+            self.mm[self.tail + SPOOL_RECORD.size:self.tail + record_size] = data
+            self.tail = self.tail + record_size
+            self.count = self.count + 1
+            self.write_header()
+
+        return True
+
+    def peek(self) -> tuple[int, bytes] | None:
+        """Returns the id and the body of the oldest record, without removing it."""
+        with self.lock:
+            if self.count == 0:
+                return None
+
+            length = self.record_length(self.head)
+            start = self.head + SPOOL_RECORD.size
+            return self.head_id, self.mm[start:start + length]
+
+    def pop(self, record_id: int) -> None:
+        """Removes the oldest record, unless it was already evicted since it was returned by peek()."""
+        with self.lock:
+            if self.count == 0 or record_id != self.head_id:
+                return
+
+            self.drop_head()
+            if self.count == 0:
+                self.head = self.tail = SPOOL_HEADER.size
+            self.write_header()
+
+    def flush(self) -> None:
+        with self.lock:
+            self.mm.flush()
+
+    def close(self) -> None:
+        with self.lock:
+            self.mm.flush()
+            self.mm.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def get_stats(self) -> dict:
+        return {
+            "records": self.count,
+            "bytes": self.tail - self.head,
+            "capacity": self.capacity,
+            "evicted": self.evicted
+        }
@@ -23,7 +23,7 @@ from typing import Any, Optional
 from datetime import datetime
 from util.datetime import ensure_aware, yang_datetime_to_datetime, datetime_utcnow
 from util.threading import stop_event, sa_sleep
-from core.netconf import Netconf, Datastore
+from core.netconf import Netconf, Datastore, OperDataProvider
 from core.rest import Rest
 from fault_management.alarm import Alarm
 
@@ -43,6 +43,7 @@ class FaultManagement:
 
     alarms: dict[str, Alarm]
     last_changed: datetime
+    alarm_list_provider: "IetfAlarmListProvider"
 
     alarm_config: dict
     alarm_steps: list
@@ -62,6 +63,7 @@ class FaultManagement:
         self.rest = Rest()
 
         self.alarms = {}
+        self.alarm_list_provider = IetfAlarmListProvider(self)
 
         self.last_changed = datetime_utcnow()
 
@@ -105,6 +107,7 @@ class FaultManagement:
             raise ValueError(f"Alarm with c_id {alarm.c_id} already exists.")
 
         self.alarms[alarm.c_id] = alarm
+        self.alarm_list_provider.invalidate()
 
     def get_alarm(self, c_id) -> Alarm|None:
         return self.alarms.get(c_id, None)
@@ -120,6 +123,7 @@ class FaultManagement:
         self.last_changed = ensure_aware(self.last_changed)
         if alarm.last_changed > self.last_changed:
             self.last_changed = alarm.last_changed
+        self.alarm_list_provider.invalidate()
 
     def load_active_alarms(self) -> None:
         # load current alarms from datastore
@@ -139,7 +143,7 @@ class FaultManagement:
                         logger.info(f"added to alarm list {new_alarm.alarm_text}")
 
             # subscribe to active alarm list
-            self.netconf.operational.subscribe_oper_data_request("ietf-alarms", xpath, self._callback_oper_ietf_alarms_list)
+            self.alarm_list_provider.subscribe()
 
         if self._o_ran_fm:
             xpath = "/o-ran-fm:active-alarm-list"
@@ -209,20 +213,6 @@ class FaultManagement:
             fault_stop_event.set()
             return {"code": 200, "message": "ok"}
 
-    def _callback_oper_ietf_alarms_list(self, xpath: str, private_data: Any) -> Optional[dict]:
-        return {
-            "alarms": {
-                "alarm-list":
-                {
-                    "number-of-alarms": len(self.alarms),
-                    "last-changed": self.last_changed.replace(microsecond=0).isoformat(),
-                    "alarm": [
-                        a.to_ietf_alarm() for a in self.get_alarms()
-                    ]
-                }
-            }
-        }
-
     def _callback_oper_o_ran_fm_list(self, xpath: str, private_data: Any) -> Optional[dict]:
         return {
             "active-alarms": [
@@ -234,12 +224,14 @@ class FaultManagement:
         xpath = ""
         if self._ietf_alarms:
             xpath = "/ietf-alarms:alarm-notification"
-            self.netconf.running.notification_send(xpath, alarm.to_ietf_alarm_notif())
+            with self.netconf.session("running") as sess:
+                sess.notification_send(xpath, alarm.to_ietf_alarm_notif())
             logger.info(f"sending alarm notif {alarm.alarm_text}/cleared:{alarm.is_cleared} to {xpath}")
 
         if self._o_ran_fm:
             xpath = "/o-ran-fm:alarm-notif"
-            self.netconf.running.notification_send(xpath, alarm.to_oran_fm_notif())
+            with self.netconf.session("running") as sess:
+                sess.notification_send(xpath, alarm.to_oran_fm_notif())
             logger.info(f"sending alarm notif {alarm.alarm_text}/cleared:{alarm.is_cleared} to {xpath}")
 
         if xpath == "":
@@ -274,6 +266,31 @@ class FaultManagement:
         self.stopped = True
         logger.info("thread finished")
 
+"""
+IetfAlarmListProvider
+----
+Operational data of the ietf-alarms alarm list, built again only after an alarm changed.
+"""
+class IetfAlarmListProvider(OperDataProvider):
+    def __init__(self, fault_management: FaultManagement) -> None:
+        super().__init__("ietf-alarms", "/ietf-alarms:alarms")
+        self.fault_management = fault_management
+
+    def load(self, xpath: str) -> dict:
+        fm = self.fault_management
+        return {
+            "alarms": {
+                "alarm-list":
+                {
+                    "number-of-alarms": len(fm.alarms),
+                    "last-changed": fm.last_changed.replace(microsecond=0).isoformat(),
+                    "alarm": [
+                        a.to_ietf_alarm() for a in fm.get_alarms()
+                    ]
+                }
+            }
+        }
+
 class FaultManagementRest:
         _instance = None
         fm: FaultManagement
@@ -16,7 +16,7 @@
 # ***************************************************************************/
 
 from core.ves import VesMessage
-from alarm import Alarm
+from fault_management.alarm import Alarm
 
 class VesAlarm(VesMessage):
     def __init__(self, alarm: Alarm):
@@ -64,12 +64,13 @@ class CertificateExpirationNotifierFeature:
         if self.expiration_date < (current_date + timedelta(days=30)):
             logger.debug(f"Certificate expiring in less that 30 days ({self.expiration_date}). Sending certificate-expiration notification..")
 
-            if self.config.tls_callhome_endpoint:
-                d = self.netconf.running.get_item("/ietf-netconf-server:netconf-server/call-home/netconf-client/endpoints/endpoint/tls/tls-server-parameters/server-identity/certificate/inline-definition")
-            elif self.config.tls_listen_endpoint:
-                d = self.netconf.running.get_item("/ietf-netconf-server:netconf-server/listen/endpoints/endpoint/tls/tls-server-parameters/server-identity/certificate/inline-definition")
+            with self.netconf.session("running") as sess:
+                if self.config.tls_callhome_endpoint:
+                    d = sess.get_item("/ietf-netconf-server:netconf-server/call-home/netconf-client/endpoints/endpoint/tls/tls-server-parameters/server-identity/certificate/inline-definition")
+                elif self.config.tls_listen_endpoint:
+                    d = sess.get_item("/ietf-netconf-server:netconf-server/listen/endpoints/endpoint/tls/tls-server-parameters/server-identity/certificate/inline-definition")
 
-            self.netconf.running.notification_send(d.xpath + "/certificate-expiration", {"expiration-date": self.formatted_date})
+                sess.notification_send(d.xpath + "/certificate-expiration", {"expiration-date": self.formatted_date})
 
 
 
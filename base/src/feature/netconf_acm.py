@@ -18,7 +18,7 @@
 from util.logging import get_pynts_logger
 
 from core.dict_factory import DictFactory, BaseTemplate
-from core.netconf import Netconf
+from core.netconf import Netconf, Datastore
 
 logger = get_pynts_logger("ietf-netconf-acm")
 
@@ -31,9 +31,9 @@ class NetconfAcmFeature:
     def configure(self, enabled: bool = False) -> None:
         nacm_template = DictFactory.get_template("netconf-acm-enabled") if enabled else DictFactory.get_template("netconf-acm-disabled")
 
-        with self.netconf.connection.start_session("running") as sess:
+        with self.netconf.session(Datastore.RUNNING) as sess:
             sess.replace_config(nacm_template.data, "ietf-netconf-acm")
-        with self.netconf.connection.start_session("operational") as sess:
+        with self.netconf.edit_session(Datastore.OPERATIONAL) as sess:
             sess.edit_batch(nacm_template.data, "ietf-netconf-acm")
             sess.apply_changes()
         logger.info("succesfully configured")
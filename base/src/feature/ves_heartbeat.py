@@ -54,7 +54,7 @@ class VesHeartbeatFeature:
 
     def heartbeat(self):
         logger.info("heartbeat event")
-        self.ves.execute(self.ves_heartbeat)
+        self.ves.submit(self.ves_heartbeat)
 
 
 class VesHeartbeat(VesMessage):
@@ -19,7 +19,7 @@ import threading
 from util.logging import get_pynts_logger
 
 from core.config import Config
-from core.netconf import Netconf
+from core.netconf import Netconf, Datastore
 from core.ves import Ves, VesMessage
 from util.threading import sa_sleep
 
@@ -75,7 +75,7 @@ class VesPnfRegistrationFeature:
         logger.info(f"VES pnfRegistration finished successfully!")                  
        
     def get_listen_connections(self):
-      data = self.netconf.running.get_data("/ietf-netconf-server:netconf-server/listen/endpoints/endpoint")
+      data = self.netconf.get_data(Datastore.RUNNING, "/ietf-netconf-server:netconf-server/listen/endpoints/endpoint")
       
       endpoints = data
       try:
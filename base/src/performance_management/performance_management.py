@@ -264,7 +264,7 @@ class PerformanceManagement:
 
                 # send VES
                 file_ready = VesFileReady(report['location'], report['size'], report['expiry'])
-                self.ves.execute(file_ready)
+                self.ves.submit(file_ready)
 
                 sa_sleep(1)
 
@@ -20,6 +20,18 @@ import fcntl
 import re
 import socket
 import struct
+import threading
+import time
+
+from util.threading import stop_event
+
+# seconds after which the cached host identity is refreshed, even without a netlink notification
+HOST_IDENTITY_TTL = 300
+
+# netlink multicast groups for link and address changes (linux/rtnetlink.h)
+RTMGRP_LINK = 0x1
+RTMGRP_IPV4_IFADDR = 0x10
+RTMGRP_IPV6_IFADDR = 0x100
 
 def get_network_interface_name() -> str:
     return os.environ.get("NETWORK_INTERFACE", "eth0")
@@ -29,16 +41,99 @@ def get_hostname() -> str:
 
 def get_container_ip() -> str:
     ifname = get_network_interface_name()
-    s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-    info = fcntl.ioctl(s.fileno(), 0x8915, struct.pack('256s', bytes(ifname, 'utf-8')[:15]))
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+        info = fcntl.ioctl(s.fileno(), 0x8915, struct.pack('256s', bytes(ifname, 'utf-8')[:15]))
     return socket.inet_ntoa(info[20:24])
 
 def get_container_mac_address() -> str:
     ifname = get_network_interface_name()
-    s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-    info = fcntl.ioctl(s.fileno(), 0x8927,  struct.pack('256s', bytes(ifname, 'utf-8')[:15]))
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+        info = fcntl.ioctl(s.fileno(), 0x8927,  struct.pack('256s', bytes(ifname, 'utf-8')[:15]))
     return ':'.join('%02x' % b for b in info[18:24])
 
+"""
+HostIdentity
+Singleton
+----
+Cached hostname, IPv4 and MAC address of the container.
+Refreshed when netlink reports a link or address change, or when HOST_IDENTITY_TTL expired.
+"""
+class HostIdentity:
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    hostname: str
+    ipv4: str
+    mac_address: str
+    version: int
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    # published only once complete, so that a failed lookup is retried by the next caller
+                    instance = super().__new__(cls)
+                    instance.lock = threading.Lock()
+                    instance.version = 0
+                    instance.refresh()
+                    instance.watch_netlink()
+                    cls._instance = instance
+
+        return cls._instance
+
+    def refresh(self) -> None:
+        ipv4 = get_container_ip()
+        mac_address = get_container_mac_address()
+        hostname = get_hostname()
+        with self.lock:
+            self.ipv4 = ipv4
+            self.mac_address = mac_address
+            self.hostname = hostname
+            self.expires = time.monotonic() + HOST_IDENTITY_TTL
+            self.version = self.version + 1
+
+    def invalidate(self) -> None:
+        self.expires = 0
+
+    def check(self) -> None:
+        if time.monotonic() >= self.expires:
+            self.refresh()
+
+    def get_hostname(self) -> str:
+        self.check()
+        return self.hostname
+
+    def get_ipv4(self) -> str:
+        self.check()
+        return self.ipv4
+
+    def get_mac_address(self) -> str:
+        self.check()
+        return self.mac_address
+
+    def watch_netlink(self) -> None:
+        try:
+            sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, socket.NETLINK_ROUTE)
+            sock.bind((0, RTMGRP_LINK | RTMGRP_IPV4_IFADDR | RTMGRP_IPV6_IFADDR))
+            sock.settimeout(1)
+        except (AttributeError, OSError):
+            # no netlink available, rely on the TTL only
+            return
+
+        thread = threading.Thread(target=self.netlink_task, args=(sock,), name="host-identity-netlink", daemon=True)
+        thread.start()
+
+    def netlink_task(self, sock: socket.socket) -> None:
+        with sock:
+            while not stop_event.is_set():
+                try:
+                    if sock.recv(65536):
+                        self.invalidate()
+                except socket.timeout:
+                    continue
+                except OSError:
+                    return
+
 
 def is_valid_ip(ip):
     # Regex to check if it's a valid IPv4 address
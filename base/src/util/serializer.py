@@ -0,0 +1,112 @@
+# /*************************************************************************
+# *
+# * Copyright 2025 highstreet technologies and others
+# *
+# * Licensed under the Apache License, Version 2.0 (the "License");
+# * you may not use this file except in compliance with the License.
+# * You may obtain a copy of the License at
+# *
+# *     http://www.apache.org/licenses/LICENSE-2.0
+# *
+# * Unless required by applicable law or agreed to in writing, software
+# * distributed under the License is distributed on an "AS IS" BASIS,
+# * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# * See the License for the specific language governing permissions and
+# * limitations under the License.
+# ***************************************************************************/
+
+import json
+import re
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+BACKEND_ORJSON = "orjson"
+BACKEND_STDLIB = "json"
+
+backend = BACKEND_ORJSON if orjson is not None else BACKEND_STDLIB
+
+# placeholder emitted for a JsonFragment by the stdlib encoder, replaced by the fragment afterwards
+FRAGMENT_PLACEHOLDER = re.compile(r'"\\u0000fragment(\d+)\\u0000"')
+
+class JsonFragment:
+    """Already serialized JSON, spliced as-is into the output of dumps() without being parsed again."""
+    __slots__ = ("json",)
+
+    def __init__(self, json: str | bytes) -> None:
+        self.json = json if type(json) is str else json.decode("utf-8")
+
+    def __str__(self) -> str:
+        return self.json
+
+class FragmentCollector:
+    """Replaces JsonFragment objects by placeholders while encoding, and the placeholders by the fragments afterwards."""
+    def __init__(self) -> None:
+        self.fragments: list[str] = []
+
+    def default(self, obj):
+        if isinstance(obj, JsonFragment):
+            self.fragments.append(obj.json)
+            return f"\x00fragment{len(self.fragments) - 1}\x00"
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+    def splice(self, encoded: str) -> str:
+        if len(self.fragments) == 0:
+            return encoded
+        return FRAGMENT_PLACEHOLDER.sub(lambda m: self.fragments[int(m.group(1))], encoded)
+
+def set_backend(name: str) -> None:
+    global backend
+
+    if name == BACKEND_ORJSON and orjson is None:
+        raise Exception("orjson backend is not installed")
+    if name not in (BACKEND_ORJSON, BACKEND_STDLIB):
+        raise Exception(f"Invalid JSON backend {name}")
+
+    backend = name
+
+def get_backend() -> str:
+    return backend
+
+def dumps_stdlib(obj) -> str:
+    collector = FragmentCollector()
+    return collector.splice(json.dumps(obj, separators=(",", ":"), default=collector.default))
+
+def orjson_default(obj):
+    if isinstance(obj, JsonFragment):
+        return orjson.Fragment(obj.json)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def dumps_orjson(obj) -> bytes:
+    if hasattr(orjson, "Fragment"):
+        return orjson.dumps(obj, default=orjson_default)
+
+    # orjson before 3.9 has no native fragments
+    collector = FragmentCollector()
+    return collector.splice(orjson.dumps(obj, default=collector.default).decode("utf-8")).encode("utf-8")
+
+def dumps_bytes(obj) -> bytes:
+    """Serializes obj to compact UTF-8 JSON."""
+    if backend == BACKEND_ORJSON:
+        try:
+            return dumps_orjson(obj)
+        except TypeError:
+            # e.g. integers over 64 bits, or non-string keys; let the stdlib deal with them
+            pass
+
+    return dumps_stdlib(obj).encode("utf-8")
+
+def dumps(obj) -> str:
+    """Serializes obj to compact JSON."""
+    if backend == BACKEND_ORJSON:
+        return dumps_bytes(obj).decode("utf-8")
+
+    return dumps_stdlib(obj)
+
+def loads(data: str | bytes):
+    if backend == BACKEND_ORJSON:
+        return orjson.loads(data)
+
+    return json.loads(data)
@@ -0,0 +1,64 @@
+# /*************************************************************************
+# *
+# * Copyright 2025 highstreet technologies and others
+# *
+# * Licensed under the Apache License, Version 2.0 (the "License");
+# * you may not use this file except in compliance with the License.
+# * You may obtain a copy of the License at
+# *
+# *     http://www.apache.org/licenses/LICENSE-2.0
+# *
+# * Unless required by applicable law or agreed to in writing, software
+# * distributed under the License is distributed on an "AS IS" BASIS,
+# * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# * See the License for the specific language governing permissions and
+# * limitations under the License.
+# ***************************************************************************/
+
+import json
+
+import pytest
+
+pytest.importorskip("libyang")
+
+from benchmark.datastore_generator import DatastoreGenerator, GeneratorError
+
+TEMPLATE = {"ietf-interfaces:interfaces": {"interface": [
+    {"name": "eth0", "description": "eth0", "o-ran-interfaces:mac-address": "00:11:22:33:44:55",
+     "ietf-ip:ipv4": {"address": [{"ip": "192.168.1.1", "prefix-length": 24}]}}
+]}}
+
+def write_template(path, name: str = "ietf-interfaces-running-template.json") -> None:
+    (path / name).write_text(json.dumps(TEMPLATE))
+
+def generate(templates: str, seed: int = 1) -> dict:
+    return DatastoreGenerator(None, templates, seed).generate({"interfaces": 5, "carriers": 0, "components": 0})
+
+def test_expands_the_template(tmp_path):
+    write_template(tmp_path)
+    entries = generate(str(tmp_path))["ietf-interfaces"]["ietf-interfaces:interfaces"]["interface"]
+    assert [entry["name"] for entry in entries] == ["eth0", "eth0-1", "eth0-2", "eth0-3", "eth0-4"]
+    assert entries[1]["description"] == "eth0-1"
+    addresses = [entry["ietf-ip:ipv4"]["address"][0]["ip"] for entry in entries[1:]]
+    macs = [entry["o-ran-interfaces:mac-address"] for entry in entries[1:]]
+    assert len(set(addresses)) == 4 and all(address.startswith("10.") for address in addresses)
+    assert len(set(macs)) == 4 and all(mac.startswith("02:") for mac in macs)
+
+def test_same_seed_same_data(tmp_path):
+    write_template(tmp_path)
+    assert generate(str(tmp_path), seed=1) == generate(str(tmp_path), seed=1)
+    assert generate(str(tmp_path), seed=1) != generate(str(tmp_path), seed=2)
+
+def test_missing_template(tmp_path):
+    with pytest.raises(GeneratorError):
+        generate(str(tmp_path))
+
+def test_refuses_to_write_next_to_a_seed_file(tmp_path):
+    write_template(tmp_path, "ietf-interfaces-running.json")
+    with pytest.raises(GeneratorError):
+        DatastoreGenerator.check_output(["ietf-interfaces"], str(tmp_path))
+    # a template, or an LYB file of an earlier run, is not loaded together with the new LYB file
+    (tmp_path / "ietf-interfaces-running.json").unlink()
+    write_template(tmp_path)
+    (tmp_path / "ietf-interfaces-running.lyb").write_bytes(b"")
+    DatastoreGenerator.check_output(["ietf-interfaces"], str(tmp_path))
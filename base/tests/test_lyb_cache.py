@@ -0,0 +1,75 @@
+# /*************************************************************************
+# *
+# * Copyright 2025 highstreet technologies and others
+# *
+# * Licensed under the Apache License, Version 2.0 (the "License");
+# * you may not use this file except in compliance with the License.
+# * You may obtain a copy of the License at
+# *
+# *     http://www.apache.org/licenses/LICENSE-2.0
+# *
+# * Unless required by applicable law or agreed to in writing, software
+# * distributed under the License is distributed on an "AS IS" BASIS,
+# * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# * See the License for the specific language governing permissions and
+# * limitations under the License.
+# ***************************************************************************/
+
+import os
+
+import pytest
+
+pytest.importorskip("libyang")
+
+from libyang.util import LibyangError
+
+from core.lyb_cache import LybCache
+
+class FakeData:
+    def __init__(self, content: bytes) -> None:
+        self.content = content
+
+    def print_file(self, file, format: str, with_siblings: bool = False) -> None:
+        file.write(self.content)
+
+class FakeContext:
+    def parse_data_file(self, file, format: str, parse_only: bool = False):
+        content = file.read()
+        if content == b"invalid":
+            raise LibyangError("not LYB data")
+        return FakeData(content)
+
+def test_content_keys():
+    assert LybCache.get_content_key(b"{}", "json") == LybCache.get_content_key(b"{}", "json")
+    assert LybCache.get_content_key(b"{}", "json") != LybCache.get_content_key(b"{}", "xml")
+    assert LybCache.get_content_key(b"{}", "json") != LybCache.get_content_key(b"{ }", "json")
+
+def test_store_and_load(tmp_path):
+    cache = LybCache(str(tmp_path))
+    ctx = FakeContext()
+    assert cache.load(ctx, "context", "content") is None
+    cache.store("context", "content", FakeData(b"lyb"))
+    assert cache.load(ctx, "context", "content").content == b"lyb"
+    # entries of another set of YANG modules are not used
+    assert cache.load(ctx, "other-context", "content") is None
+    assert cache.get_stats() == {"hits": 1, "misses": 2}
+
+def test_unreadable_entry_is_discarded(tmp_path):
+    cache = LybCache(str(tmp_path))
+    entry = cache.get_entry_path("context", "content")
+    with open(entry, 'wb') as file:
+        file.write(b"invalid")
+    assert cache.load(FakeContext(), "context", "content") is None
+    assert not os.path.exists(entry)
+
+def test_prune_keeps_the_used_entries(tmp_path):
+    cache = LybCache(str(tmp_path))
+    for content_key in ["loaded", "kept", "stale"]:
+        cache.store("context", content_key, FakeData(b"lyb"))
+    (tmp_path / "interrupted.tmp").write_bytes(b"")
+
+    cache = LybCache(str(tmp_path))
+    cache.load(FakeContext(), "context", "loaded")
+    cache.keep("context", "kept")
+    cache.prune()
+    assert sorted(os.listdir(tmp_path)) == sorted(os.path.basename(cache.get_entry_path("context", key)) for key in ["loaded", "kept"])
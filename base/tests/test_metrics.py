@@ -0,0 +1,75 @@
+# /*************************************************************************
+# *
+# * Copyright 2025 highstreet technologies and others
+# *
+# * Licensed under the Apache License, Version 2.0 (the "License");
+# * you may not use this file except in compliance with the License.
+# * You may obtain a copy of the License at
+# *
+# *     http://www.apache.org/licenses/LICENSE-2.0
+# *
+# * Unless required by applicable law or agreed to in writing, software
+# * distributed under the License is distributed on an "AS IS" BASIS,
+# * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# * See the License for the specific language governing permissions and
+# * limitations under the License.
+# ***************************************************************************/
+
+from core.metrics import Counter, Gauge, Histogram, Metrics
+
+def test_counter():
+    counter = Counter("pynts_test_events_total", "events", ("domain",))
+    counter.inc("fault")
+    counter.inc("fault", amount=2)
+    counter.inc("heartbeat")
+    assert counter.get("fault") == 3
+    assert counter.get("other") == 0
+    assert counter.render() == [
+        "# HELP pynts_test_events_total events",
+        "# TYPE pynts_test_events_total counter",
+        'pynts_test_events_total{domain="fault"} 3',
+        'pynts_test_events_total{domain="heartbeat"} 1'
+    ]
+
+def test_label_values_are_escaped():
+    counter = Counter("pynts_test_escaped_total", "events", ("domain",))
+    counter.inc('a"b\\c\nd')
+    assert counter.render_samples() == ['pynts_test_escaped_total{domain="a\\"b\\\\c\\nd"} 1']
+
+def test_gauge_is_set():
+    gauge = Gauge("pynts_test_depth", "depth", ("collector",))
+    gauge.set("a", value=5)
+    gauge.set("a", value=2.5)
+    assert gauge.render_samples() == ['pynts_test_depth{collector="a"} 2.5']
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram("pynts_test_seconds", "latency", ("domain",), buckets=(0.1, 1))
+    for value in (0.05, 0.1, 0.5, 2):
+        histogram.observe("fault", value=value)
+    assert histogram.render_samples() == [
+        'pynts_test_seconds_bucket{domain="fault",le="0.1"} 2',
+        'pynts_test_seconds_bucket{domain="fault",le="1"} 3',
+        'pynts_test_seconds_bucket{domain="fault",le="+Inf"} 4',
+        'pynts_test_seconds_sum{domain="fault"} 2.65',
+        'pynts_test_seconds_count{domain="fault"} 4'
+    ]
+
+def test_registry_returns_the_registered_metric():
+    metrics = Metrics()
+    counter = metrics.counter("pynts_test_registered_total", "registered")
+    assert metrics.counter("pynts_test_registered_total", "registered") is counter
+
+def test_collectors_run_before_rendering():
+    metrics = Metrics()
+    gauge = metrics.gauge("pynts_test_collected", "collected")
+    def collect():
+        gauge.set(value=7)
+    def fail():
+        raise ValueError("collector failed")
+    metrics.add_collector(fail)
+    metrics.add_collector(collect)
+    try:
+        assert "pynts_test_collected 7\n" in metrics.render()
+    finally:
+        metrics.collectors.remove(fail)
+        metrics.collectors.remove(collect)
@@ -0,0 +1,104 @@
+# /*************************************************************************
+# *
+# * Copyright 2025 highstreet technologies and others
+# *
+# * Licensed under the Apache License, Version 2.0 (the "License");
+# * you may not use this file except in compliance with the License.
+# * You may obtain a copy of the License at
+# *
+# *     http://www.apache.org/licenses/LICENSE-2.0
+# *
+# * Unless required by applicable law or agreed to in writing, software
+# * distributed under the License is distributed on an "AS IS" BASIS,
+# * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# * See the License for the specific language governing permissions and
+# * limitations under the License.
+# ***************************************************************************/
+
+import pytest
+
+pytest.importorskip("sysrepo")
+
+import sysrepo
+
+from core.netconf_cache import NetconfReadCache
+
+class FakeSession:
+    """Session of the reads, and of the change subscriptions of the cache."""
+    def __init__(self, data: dict) -> None:
+        self.data = data
+        self.reads = []
+        self.subscriptions = {}
+
+    def get_data(self, xpath):
+        self.reads.append(xpath)
+        return {"value": self.data[xpath]}
+
+    def subscribe_module_change_unsafe(self, module, xpath, callback, passive=False, done_only=False, private_data=None):
+        if module == "unsubscribable":
+            raise sysrepo.SysrepoError("no such module")
+        self.subscriptions[module] = (callback, private_data)
+
+    def change(self, module):
+        callback, private_data = self.subscriptions[module]
+        callback(self, "done", 1, private_data)
+
+class FakeConnection:
+    def __init__(self) -> None:
+        self.session = None
+
+    def start_session(self, datastore):
+        self.session = FakeSession({})
+        return self.session
+
+def new_cache(budget: int = 1024) -> tuple[NetconfReadCache, FakeSession]:
+    cache = NetconfReadCache(FakeConnection(), budget)
+    sess = FakeSession({"/ietf-system:system": "pynts", "/ietf-hardware:hardware": "cpu", "/unsubscribable:data": "x"})
+    return cache, sess
+
+def test_repeated_reads_are_cached():
+    cache, sess = new_cache()
+    assert cache.get_data(sess, "/ietf-system:system") == {"value": "pynts"}
+    assert cache.get_data(sess, "/ietf-system:system") == {"value": "pynts"}
+    assert sess.reads == ["/ietf-system:system"]
+    assert cache.get_stats()["hits"] == 1
+
+def test_returns_copies():
+    cache, sess = new_cache()
+    cache.get_data(sess, "/ietf-system:system")["value"] = "changed"
+    assert cache.get_data(sess, "/ietf-system:system") == {"value": "pynts"}
+
+def test_module_change_drops_its_entries():
+    cache, sess = new_cache()
+    cache.get_data(sess, "/ietf-system:system")
+    cache.get_data(sess, "/ietf-hardware:hardware")
+    cache.connection.session.change("ietf-system")
+    sess.data["/ietf-system:system"] = "changed"
+    assert cache.get_data(sess, "/ietf-system:system") == {"value": "changed"}
+    cache.get_data(sess, "/ietf-hardware:hardware")
+    assert sess.reads == ["/ietf-system:system", "/ietf-hardware:hardware", "/ietf-system:system"]
+
+def test_read_during_a_change_is_not_cached():
+    cache, sess = new_cache()
+    cache.get_data(sess, "/ietf-hardware:hardware")
+    cache.invalidate("ietf-hardware")
+    # stored with the generation it was read at, which the change made outdated
+    cache.store("ietf-hardware", 0, "/ietf-hardware:hardware", {"value": "outdated"})
+    assert cache.get_stats()["entries"] == 0
+
+def test_unsubscribable_module_is_not_cached():
+    cache, sess = new_cache()
+    cache.get_data(sess, "/unsubscribable:data")
+    cache.get_data(sess, "/unsubscribable:data")
+    assert sess.reads == ["/unsubscribable:data", "/unsubscribable:data"]
+
+def test_least_recently_used_are_evicted():
+    size = NetconfReadCache.estimate_size({"value": "pynts"})
+    cache, sess = new_cache(budget=2 * size)
+    sess.data["/ietf-system:clock"] = "utc00"
+    cache.get_data(sess, "/ietf-system:system")
+    cache.get_data(sess, "/ietf-hardware:hardware")
+    cache.get_data(sess, "/ietf-system:system")
+    cache.get_data(sess, "/ietf-system:clock")
+    assert list(cache.entries) == ["/ietf-system:system", "/ietf-system:clock"]
+    assert cache.get_stats()["size"] <= 2 * size
@@ -0,0 +1,71 @@
+# /*************************************************************************
+# *
+# * Copyright 2025 highstreet technologies and others
+# *
+# * Licensed under the Apache License, Version 2.0 (the "License");
+# * you may not use this file except in compliance with the License.
+# * You may obtain a copy of the License at
+# *
+# *     http://www.apache.org/licenses/LICENSE-2.0
+# *
+# * Unless required by applicable law or agreed to in writing, software
+# * distributed under the License is distributed on an "AS IS" BASIS,
+# * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# * See the License for the specific language governing permissions and
+# * limitations under the License.
+# ***************************************************************************/
+
+import pytest
+
+pytest.importorskip("sysrepo")
+pytest.importorskip("libyang")
+
+from libyang.keyed_list import KeyedList
+
+from core.netconf import Netconf
+
+def interfaces(*entries) -> KeyedList:
+    return KeyedList(entries, key_name="name")
+
+def test_nothing_to_change():
+    current = {"interfaces": {"interface": interfaces({"name": "eth0", "enabled": True, "mtu": 1500})}}
+    new = {"ietf-interfaces:interfaces": {"interface": [{"name": "eth0", "enabled": True}]}}
+    assert Netconf.diff_data(current, new) is None
+
+def test_changed_leaf_keeps_the_keys():
+    current = {"interfaces": {"interface": interfaces({"name": "eth0", "enabled": True, "mtu": 1500})}}
+    new = {"ietf-interfaces:interfaces": {"interface": [{"name": "eth0", "enabled": False, "mtu": 1500}]}}
+    assert Netconf.diff_data(current, new) == {"ietf-interfaces:interfaces": {"interface": [{"name": "eth0", "enabled": False}]}}
+
+def test_new_list_entry():
+    current = {"interfaces": {"interface": interfaces({"name": "eth0"})}}
+    new = {"ietf-interfaces:interfaces": {"interface": [{"name": "eth0"}, {"name": "eth1", "enabled": True}]}}
+    assert Netconf.diff_data(current, new) == {"ietf-interfaces:interfaces": {"interface": [{"name": "eth1", "enabled": True}]}}
+
+def test_new_container():
+    current = {"interfaces": {}}
+    new = {"ietf-interfaces:interfaces": {}, "ietf-hardware:hardware": {"component": [{"name": "cpu"}]}}
+    assert Netconf.diff_data(current, new) == {"ietf-hardware:hardware": {"component": [{"name": "cpu"}]}}
+
+def test_values_compared_as_yang_values():
+    assert Netconf.diff_data({"mtu": 1500}, {"mtu": "1500"}) is None
+    assert Netconf.diff_data({"enabled": True}, {"enabled": "true"}) is None
+    assert Netconf.diff_data({"mtu": 1500}, {"mtu": 9000}) == {"mtu": 9000}
+
+def test_leaf_list():
+    assert Netconf.diff_data({"dns": ["10.0.0.1"]}, {"dns": ["10.0.0.1", "10.0.0.2"]}) == {"dns": ["10.0.0.2"]}
+    assert Netconf.diff_data({"dns": ["10.0.0.1"]}, {"dns": ["10.0.0.1"]}) is None
+
+def test_keyless_list():
+    current = [{"a": 1, "b": 2}]
+    assert Netconf.diff_list(current, [{"a": 1, "b": 2}]) is None
+    assert Netconf.diff_list(current, [{"a": 1, "b": 3}]) == [{"a": 1, "b": 3}]
+
+def test_composite_keys():
+    current = KeyedList([{"x": "1", "y": "a", "v": 1}], key_name=("x", "y"))
+    assert Netconf.diff_list(current, [{"x": 1, "y": "a", "v": 1}]) is None
+    assert Netconf.diff_list(current, [{"x": 1, "y": "a", "v": 2}, {"x": 1, "y": "b"}]) == [{"x": 1, "y": "a", "v": 2}, {"x": 1, "y": "b"}]
+
+def test_entries_without_their_keys_are_kept_whole():
+    current = interfaces({"name": "eth0", "enabled": True})
+    assert Netconf.diff_list(current, [{"enabled": True}]) == [{"enabled": True}]
@@ -0,0 +1,117 @@
+# /*************************************************************************
+# *
+# * Copyright 2025 highstreet technologies and others
+# *
+# * Licensed under the Apache License, Version 2.0 (the "License");
+# * you may not use this file except in compliance with the License.
+# * You may obtain a copy of the License at
+# *
+# *     http://www.apache.org/licenses/LICENSE-2.0
+# *
+# * Unless required by applicable law or agreed to in writing, software
+# * distributed under the License is distributed on an "AS IS" BASIS,
+# * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# * See the License for the specific language governing permissions and
+# * limitations under the License.
+# ***************************************************************************/
+
+import threading
+
+import pytest
+
+pytest.importorskip("sysrepo")
+pytest.importorskip("libyang")
+
+import sysrepo
+
+from core.netconf import Netconf, Datastore, NetconfTransactionError
+
+class FakeSession:
+    """Records the staged and applied edits; applying an edit of a conflicting xpath fails."""
+    def __init__(self, conflicting: set) -> None:
+        self.conflicting = conflicting
+        self.staged = []
+        self.applied = []
+
+    def edit_batch(self, data, xpath, default_operation="merge"):
+        self.staged.append(xpath)
+
+    def set_item(self, xpath, value):
+        self.staged.append(xpath)
+
+    def apply_changes(self):
+        if any(xpath in self.conflicting for xpath in self.staged):
+            raise sysrepo.SysrepoError("validation failed")
+        self.applied.append(self.staged)
+        self.staged = []
+
+    def discard_changes(self):
+        self.staged = []
+
+class FakeConnection:
+    def __init__(self, conflicting: set) -> None:
+        self.conflicting = conflicting
+        self.sessions = {}
+
+    def start_session(self, datastore):
+        return self.sessions.setdefault(datastore, FakeSession(self.conflicting))
+
+def new_netconf(conflicting: set | None = None) -> Netconf:
+    # a Netconf which is not the singleton, and is not connected to sysrepo
+    netconf = object.__new__(Netconf)
+    netconf.local = threading.local()
+    netconf.connection = FakeConnection(conflicting or set())
+    netconf.operational = FakeSession(conflicting or set())
+    netconf.operational_lock = threading.RLock()
+    netconf.pools = {}
+    netconf.pools_lock = threading.Lock()
+    netconf.read_cache = None
+    return netconf
+
+def running(netconf: Netconf) -> FakeSession:
+    return netconf.connection.sessions["running"]
+
+def test_without_transaction_each_edit_is_applied():
+    netconf = new_netconf()
+    netconf.set_data(Datastore.RUNNING, "ietf-interfaces:interfaces", {"interface": []})
+    netconf.set_data(Datastore.RUNNING, "/ietf-system:system/hostname", "pynts")
+    assert running(netconf).applied == [["ietf-interfaces:interfaces"], ["/ietf-system:system/hostname"]]
+
+def test_one_commit_per_datastore():
+    netconf = new_netconf()
+    with netconf.transaction():
+        netconf.set_data(Datastore.RUNNING, "ietf-interfaces:interfaces", {"interface": []})
+        netconf.set_data(Datastore.OPERATIONAL, "ietf-hardware:hardware", {"component": []})
+        netconf.set_data(Datastore.RUNNING, "/ietf-system:system/hostname", "pynts")
+        assert running(netconf).applied == []
+    assert running(netconf).applied == [["ietf-interfaces:interfaces", "/ietf-system:system/hostname"]]
+    assert netconf.operational.applied == [["ietf-hardware:hardware"]]
+
+def test_nested_transactions_join_the_outer_one():
+    netconf = new_netconf()
+    with netconf.transaction():
+        netconf.set_data(Datastore.RUNNING, "ietf-interfaces:interfaces", {"interface": []})
+        with netconf.transaction():
+            netconf.set_data(Datastore.RUNNING, "ietf-hardware:hardware", {"component": []})
+        assert running(netconf).applied == []
+    assert running(netconf).applied == [["ietf-interfaces:interfaces", "ietf-hardware:hardware"]]
+
+def test_failed_block_drops_the_edits():
+    netconf = new_netconf()
+    with pytest.raises(ValueError):
+        with netconf.transaction():
+            netconf.set_data(Datastore.RUNNING, "ietf-interfaces:interfaces", {"interface": []})
+            raise ValueError("feature failed")
+    assert running(netconf).applied == []
+    netconf.set_data(Datastore.RUNNING, "ietf-hardware:hardware", {"component": []})
+    assert running(netconf).applied == [["ietf-hardware:hardware"]]
+
+def test_failed_commit_applies_the_edits_one_by_one():
+    netconf = new_netconf(conflicting={"ietf-hardware:hardware"})
+    with pytest.raises(NetconfTransactionError) as error:
+        with netconf.transaction():
+            netconf.set_data(Datastore.RUNNING, "ietf-interfaces:interfaces", {"interface": []})
+            netconf.set_data(Datastore.RUNNING, "ietf-hardware:hardware", {"component": []})
+            netconf.set_data(Datastore.RUNNING, "ietf-system:system", {"hostname": "pynts"})
+    assert [edit.xpath for edit, _ in error.value.failed] == ["ietf-hardware:hardware"]
+    assert running(netconf).applied == [["ietf-interfaces:interfaces"], ["ietf-system:system"]]
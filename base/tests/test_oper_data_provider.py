@@ -0,0 +1,102 @@
+# /*************************************************************************
+# *
+# * Copyright 2025 highstreet technologies and others
+# *
+# * Licensed under the Apache License, Version 2.0 (the "License");
+# * you may not use this file except in compliance with the License.
+# * You may obtain a copy of the License at
+# *
+# *     http://www.apache.org/licenses/LICENSE-2.0
+# *
+# * Unless required by applicable law or agreed to in writing, software
+# * distributed under the License is distributed on an "AS IS" BASIS,
+# * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# * See the License for the specific language governing permissions and
+# * limitations under the License.
+# ***************************************************************************/
+
+import time
+
+import pytest
+
+pytest.importorskip("sysrepo")
+pytest.importorskip("libyang")
+
+from core.netconf import OperDataProvider
+
+class CountingProvider(OperDataProvider):
+    def __init__(self, ttl: float | None = None, stale: float = 0) -> None:
+        super().__init__("o-ran-test", "/o-ran-test:state", ttl, stale)
+        self.loads = 0
+        self.fail = False
+
+    def load(self, xpath: str):
+        if self.fail:
+            raise ValueError("network element unreachable")
+        self.loads = self.loads + 1
+        return {"xpath": xpath, "load": self.loads}
+
+def test_cached_until_invalidated():
+    provider = CountingProvider()
+    assert provider.get("/o-ran-test:state") == {"xpath": "/o-ran-test:state", "load": 1}
+    assert provider.get("/o-ran-test:state")["load"] == 1
+    assert provider.get("/o-ran-test:state/other")["load"] == 2
+    provider.invalidate()
+    assert provider.get("/o-ran-test:state")["load"] == 3
+    # invalidate() drops the entries of all xpaths
+    assert provider.get_stats() == {"entries": 1, "hits": 1, "stale_hits": 0, "misses": 3}
+
+def test_expired_entry_is_loaded_again():
+    provider = CountingProvider(ttl=0.05)
+    provider.get("/o-ran-test:state")
+    time.sleep(0.1)
+    assert provider.get("/o-ran-test:state")["load"] == 2
+
+def test_stale_entry_is_served_while_refreshed():
+    provider = CountingProvider(ttl=0.05, stale=10)
+    provider.get("/o-ran-test:state")
+    time.sleep(0.1)
+    assert provider.get("/o-ran-test:state")["load"] == 1
+    assert provider.get_stats()["stale_hits"] == 1
+    deadline = time.monotonic() + 5
+    while provider.entries["/o-ran-test:state"][2]["load"] != 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert provider.get("/o-ran-test:state")["load"] == 2
+    assert provider.loads == 2
+
+def test_failed_refresh_keeps_the_previous_data():
+    provider = CountingProvider(ttl=0.05, stale=10)
+    provider.get("/o-ran-test:state")
+    time.sleep(0.1)
+    provider.fail = True
+    assert provider.get("/o-ran-test:state")["load"] == 1
+    deadline = time.monotonic() + 5
+    while len(provider.refreshing) > 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert provider.get("/o-ran-test:state")["load"] == 1
+
+def test_failed_load_fails_the_request():
+    provider = CountingProvider()
+    provider.fail = True
+    with pytest.raises(ValueError):
+        provider.get("/o-ran-test:state")
+
+def test_load_outdated_by_invalidate_is_not_kept():
+    provider = CountingProvider()
+    provider.store("/o-ran-test:state", provider.version, {"load": 0})
+    version = provider.version
+    provider.invalidate()
+    provider.store("/o-ran-test:state", version, {"load": -1})
+    assert provider.get("/o-ran-test:state")["load"] == 1
+
+def test_least_recently_used_are_evicted(monkeypatch):
+    provider = CountingProvider()
+    monkeypatch.setattr(provider, "max_entries", 2)
+    for xpath in ["/a:a", "/b:b", "/a:a", "/c:c"]:
+        provider.get(xpath)
+    assert list(provider.entries) == ["/a:a", "/c:c"]
+
+def test_provide_renders_the_requested_xpath():
+    provider = CountingProvider()
+    assert provider.provide(None, None) == {"xpath": "/o-ran-test:state", "load": 1}
+    assert provider.provide("/o-ran-test:state/x", None)["xpath"] == "/o-ran-test:state/x"
@@ -0,0 +1,118 @@
+# /*************************************************************************
+# *
+# * Copyright 2025 highstreet technologies and others
+# *
+# * Licensed under the Apache License, Version 2.0 (the "License");
+# * you may not use this file except in compliance with the License.
+# * You may obtain a copy of the License at
+# *
+# *     http://www.apache.org/licenses/LICENSE-2.0
+# *
+# * Unless required by applicable law or agreed to in writing, software
+# * distributed under the License is distributed on an "AS IS" BASIS,
+# * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# * See the License for the specific language governing permissions and
+# * limitations under the License.
+# ***************************************************************************/
+
+import io
+import json
+import xml.etree.ElementTree as ET
+
+import pytest
+
+import core.seed_import
+from core.seed_import import JsonSeedSplitter, SeedSplitError, split_seed_file
+
+SEED = {
+    "ietf-interfaces:interfaces": {
+        "interface": [{"name": f"eth{i}", "description": "a \"quoted\" ]}[{ value", "enabled": True, "mtu": 1500 + i} for i in range(7)],
+        "other": {"a": [1, 2]}
+    },
+    "o-ran-module:value": -1.5e3,
+    "o-ran-module:entries": [{"k": "é€"}, [1, 2], "text", 42, None],
+    "empty-module:container": {},
+    "empty-module:list": []
+}
+
+def merge(batches) -> dict:
+    """Merges the batches back into one document."""
+    merged = {}
+    for document, _, _ in batches:
+        for key, value in json.loads(document).items():
+            if isinstance(value, dict):
+                container = merged.setdefault(key, {})
+                for child_key, child in value.items():
+                    if isinstance(child, list):
+                        container.setdefault(child_key, []).extend(child)
+                    else:
+                        container[child_key] = child
+            elif isinstance(value, list):
+                merged.setdefault(key, []).extend(value)
+            else:
+                merged[key] = value
+    return merged
+
+def split_json(text: bytes, max_entries: int, max_bytes: int = 0) -> list:
+    return list(JsonSeedSplitter(io.BytesIO(text), len(text), max_entries, max_bytes).split())
+
+@pytest.mark.parametrize("indent", [None, 2])
+@pytest.mark.parametrize("max_entries", [1, 3, 1000])
+def test_json_batches_round_trip(indent, max_entries):
+    batches = split_json(json.dumps(SEED, indent=indent, ensure_ascii=False).encode(), max_entries)
+    assert merge(batches) == SEED
+    assert all(entries <= max_entries for _, entries, _ in batches)
+    assert sum(entries for _, entries, _ in batches) == 12
+    assert batches[-1][2] == 1.0
+
+@pytest.mark.parametrize("read_size", [1, 2, 7, 64])
+def test_json_blocks_split_anywhere(monkeypatch, read_size):
+    monkeypatch.setattr(core.seed_import, "JSON_READ_SIZE", read_size)
+    text = b"\xef\xbb\xbf" + json.dumps(SEED, indent=1, ensure_ascii=False).encode()
+    assert merge(split_json(text, 2)) == SEED
+
+def test_json_batches_bounded_by_bytes():
+    seed = {"m:list": [{"name": "x" * 100} for _ in range(10)]}
+    batches = split_json(json.dumps(seed).encode(), 1000, 250)
+    assert [entries for _, entries, _ in batches] == [3, 3, 3, 1]
+    assert merge(batches) == seed
+
+@pytest.mark.parametrize("text", [b'[1]', b'{"a":1', b'{"a" 1}', b'{"a":}', b'{"a":[1,,2]}', b'{"a":[1,]}', b'{"a":"x', b'{"a":1]'])
+def test_json_not_valid(text):
+    with pytest.raises(SeedSplitError):
+        split_json(text, 2)
+
+XML_SEED = b'''<?xml version="1.0" encoding="UTF-8"?>
+<interfaces xmlns="urn:ietf:params:xml:ns:yang:ietf-interfaces" xmlns:ianaift="urn:ietf:params:xml:ns:yang:iana-if-type">
+''' + b"".join(f'  <interface><name>eth{i}</name><type>ianaift:ethernetCsmacd</type><enabled/></interface>\n'.encode() for i in range(5)) + b'''</interfaces>
+<top xmlns="urn:leaf">v</top>
+<c xmlns="urn:c"/>
+<hw xmlns="urn:hw"><component><name>a</name></component></hw>
+'''
+
+def test_xml_batches(tmp_path):
+    path = tmp_path / "ietf-interfaces-running.xml"
+    path.write_bytes(XML_SEED)
+    batches = list(split_seed_file(str(path), "xml", 2, 0))
+    assert [entries for _, entries, _ in batches] == [2, 2, 2]
+
+    names = []
+    for document, _, _ in batches:
+        root = ET.fromstring("<r>" + document + "</r>")
+        for interfaces in root.findall("{urn:ietf:params:xml:ns:yang:ietf-interfaces}interfaces"):
+            # the namespace prefix used in values is kept
+            assert interfaces.find("*/{urn:ietf:params:xml:ns:yang:ietf-interfaces}type").text == "ianaift:ethernetCsmacd"
+            names.extend(name.text for name in interfaces.iter("{urn:ietf:params:xml:ns:yang:ietf-interfaces}name"))
+    assert names == [f"eth{i}" for i in range(5)]
+    assert "<top" in batches[-1][0] and "<c " in batches[-1][0] and "<hw" in batches[-1][0]
+
+def test_xml_not_valid(tmp_path):
+    path = tmp_path / "m-running.xml"
+    path.write_bytes(b"<a><b></a>")
+    with pytest.raises(SeedSplitError):
+        list(split_seed_file(str(path), "xml", 2, 0))
+
+def test_empty_file(tmp_path):
+    path = tmp_path / "m-running.json"
+    path.write_bytes(b"")
+    assert list(split_seed_file(str(path), "json", 2, 0)) == []
@@ -0,0 +1,97 @@
+# /*************************************************************************
+# *
+# * Copyright 2025 highstreet technologies and others
+# *
+# * Licensed under the Apache License, Version 2.0 (the "License");
+# * you may not use this file except in compliance with the License.
+# * You may obtain a copy of the License at
+# *
+# *     http://www.apache.org/licenses/LICENSE-2.0
+# *
+# * Unless required by applicable law or agreed to in writing, software
+# * distributed under the License is distributed on an "AS IS" BASIS,
+# * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# * See the License for the specific language governing permissions and
+# * limitations under the License.
+# ***************************************************************************/
+
+import json
+import os
+
+from core.seed_manifest import SeedManifest, MANIFEST_FILENAME
+
+class Import:
+    def __init__(self, name: str) -> None:
+        self._name = name
+
+    def name(self) -> str:
+        return self._name
+
+class Module:
+    def __init__(self, imports: list[str]) -> None:
+        self._imports = imports
+
+    def imports(self) -> list[Import]:
+        return [Import(name) for name in self._imports]
+
+class Context:
+    """The part of a libyang context the manifest uses: the imports of the modules."""
+    modules = {"a": [], "b": ["a"], "c": ["b", "ietf-inet-types"], "d": [], "ietf-yang-schema-mount": []}
+
+    def get_module(self, name: str) -> Module:
+        return Module(self.modules[name])
+
+def seed_files(directory) -> list[dict]:
+    ds_files = []
+    for module in ["c", "b", "a", "d", "ietf-yang-schema-mount"]:
+        path = directory / f"{module}-running.json"
+        path.write_text("{}")
+        ds_files.append({"filename": str(path), "module_name": module, "datastore": "running", "extension": "json"})
+    return ds_files
+
+def index(directory, ds_files: list[dict]) -> list[dict]:
+    return SeedManifest(str(directory)).index(ds_files, Context(), first=("ietf-yang-schema-mount",))
+
+def test_order_follows_the_imports(tmp_path):
+    indexed = index(tmp_path, seed_files(tmp_path))
+    assert [(ds_file["module_name"], ds_file["order"]) for ds_file in indexed] == [("ietf-yang-schema-mount", 0), ("a", 1), ("d", 1), ("b", 2), ("c", 3)]
+
+    manifest = json.loads((tmp_path / MANIFEST_FILENAME).read_text())
+    assert [(entry["module"], entry["order"]) for entry in manifest["files"]] == [("ietf-yang-schema-mount", 0), ("a", 1), ("d", 1), ("b", 2), ("c", 3)]
+    assert all(len(entry["sha256"]) == 64 for entry in manifest["files"])
+
+def test_edited_order_is_kept_while_the_file_is_unchanged(tmp_path):
+    ds_files = seed_files(tmp_path)
+    index(tmp_path, ds_files)
+
+    path = tmp_path / MANIFEST_FILENAME
+    manifest = json.loads(path.read_text())
+    for entry in manifest["files"]:
+        if entry["module"] in ("c", "d"):
+            entry["order"] = 9
+    path.write_text(json.dumps(manifest))
+    (tmp_path / "c-running.json").write_text('{ }')
+
+    indexed = index(tmp_path, ds_files)
+    # c changed, its order is computed again
+    assert [(ds_file["module_name"], ds_file["order"]) for ds_file in indexed] == [("ietf-yang-schema-mount", 0), ("a", 1), ("b", 2), ("c", 3), ("d", 9)]
+
+def test_unchanged_files_are_not_hashed_again(tmp_path, monkeypatch):
+    ds_files = seed_files(tmp_path)
+    index(tmp_path, ds_files)
+
+    hashed = []
+    monkeypatch.setattr(SeedManifest, "hash_file", staticmethod(lambda path: hashed.append(path) or "0" * 64))
+    (tmp_path / "a-running.json").write_text('{"a": 1}')
+    index(tmp_path, ds_files)
+    assert hashed == [str(tmp_path / "a-running.json")]
+
+def test_removed_files_leave_the_manifest(tmp_path):
+    ds_files = seed_files(tmp_path)
+    index(tmp_path, ds_files)
+    os.remove(ds_files[0]["filename"])
+
+    indexed = index(tmp_path, ds_files)
+    manifest = json.loads((tmp_path / MANIFEST_FILENAME).read_text())
+    assert "c" not in [ds_file["module_name"] for ds_file in indexed]
+    assert "c" not in [entry["module"] for entry in manifest["files"]]
@@ -0,0 +1,54 @@
+# /*************************************************************************
+# *
+# * Copyright 2025 highstreet technologies and others
+# *
+# * Licensed under the Apache License, Version 2.0 (the "License");
+# * you may not use this file except in compliance with the License.
+# * You may obtain a copy of the License at
+# *
+# *     http://www.apache.org/licenses/LICENSE-2.0
+# *
+# * Unless required by applicable law or agreed to in writing, software
+# * distributed under the License is distributed on an "AS IS" BASIS,
+# * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# * See the License for the specific language governing permissions and
+# * limitations under the License.
+# ***************************************************************************/
+
+import json
+
+import pytest
+
+from util import serializer
+from util.serializer import JsonFragment
+
+BACKENDS = [serializer.BACKEND_STDLIB] + ([serializer.BACKEND_ORJSON] if serializer.orjson is not None else [])
+
+@pytest.fixture(params=BACKENDS)
+def backend(request):
+    previous = serializer.get_backend()
+    serializer.set_backend(request.param)
+    yield request.param
+    serializer.set_backend(previous)
+
+def test_compact(backend):
+    assert serializer.dumps({"a": [1, None], "b": {}}) == '{"a":[1,null],"b":{}}'
+    assert serializer.dumps_bytes({"a": True}) == b'{"a":true}'
+    assert json.loads(serializer.dumps_bytes({"a": "é€"})) == {"a": "é€"}
+
+def test_fragments_are_spliced(backend):
+    event = {"event": {"stndDefinedFields": {"data": JsonFragment('{"x":[1,2]}')}}, "list": [JsonFragment(b'"y"')]}
+    assert json.loads(serializer.dumps(event)) == {"event": {"stndDefinedFields": {"data": {"x": [1, 2]}}}, "list": ["y"]}
+
+def test_falls_back_to_the_stdlib(backend):
+    # orjson does not serialize integers over 64 bits, nor integer keys
+    value = {"big": 2 ** 70, 1: JsonFragment("[]")}
+    assert json.loads(serializer.dumps(value)) == {"big": 2 ** 70, "1": []}
+
+def test_unknown_objects_are_rejected(backend):
+    with pytest.raises(TypeError):
+        serializer.dumps({"a": object()})
+
+def test_unknown_backend():
+    with pytest.raises(Exception):
+        serializer.set_backend("yaml")
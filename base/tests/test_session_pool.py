@@ -0,0 +1,164 @@
+# /*************************************************************************
+# *
+# * Copyright 2025 highstreet technologies and others
+# *
+# * Licensed under the Apache License, Version 2.0 (the "License");
+# * you may not use this file except in compliance with the License.
+# * You may obtain a copy of the License at
+# *
+# *     http://www.apache.org/licenses/LICENSE-2.0
+# *
+# * Unless required by applicable law or agreed to in writing, software
+# * distributed under the License is distributed on an "AS IS" BASIS,
+# * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# * See the License for the specific language governing permissions and
+# * limitations under the License.
+# ***************************************************************************/
+
+import threading
+
+import pytest
+
+pytest.importorskip("sysrepo")
+
+import sysrepo
+
+from core.session_pool import SessionPool
+
+class FakeSession:
+    def __init__(self, number: int) -> None:
+        self.number = number
+        self.discards = 0
+        self.broken = False
+        self.stopped = False
+
+    def discard_changes(self):
+        if self.broken:
+            raise sysrepo.SysrepoError("session broken")
+        self.discards = self.discards + 1
+
+    def stop(self):
+        self.stopped = True
+
+class FakeConnection:
+    def __init__(self) -> None:
+        self.started = []
+
+    def start_session(self, datastore):
+        session = FakeSession(len(self.started))
+        self.started.append(session)
+        return session
+
+def new_pool(size: int = 2) -> SessionPool:
+    return SessionPool(FakeConnection(), "running", size)
+
+def in_thread(target):
+    """Runs target in a new thread, returns its result or raises its exception."""
+    result = []
+    def run():
+        try:
+            result.append((target(), None))
+        except Exception as e:
+            result.append((None, e))
+    thread = threading.Thread(target=run)
+    thread.start()
+    thread.join(timeout=5)
+    value, error = result[0]
+    if error is not None:
+        raise error
+    return value
+
+def use_session(pool: SessionPool):
+    with pool.session() as session:
+        return session
+
+def test_checkin_discards_and_reuses_the_session():
+    pool = new_pool()
+    with pool.session() as first:
+        pass
+    assert first.discards == 1
+    with pool.session() as second:
+        assert second is first
+    assert pool.get_stats() == {"sessions": 1, "idle": 1, "size": 2, "waits": 0}
+
+def test_nested_checkout_gets_the_held_session():
+    pool = new_pool()
+    with pool.session() as outer:
+        with pool.session() as inner:
+            assert inner is outer
+        # still held by the outer block, its changes are kept
+        assert outer.discards == 0
+        assert pool.get_stats()["idle"] == 0
+    assert outer.discards == 1
+
+def test_threads_get_their_own_sessions():
+    pool = new_pool()
+    with pool.session() as held:
+        other = in_thread(lambda: pool.checkout())
+        assert other is not held
+    assert pool.get_stats()["sessions"] == 2
+
+def test_thread_gets_back_the_session_it_used_last():
+    pool = new_pool()
+    last = use_session(pool)
+
+    # two other threads hold both sessions, and check them in in the order which puts the other one last
+    def hold(held: threading.Event, release: threading.Event):
+        with pool.session():
+            held.set()
+            release.wait(5)
+    threads = []
+    for _ in range(2):
+        held, release = threading.Event(), threading.Event()
+        thread = threading.Thread(target=hold, args=(held, release))
+        thread.start()
+        assert held.wait(5)
+        threads.append((thread, release))
+    for thread, release in threads:
+        release.set()
+        thread.join(timeout=5)
+
+    assert pool.idle[-1] is not last
+    assert pool.checkout() is last
+
+def test_checkin_by_another_thread_fails():
+    pool = new_pool()
+    session = pool.checkout()
+    with pytest.raises(Exception, match="not checked out by this thread"):
+        in_thread(lambda: pool.checkin(session))
+    pool.checkin(session)
+
+def test_checkout_waits_for_a_session():
+    pool = new_pool(size=1)
+    session = pool.checkout()
+    with pytest.raises(TimeoutError):
+        in_thread(lambda: pool.checkout(timeout=0.05))
+
+    checked_out = threading.Event()
+    def wait():
+        with pool.session(timeout=5):
+            checked_out.set()
+    thread = threading.Thread(target=wait)
+    thread.start()
+    assert not checked_out.wait(0.1)
+    pool.checkin(session)
+    thread.join(timeout=5)
+    assert checked_out.is_set()
+    assert pool.get_stats()["waits"] >= 2
+
+def test_broken_session_is_replaced():
+    pool = new_pool()
+    with pool.session() as session:
+        session.broken = True
+    assert session.stopped
+    assert pool.get_stats()["sessions"] == 0
+    with pool.session() as replacement:
+        assert replacement is not session
+
+def test_close_stops_the_idle_sessions():
+    pool = new_pool()
+    held = pool.checkout()
+    idle = in_thread(lambda: use_session(pool))
+    pool.close()
+    assert idle.stopped
+    assert not held.stopped
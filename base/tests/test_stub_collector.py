@@ -0,0 +1,64 @@
+# /*************************************************************************
+# *
+# * Copyright 2025 highstreet technologies and others
+# *
+# * Licensed under the Apache License, Version 2.0 (the "License");
+# * you may not use this file except in compliance with the License.
+# * You may obtain a copy of the License at
+# *
+# *     http://www.apache.org/licenses/LICENSE-2.0
+# *
+# * Unless required by applicable law or agreed to in writing, software
+# * distributed under the License is distributed on an "AS IS" BASIS,
+# * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# * See the License for the specific language governing permissions and
+# * limitations under the License.
+# ***************************************************************************/
+
+import pytest
+
+pytest.importorskip("falcon")
+pytest.importorskip("uvicorn")
+
+from core.config import Config
+from core.ves import VesCollector
+from benchmark.stub_collector import StubCollector
+
+@pytest.fixture(scope="module")
+def stub():
+    stub = StubCollector()
+    stub.start()
+    yield stub
+    stub.stop()
+
+@pytest.fixture
+def collector(stub, monkeypatch):
+    stub.reset()
+    stub.status = 202
+    config = Config()
+    monkeypatch.setattr(config, "ves_spool_path", "")
+    monkeypatch.setattr(config, "ves_gzip", False)
+    return VesCollector(0, stub.url)
+
+def test_counts_the_events_per_domain(stub, collector):
+    assert collector.post(b'{"event":{"commonEventHeader":{"domain":"fault"}}}')
+    assert collector.post(b'{"eventList":[{"commonEventHeader":{"domain":"heartbeat"}},{"commonEventHeader":{"domain":"heartbeat"}}]}')
+    stats = stub.get_stats()
+    assert stats["requests"] == 2
+    assert stats["events"] == {"fault": 1, "heartbeat": 2}
+    assert stats["invalid"] == 0
+
+def test_accepts_gzip_bodies(stub, collector, monkeypatch):
+    monkeypatch.setattr(collector.config, "ves_gzip", True)
+    monkeypatch.setattr(collector.config, "ves_gzip_min_bytes", 0)
+    assert collector.post(b'{"event":{"commonEventHeader":{"domain":"fault"}}}')
+    assert stub.get_stats()["events"] == {"fault": 1}
+
+def test_rejects_invalid_bodies(stub, collector):
+    assert not collector.post(b'{"event":{}}')
+    assert stub.get_stats()["invalid"] == 1
+
+def test_answers_with_the_configured_status(stub, collector):
+    stub.status = 503
+    response = collector.send(b'{"event":{"commonEventHeader":{"domain":"fault"}}}')
+    assert response.status_code == 503
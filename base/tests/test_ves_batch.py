@@ -0,0 +1,85 @@
+# /*************************************************************************
+# *
+# * Copyright 2025 highstreet technologies and others
+# *
+# * Licensed under the Apache License, Version 2.0 (the "License");
+# * you may not use this file except in compliance with the License.
+# * You may obtain a copy of the License at
+# *
+# *     http://www.apache.org/licenses/LICENSE-2.0
+# *
+# * Unless required by applicable law or agreed to in writing, software
+# * distributed under the License is distributed on an "AS IS" BASIS,
+# * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# * See the License for the specific language governing permissions and
+# * limitations under the License.
+# ***************************************************************************/
+
+import json
+from concurrent.futures import Future
+
+import pytest
+
+from core.config import Config
+from core.ves import VesCollector, VesEvent
+
+URL = "http://127.0.0.1:8443/eventListener/v7"
+
+class FakeResponse:
+    def __init__(self, status_code: int) -> None:
+        self.status_code = status_code
+        self.text = ""
+
+@pytest.fixture
+def collector(monkeypatch):
+    config = Config()
+    monkeypatch.setattr(config, "ves_spool_path", "")
+    monkeypatch.setattr(config, "ves_batch_size", 3)
+    monkeypatch.setattr(config, "ves_batch_linger_ms", 10)
+    monkeypatch.setattr(config, "ves_batch_max_bytes", 1048576)
+    collector = VesCollector(0, URL)
+    collector.posts = []
+    def post(url, data=None, headers=None, timeout=None):
+        collector.posts.append(json.loads(data))
+        return FakeResponse(202)
+    monkeypatch.setattr(collector.session, "post", post)
+    return collector
+
+def new_event(domain: str, namespace: str | None = None) -> VesEvent:
+    return VesEvent(json.dumps({"commonEventHeader": {"domain": domain}}).encode(), domain, namespace, Future())
+
+def test_collects_up_to_the_batch_size(collector):
+    events = [new_event("heartbeat") for _ in range(5)]
+    for event in events[1:]:
+        collector.queue.put(event)
+    batch, pending = collector.collect_batch(events[0])
+    assert batch == events[:3]
+    assert pending is None
+    assert collector.queue.qsize() == 2
+
+def test_linger_expires(collector):
+    first = new_event("heartbeat")
+    batch, pending = collector.collect_batch(first)
+    assert batch == [first]
+    assert pending is None
+
+def test_event_over_the_byte_limit_is_kept_for_the_next_batch(collector, monkeypatch):
+    monkeypatch.setattr(collector.config, "ves_batch_max_bytes", 100)
+    events = [new_event("heartbeat") for _ in range(3)]
+    for event in events[1:]:
+        collector.queue.put(event)
+    batch, pending = collector.collect_batch(events[0])
+    assert batch == events[:2]
+    assert pending is events[2]
+
+def test_batch_is_split_by_domain(collector):
+    events = [new_event("heartbeat"), new_event("fault"), new_event("heartbeat"),
+              new_event("stndDefined", "3GPP-FaultSupervision"), new_event("stndDefined", "3GPP-Provisioning")]
+    collector.deliver(events)
+    assert all(event.future.result() for event in events)
+    assert collector.posts == [
+        {"eventList": [{"commonEventHeader": {"domain": "heartbeat"}}, {"commonEventHeader": {"domain": "heartbeat"}}]},
+        {"event": {"commonEventHeader": {"domain": "fault"}}},
+        {"event": {"commonEventHeader": {"domain": "stndDefined"}}},
+        {"event": {"commonEventHeader": {"domain": "stndDefined"}}}
+    ]
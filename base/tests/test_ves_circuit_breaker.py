@@ -0,0 +1,98 @@
+# /*************************************************************************
+# *
+# * Copyright 2025 highstreet technologies and others
+# *
+# * Licensed under the Apache License, Version 2.0 (the "License");
+# * you may not use this file except in compliance with the License.
+# * You may obtain a copy of the License at
+# *
+# *     http://www.apache.org/licenses/LICENSE-2.0
+# *
+# * Unless required by applicable law or agreed to in writing, software
+# * distributed under the License is distributed on an "AS IS" BASIS,
+# * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# * See the License for the specific language governing permissions and
+# * limitations under the License.
+# ***************************************************************************/
+
+from core.ves_circuit_breaker import VesCircuitBreaker, CircuitState, CB_MIN_REQUESTS
+
+def new_breaker(window: int = 10, failure_rate: int = 50, open_seconds: float = 60) -> VesCircuitBreaker:
+    return VesCircuitBreaker(window, failure_rate, open_seconds, 0.5, 5)
+
+def test_stays_closed_below_the_failure_rate():
+    breaker = new_breaker()
+    for _ in range(6):
+        breaker.record_success(0.01)
+    for _ in range(4):
+        breaker.record_failure()
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.allow_request()
+
+def test_waits_for_the_minimum_number_of_requests():
+    breaker = new_breaker()
+    for _ in range(CB_MIN_REQUESTS - 1):
+        breaker.record_failure()
+    assert breaker.state == CircuitState.CLOSED
+
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+
+def test_open_rejects_requests():
+    breaker = new_breaker()
+    for _ in range(CB_MIN_REQUESTS):
+        breaker.record_failure()
+    assert not breaker.allow_request()
+    assert not breaker.allow_request()
+    assert breaker.get_stats()["rejected"] == 2
+
+def test_half_open_allows_a_single_probe():
+    breaker = new_breaker()
+    for _ in range(CB_MIN_REQUESTS):
+        breaker.record_failure()
+    breaker.opened_at = breaker.opened_at - 60
+
+    assert breaker.allow_request()
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert not breaker.allow_request()
+
+def test_probe_success_closes():
+    breaker = new_breaker()
+    for _ in range(CB_MIN_REQUESTS):
+        breaker.record_failure()
+    breaker.opened_at = breaker.opened_at - 60
+    assert breaker.allow_request()
+
+    breaker.record_success(0.01)
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.get_stats()["requests"] == 0
+    assert breaker.allow_request()
+
+def test_probe_failure_opens_again():
+    breaker = new_breaker()
+    for _ in range(CB_MIN_REQUESTS):
+        breaker.record_failure()
+    breaker.opened_at = breaker.opened_at - 60
+    assert breaker.allow_request()
+
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+    assert not breaker.probe_in_flight
+    assert not breaker.allow_request()
+
+def test_timeout_follows_the_latency():
+    breaker = new_breaker()
+    assert breaker.get_timeout() == 5
+    for _ in range(CB_MIN_REQUESTS):
+        breaker.record_success(0.4)
+    assert breaker.get_timeout() == 0.4 * 3
+
+    for _ in range(CB_MIN_REQUESTS):
+        breaker.record_success(0.01)
+    # the p99 of all samples is still 0.4
+    assert breaker.get_timeout() == 0.4 * 3
+
+    fast = new_breaker()
+    for _ in range(CB_MIN_REQUESTS):
+        fast.record_success(0.01)
+    assert fast.get_timeout() == 0.5
@@ -0,0 +1,72 @@
+# /*************************************************************************
+# *
+# * Copyright 2025 highstreet technologies and others
+# *
+# * Licensed under the Apache License, Version 2.0 (the "License");
+# * you may not use this file except in compliance with the License.
+# * You may obtain a copy of the License at
+# *
+# *     http://www.apache.org/licenses/LICENSE-2.0
+# *
+# * Unless required by applicable law or agreed to in writing, software
+# * distributed under the License is distributed on an "AS IS" BASIS,
+# * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# * See the License for the specific language governing permissions and
+# * limitations under the License.
+# ***************************************************************************/
+
+import gzip
+
+import pytest
+
+from core.config import Config
+from core.ves import VesCollector, BYTES_SENT
+
+URL = "http://127.0.0.1:8443/eventListener/v7"
+
+class FakeResponse:
+    def __init__(self, status_code: int) -> None:
+        self.status_code = status_code
+        self.text = ""
+
+@pytest.fixture
+def collector(monkeypatch):
+    config = Config()
+    monkeypatch.setattr(config, "ves_spool_path", "")
+    monkeypatch.setattr(config, "ves_gzip", True)
+    monkeypatch.setattr(config, "ves_gzip_min_bytes", 100)
+    collector = VesCollector(0, URL)
+    collector.posts = []
+    def post(url, data=None, headers=None, timeout=None):
+        collector.posts.append((data, headers))
+        return FakeResponse(202)
+    monkeypatch.setattr(collector.session, "post", post)
+    return collector
+
+def test_large_bodies_are_compressed(collector):
+    body = b'{"event":{"commonEventHeader":{"domain":"heartbeat"},"padding":"' + b"x" * 1000 + b'"}}'
+    sent = BYTES_SENT.get(URL)
+    assert collector.post(body)
+    data, headers = collector.posts[0]
+    assert headers == {"Content-Encoding": "gzip"}
+    assert gzip.decompress(data) == body
+    # the compressed size is what goes over the wire
+    assert BYTES_SENT.get(URL) == sent + len(data)
+    assert len(data) < len(body)
+
+def test_small_bodies_are_sent_plain(collector):
+    body = b'{"event":{}}'
+    assert collector.post(body)
+    assert collector.posts == [(body, None)]
+
+def test_compression_is_deterministic(collector):
+    body = b"y" * 500
+    collector.post(body)
+    collector.post(body)
+    assert collector.posts[0][0] == collector.posts[1][0]
+
+def test_disabled(collector, monkeypatch):
+    monkeypatch.setattr(collector.config, "ves_gzip", False)
+    body = b"z" * 500
+    collector.post(body)
+    assert collector.posts == [(body, None)]
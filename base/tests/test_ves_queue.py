@@ -0,0 +1,93 @@
+# /*************************************************************************
+# *
+# * Copyright 2025 highstreet technologies and others
+# *
+# * Licensed under the Apache License, Version 2.0 (the "License");
+# * you may not use this file except in compliance with the License.
+# * You may obtain a copy of the License at
+# *
+# *     http://www.apache.org/licenses/LICENSE-2.0
+# *
+# * Unless required by applicable law or agreed to in writing, software
+# * distributed under the License is distributed on an "AS IS" BASIS,
+# * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# * See the License for the specific language governing permissions and
+# * limitations under the License.
+# ***************************************************************************/
+
+from concurrent.futures import Future
+
+import pytest
+import requests
+
+from core.config import Config
+from core.ves import VesCollector, VesEvent
+
+URL = "http://127.0.0.1:8443/eventListener/v7"
+
+class FakeResponse:
+    def __init__(self, status_code: int) -> None:
+        self.status_code = status_code
+        self.text = ""
+
+@pytest.fixture
+def config(monkeypatch):
+    config = Config()
+    monkeypatch.setattr(config, "ves_spool_path", "")
+    monkeypatch.setattr(config, "ves_batch_size", 1)
+    return config
+
+def new_event(domain: str = "heartbeat") -> VesEvent:
+    return VesEvent(b'{"commonEventHeader":{"domain":"' + domain.encode() + b'"}}', domain, None, Future())
+
+def test_full_queue_drops_the_event(config, monkeypatch):
+    monkeypatch.setattr(config, "ves_queue_size", 2)
+    collector = VesCollector(0, URL)
+    events = [new_event() for _ in range(3)]
+    assert [collector.enqueue(event) for event in events] == [True, True, False]
+    assert events[2].future.result() is False
+    assert not events[0].future.done()
+    assert collector.get_stats()["dropped"] == 1
+    assert collector.get_stats()["queue-depth"] == 2
+
+def test_workers_deliver_the_queued_events(config, monkeypatch):
+    monkeypatch.setattr(config, "ves_workers", 2)
+    collector = VesCollector(0, URL)
+    posts = []
+    def post(url, data=None, headers=None, timeout=None):
+        posts.append(data)
+        return FakeResponse(202)
+    monkeypatch.setattr(collector.session, "post", post)
+
+    collector.start_workers()
+    events = [new_event() for _ in range(10)]
+    for event in events:
+        collector.enqueue(event)
+    assert all(event.future.result(timeout=5) for event in events)
+    assert len(posts) == 10
+    assert posts[0] == b'{"event":{"commonEventHeader":{"domain":"heartbeat"}}}'
+
+def test_client_error_resolves_to_false(config, monkeypatch):
+    collector = VesCollector(0, URL)
+    monkeypatch.setattr(collector.session, "post", lambda url, data=None, headers=None, timeout=None: FakeResponse(400))
+    event = new_event()
+    collector.deliver([event])
+    assert event.future.result() is False
+
+def test_connection_error_is_raised_by_the_future(config, monkeypatch):
+    collector = VesCollector(0, URL)
+    def post(url, data=None, headers=None, timeout=None):
+        raise requests.ConnectionError("refused")
+    monkeypatch.setattr(collector.session, "post", post)
+    event = new_event()
+    collector.deliver([event])
+    assert isinstance(event.future.exception(), requests.ConnectionError)
+
+def test_cancelled_event_is_not_sent(config, monkeypatch):
+    collector = VesCollector(0, URL)
+    posts = []
+    monkeypatch.setattr(collector.session, "post", lambda url, data=None, headers=None, timeout=None: posts.append(data))
+    event = new_event()
+    event.future.cancel()
+    collector.deliver([event])
+    assert posts == []
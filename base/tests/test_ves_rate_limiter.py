@@ -0,0 +1,113 @@
+# /*************************************************************************
+# *
+# * Copyright 2025 highstreet technologies and others
+# *
+# * Licensed under the Apache License, Version 2.0 (the "License");
+# * you may not use this file except in compliance with the License.
+# * You may obtain a copy of the License at
+# *
+# *     http://www.apache.org/licenses/LICENSE-2.0
+# *
+# * Unless required by applicable law or agreed to in writing, software
+# * distributed under the License is distributed on an "AS IS" BASIS,
+# * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# * See the License for the specific language governing permissions and
+# * limitations under the License.
+# ***************************************************************************/
+
+import time
+from concurrent.futures import Future
+
+from core.config import Config
+from core.ves import VesCollector, VesEvent
+from core.ves_rate_limiter import VesRateLimiter, RateLimitPolicy, TokenBucket
+
+class FakeResponse:
+    def __init__(self, status_code: int) -> None:
+        self.status_code = status_code
+        self.text = ""
+
+def test_unlimited():
+    limiter = VesRateLimiter(0, 10, RateLimitPolicy.DROP)
+    assert all(limiter.acquire("heartbeat") == 0 for _ in range(1000))
+    assert limiter.get_stats() == {}
+
+def test_drop_over_the_burst():
+    limiter = VesRateLimiter(1, 5, RateLimitPolicy.DROP)
+    results = [limiter.acquire("fault") for _ in range(8)]
+    assert results == [0] * 5 + [None] * 3
+    assert limiter.get_stats()["fault"] == {"passed": 5, "dropped": 3, "delayed": 0}
+
+def test_queue_delays_without_blocking():
+    limiter = VesRateLimiter(10, 2, RateLimitPolicy.QUEUE)
+    started = time.monotonic()
+    delays = [limiter.acquire("fault") for _ in range(5)]
+    assert time.monotonic() - started < 0.05
+
+    assert delays[:2] == [0, 0]
+    # each event over the burst reserves the next token, so the delays grow by 1 / rate
+    for previous, delay in zip(delays[1:], delays[2:]):
+        assert delay > previous
+    assert abs(delays[4] - 0.3) < 0.05
+    assert limiter.get_stats()["fault"] == {"passed": 5, "dropped": 0, "delayed": 3}
+
+def test_queue_drops_over_the_max_delay():
+    limiter = VesRateLimiter(10, 2, RateLimitPolicy.QUEUE, max_delay=0.25)
+    delays = [limiter.acquire("fault") for _ in range(6)]
+    # the third token over the burst would be due after 0.3 s
+    assert delays[4:] == [None, None]
+    assert max(delays[:4]) <= 0.25
+    assert limiter.get_stats()["fault"] == {"passed": 4, "dropped": 2, "delayed": 2}
+
+def test_domains_have_their_own_buckets():
+    limiter = VesRateLimiter(1, 1, RateLimitPolicy.DROP)
+    limiter.configure(rate=0, domain="heartbeat")
+    assert limiter.acquire("fault") == 0
+    assert limiter.acquire("fault") is None
+    assert limiter.acquire("measurement") == 0
+    assert all(limiter.acquire("heartbeat") == 0 for _ in range(10))
+
+    limiter.remove("heartbeat")
+    assert limiter.acquire("heartbeat") == 0
+    assert limiter.acquire("heartbeat") is None
+
+def test_configure_keeps_unset_values():
+    limiter = VesRateLimiter(10, 5, RateLimitPolicy.QUEUE)
+    limiter.configure(burst=20, domain="fault")
+    limiter.configure(policy=RateLimitPolicy.DROP)
+    assert limiter.get_config() == {"policy": "drop", "max-delay": 0, "default": {"rate": 10, "burst": 5}, "domains": {"fault": {"rate": 10, "burst": 20}}}
+
+def test_bucket_refills():
+    bucket = TokenBucket(100, 1)
+    assert bucket.take() == 0
+    assert bucket.take() > 0
+    time.sleep(0.02)
+    assert bucket.take() == 0
+
+def test_delayed_events_do_not_hold_up_the_workers(monkeypatch):
+    config = Config()
+    monkeypatch.setattr(config, "ves_spool_path", "")
+    monkeypatch.setattr(config, "ves_batch_size", 1)
+    monkeypatch.setattr(config, "ves_workers", 1)
+    collector = VesCollector(0, "http://127.0.0.1:8443/eventListener/v7")
+    posts = []
+    def post(url, data=None, headers=None, timeout=None):
+        posts.append((data, time.monotonic()))
+        return FakeResponse(202)
+    monkeypatch.setattr(collector.session, "post", post)
+    collector.start_workers()
+
+    started = time.monotonic()
+    delayed = VesEvent(b'"fault"', "fault", None, Future(), delay=0.3)
+    collector.enqueue(delayed)
+    assert collector.get_stats()["held"] == 1
+    other = VesEvent(b'"heartbeat"', "heartbeat", None, Future())
+    collector.enqueue(other)
+
+    # the single worker sends the event of the other domain while the delayed one is held
+    assert other.future.result(timeout=5)
+    assert time.monotonic() - started < 0.2
+    assert delayed.future.result(timeout=5)
+    assert [data for data, _ in posts] == [b'{"event":"heartbeat"}', b'{"event":"fault"}']
+    assert posts[1][1] - started >= 0.3
+    assert collector.get_stats()["held"] == 0
@@ -0,0 +1,95 @@
+# /*************************************************************************
+# *
+# * Copyright 2025 highstreet technologies and others
+# *
+# * Licensed under the Apache License, Version 2.0 (the "License");
+# * you may not use this file except in compliance with the License.
+# * You may obtain a copy of the License at
+# *
+# *     http://www.apache.org/licenses/LICENSE-2.0
+# *
+# * Unless required by applicable law or agreed to in writing, software
+# * distributed under the License is distributed on an "AS IS" BASIS,
+# * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# * See the License for the specific language governing permissions and
+# * limitations under the License.
+# ***************************************************************************/
+
+from concurrent.futures import Future
+
+import pytest
+
+from core.config import Config, VesRouting
+from core.ves import Ves, get_body_domain_key, get_domain_key
+
+class Message:
+    def __init__(self, domain: str, source: str, namespace: str | None = None) -> None:
+        self.domain = domain
+        self.source = source
+        self.namespace = namespace
+
+    def get_domain_key(self) -> str:
+        return get_domain_key(self.domain, self.namespace)
+
+    def get_source_name(self) -> str:
+        return self.source
+
+def new_ves(monkeypatch, routing: VesRouting, routes: dict[str, int] | None = None, collectors: int = 3) -> Ves:
+    config = Config()
+    monkeypatch.setattr(config, "ves_routing", routing)
+    monkeypatch.setattr(config, "ves_routes", routes or {})
+    # only route() is used, without connecting to any collector
+    ves = object.__new__(Ves)
+    ves.config = config
+    ves.collectors = [f"collector-{index}" for index in range(collectors)]
+    return ves
+
+def test_domain_key():
+    assert get_domain_key("fault", None) == "fault"
+    assert get_domain_key("stndDefined", "o-ran-sc-du-hello-world") == "o-ran-sc-du-hello-world"
+    assert get_domain_key("stndDefined", None) == "stndDefined"
+
+def test_body_domain_key():
+    event = b'{"event":{"commonEventHeader":{"domain":"stndDefined","stndDefinedNamespace":"3GPP-Provisioning"}}}'
+    assert get_body_domain_key(event) == ("3GPP-Provisioning", 1)
+    event_list = b'{"eventList":[{"commonEventHeader":{"domain":"heartbeat"}},{"commonEventHeader":{"domain":"heartbeat"}}]}'
+    assert get_body_domain_key(event_list) == ("heartbeat", 2)
+
+def test_fanout(monkeypatch):
+    ves = new_ves(monkeypatch, VesRouting.FANOUT)
+    assert ves.route(Message("heartbeat", "o-du-1")) == ves.collectors
+
+def test_single_collector(monkeypatch):
+    ves = new_ves(monkeypatch, VesRouting.DOMAIN, {"heartbeat": 1}, collectors=1)
+    assert ves.route(Message("heartbeat", "o-du-1")) == ves.collectors
+
+def test_domain_routes(monkeypatch):
+    ves = new_ves(monkeypatch, VesRouting.DOMAIN, {"heartbeat": 1, "3GPP-FaultSupervision": 2, "fileReady": 4})
+    assert ves.route(Message("heartbeat", "o-du-1")) == ["collector-1"]
+    assert ves.route(Message("stndDefined", "o-du-1", "3GPP-FaultSupervision")) == ["collector-2"]
+    # unrouted domains go to the first collector, indexes wrap around
+    assert ves.route(Message("fault", "o-du-1")) == ["collector-0"]
+    assert ves.route(Message("fileReady", "o-du-1")) == ["collector-1"]
+
+def test_source_shards(monkeypatch):
+    ves = new_ves(monkeypatch, VesRouting.SOURCE)
+    routed = {source: ves.route(Message("heartbeat", source)) for source in [f"o-ru-{i}" for i in range(30)]}
+    assert all(len(collectors) == 1 for collectors in routed.values())
+    assert routed["o-ru-7"] == ves.route(Message("fault", "o-ru-7"))
+    assert len({collectors[0] for collectors in routed.values()}) == 3
+
+def test_combined_future():
+    futures = [Future(), Future()]
+    combined = Ves.combine(futures)
+    futures[0].set_result(True)
+    assert not combined.done()
+    futures[1].set_result(False)
+    assert combined.result() is False
+
+def test_combined_future_raises_the_first_exception():
+    futures = [Future(), Future()]
+    combined = Ves.combine(futures)
+    futures[0].set_result(True)
+    futures[1].set_exception(ConnectionError("refused"))
+    with pytest.raises(ConnectionError):
+        combined.result()
@@ -0,0 +1,44 @@
+# /*************************************************************************
+# *
+# * Copyright 2025 highstreet technologies and others
+# *
+# * Licensed under the Apache License, Version 2.0 (the "License");
+# * you may not use this file except in compliance with the License.
+# * You may obtain a copy of the License at
+# *
+# *     http://www.apache.org/licenses/LICENSE-2.0
+# *
+# * Unless required by applicable law or agreed to in writing, software
+# * distributed under the License is distributed on an "AS IS" BASIS,
+# * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# * See the License for the specific language governing permissions and
+# * limitations under the License.
+# ***************************************************************************/
+
+import threading
+
+from core.ves import VesSequencer
+
+def test_sequence_numbers_per_source():
+    sequencer = VesSequencer()
+    assert [sequencer.next("o-du-1") for _ in range(3)] == [0, 1, 2]
+    assert sequencer.next("o-ru-1") == 0
+    assert sequencer.next("o-du-1") == 3
+    assert sequencer.get_stats() == {"sources": 2}
+
+def test_sequence_numbers_are_unique_across_threads():
+    sequencer = VesSequencer()
+    numbers = []
+    lock = threading.Lock()
+
+    def take():
+        taken = [sequencer.next("source") for _ in range(1000)]
+        with lock:
+            numbers.extend(taken)
+
+    threads = [threading.Thread(target=take) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(numbers) == list(range(8000))
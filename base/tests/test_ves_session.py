@@ -0,0 +1,67 @@
+# /*************************************************************************
+# *
+# * Copyright 2025 highstreet technologies and others
+# *
+# * Licensed under the Apache License, Version 2.0 (the "License");
+# * you may not use this file except in compliance with the License.
+# * You may obtain a copy of the License at
+# *
+# *     http://www.apache.org/licenses/LICENSE-2.0
+# *
+# * Unless required by applicable law or agreed to in writing, software
+# * distributed under the License is distributed on an "AS IS" BASIS,
+# * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# * See the License for the specific language governing permissions and
+# * limitations under the License.
+# ***************************************************************************/
+
+import pytest
+
+from core.config import Config
+from core.ves import VesCollector, VesHTTPAdapter
+
+URL = "http://127.0.0.1:8443/eventListener/v7"
+
+class FakeResponse:
+    def __init__(self, status_code: int) -> None:
+        self.status_code = status_code
+        self.text = ""
+
+@pytest.fixture
+def config(monkeypatch):
+    config = Config()
+    monkeypatch.setattr(config, "ves_spool_path", "")
+    return config
+
+def test_session_pools_the_connections(config, monkeypatch):
+    monkeypatch.setattr(config, "ves_pool_size", 3)
+    collector = VesCollector(0, URL)
+    adapter = collector.session.get_adapter(URL)
+    assert isinstance(adapter, VesHTTPAdapter)
+    assert adapter._pool_maxsize == 3
+    assert adapter._pool_block
+    assert collector.session.headers["Connection"] == "keep-alive"
+    assert collector.session.headers["X-MinorVersion"] == "1"
+
+def test_keepalive_disabled(config, monkeypatch):
+    monkeypatch.setattr(config, "ves_keepalive", False)
+    collector = VesCollector(0, URL)
+    assert collector.session.headers["Connection"] == "close"
+
+def test_posts_reuse_the_session(config, monkeypatch):
+    collector = VesCollector(0, URL)
+    posts = []
+    def post(url, data=None, headers=None, timeout=None):
+        posts.append((url, data))
+        return FakeResponse(202)
+    monkeypatch.setattr(collector.session, "post", post)
+
+    assert collector.post('{"event":{}}')
+    assert collector.post(b'{"event":{}}')
+    assert posts == [(URL, b'{"event":{}}'), (URL, b'{"event":{}}')]
+
+def test_without_collector_nothing_is_sent(config):
+    collector = VesCollector(0, "")
+    assert collector.send(b'{"event":{}}') is None
+    assert collector.post(b'{"event":{}}')
+    assert collector.spool is None
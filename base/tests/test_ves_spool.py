@@ -0,0 +1,167 @@
+# /*************************************************************************
+# *
+# * Copyright 2025 highstreet technologies and others
+# *
+# * Licensed under the Apache License, Version 2.0 (the "License");
+# * you may not use this file except in compliance with the License.
+# * You may obtain a copy of the License at
+# *
+# *     http://www.apache.org/licenses/LICENSE-2.0
+# *
+# * Unless required by applicable law or agreed to in writing, software
+# * distributed under the License is distributed on an "AS IS" BASIS,
+# * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# * See the License for the specific language governing permissions and
+# * limitations under the License.
+# ***************************************************************************/
+
+import time
+from concurrent.futures import Future
+
+import pytest
+
+from core.config import Config
+from core.ves import VesCollector, VesEvent, EVENTS_DROPPED
+from core.ves_spool import VesSpool, SpoolEviction, SPOOL_HEADER, SPOOL_RECORD
+
+URL = "http://127.0.0.1:8443/eventListener/v7"
+
+class FakeResponse:
+    def __init__(self, status_code: int) -> None:
+        self.status_code = status_code
+        self.text = ""
+
+def record_size(data: bytes) -> int:
+    return SPOOL_RECORD.size + len(data)
+
+def drain(spool: VesSpool) -> list[bytes]:
+    records = []
+    while True:
+        record = spool.peek()
+        if record is None:
+            return records
+        records.append(record[1])
+        spool.pop(record[0])
+
+def test_records_in_order(tmp_path):
+    spool = VesSpool(str(tmp_path / "ves.spool"), 4096)
+    for i in range(5):
+        assert spool.append(f"body {i}".encode())
+    assert len(spool) == 5
+    assert drain(spool) == [f"body {i}".encode() for i in range(5)]
+    assert len(spool) == 0
+    assert spool.get_stats()["bytes"] == 0
+
+def test_reopen_keeps_the_records(tmp_path):
+    path = str(tmp_path / "ves.spool")
+    spool = VesSpool(path, 4096)
+    spool.append(b"first")
+    spool.append(b"second")
+    record = spool.peek()
+    spool.pop(record[0])
+    spool.close()
+
+    spool = VesSpool(path, 4096)
+    assert drain(spool) == [b"second"]
+
+def test_wraps_around(tmp_path):
+    body = b"x" * 100
+    capacity = SPOOL_HEADER.size + 3 * record_size(body)
+    spool = VesSpool(str(tmp_path / "ves.spool"), capacity)
+    for i in range(20):
+        # one record consumed for each one added, the tail reaches the end of the file again and again
+        assert spool.append(bytes([i]) * 100)
+        record = spool.peek()
+        assert record[1] == bytes([i]) * 100
+        spool.pop(record[0])
+    assert len(spool) == 0
+    assert spool.get_stats()["evicted"] == 0
+
+def test_full_evicts_the_oldest(tmp_path):
+    body = b"x" * 100
+    spool = VesSpool(str(tmp_path / "ves.spool"), SPOOL_HEADER.size + 3 * record_size(body), SpoolEviction.OLDEST)
+    for i in range(5):
+        assert spool.append(bytes([i]) * 100)
+    assert drain(spool) == [bytes([i]) * 100 for i in range(2, 5)]
+    assert spool.get_stats()["evicted"] == 2
+
+def test_full_drops_the_newest(tmp_path):
+    body = b"x" * 100
+    spool = VesSpool(str(tmp_path / "ves.spool"), SPOOL_HEADER.size + 3 * record_size(body), SpoolEviction.NEWEST)
+    for i in range(5):
+        assert spool.append(bytes([i]) * 100) == (i < 3)
+    assert drain(spool) == [bytes([i]) * 100 for i in range(3)]
+    assert spool.get_stats()["evicted"] == 2
+
+def test_record_larger_than_the_spool(tmp_path):
+    spool = VesSpool(str(tmp_path / "ves.spool"), 256)
+    assert not spool.append(b"x" * 256)
+    assert len(spool) == 0
+
+def test_pop_after_eviction_keeps_the_new_head(tmp_path):
+    body = b"x" * 100
+    spool = VesSpool(str(tmp_path / "ves.spool"), SPOOL_HEADER.size + 2 * record_size(body))
+    spool.append(b"a" * 100)
+    spool.append(b"b" * 100)
+    record = spool.peek()
+    # evicts the record being delivered
+    spool.append(b"c" * 100)
+    spool.pop(record[0])
+    assert drain(spool) == [b"b" * 100, b"c" * 100]
+
+@pytest.fixture
+def config(monkeypatch, tmp_path):
+    config = Config()
+    monkeypatch.setattr(config, "ves_spool_path", str(tmp_path / "ves.spool"))
+    monkeypatch.setattr(config, "ves_spool_size", 4096)
+    monkeypatch.setattr(config, "ves_batch_size", 1)
+    return config
+
+def new_collector(monkeypatch, status_code: int) -> VesCollector:
+    collector = VesCollector(0, URL)
+    collector.posts = []
+    def post(url, data=None, headers=None, timeout=None):
+        collector.posts.append(data)
+        return FakeResponse(collector.status_code)
+    collector.status_code = status_code
+    monkeypatch.setattr(collector.session, "post", post)
+    return collector
+
+def new_event() -> VesEvent:
+    return VesEvent(b'{"commonEventHeader":{"domain":"heartbeat"}}', "heartbeat", None, Future())
+
+def test_retryable_failure_is_spooled_and_handed_over(config, monkeypatch):
+    collector = new_collector(monkeypatch, 503)
+    event = new_event()
+    collector.deliver([event])
+    # the spool delivers it, the producer must not send it again
+    assert event.future.result() is True
+    assert len(collector.spool) == 1
+
+def test_client_error_is_not_spooled(config, monkeypatch):
+    collector = new_collector(monkeypatch, 400)
+    event = new_event()
+    collector.deliver([event])
+    assert event.future.result() is False
+    assert len(collector.spool) == 0
+
+def test_spooled_body_is_replayed(config, monkeypatch):
+    collector = new_collector(monkeypatch, 202)
+    assert collector.spool_body(b'{"event":{"commonEventHeader":{"domain":"heartbeat"}}}', "heartbeat", 1)
+    deadline = time.monotonic() + 5
+    while len(collector.spool) > 0 and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert len(collector.spool) == 0
+    assert collector.posts == [b'{"event":{"commonEventHeader":{"domain":"heartbeat"}}}']
+
+def test_without_spool_the_event_is_dropped(config, monkeypatch):
+    monkeypatch.setattr(config, "ves_spool_path", "")
+    collector = new_collector(monkeypatch, 503)
+    dropped = EVENTS_DROPPED.get("heartbeat", "undeliverable")
+    event = new_event()
+    collector.deliver([event])
+    assert event.future.result() is False
+    assert EVENTS_DROPPED.get("heartbeat", "undeliverable") == dropped + 1
+
+def test_no_spool_without_collector(config):
+    assert VesCollector(0, "").spool is None
@@ -1,21 +1,23 @@
-import json
 import os
 import socket
 import ssl
 import threading
 
-from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 
 import xml.etree.ElementTree as ET
 
 from core.dict_factory import DictFactory, BaseTemplate
 from core.extension import Extension
 from core.config import Config
-from core.netconf import Datastore, Netconf
+from core.netconf import Datastore, Netconf, OperDataProvider
 from core.ves import Ves, VesMessage
 from util.docker import get_hostname
 from util.logging import get_pynts_logger
 from util.threading import stop_event, sa_sleep
+from util import serializer
+from util.serializer import JsonFragment
 from libyang.util import LibyangError, DataType, c2str
 
 from netconf_client.connect import connect_tls
@@ -38,6 +40,11 @@ active_sessions = {}
 # Lock to ensure thread-safe operations on the active_sessions dictionary
 session_lock = threading.Lock()
 
+# prebuilt stndDefined envelopes of forwarded notifications, per (module, notification, source O-RU), least recently used first
+envelope_cache: OrderedDict[tuple, dict] = OrderedDict()
+envelope_lock = threading.Lock()
+ENVELOPE_CACHE_SIZE = 4096
+
 class Main(Extension):
     def init(self) -> None:
         self.netconf = Netconf()
@@ -45,6 +52,15 @@ class Main(Extension):
         self.ves: Ves = Ves()
                 
         self.max_workers = 5  # Number of threads in the pool
+        self.aggregation_provider = AggregatedOruProvider(self)
+
+        # ietf-hardware reads of the connected O-RUs, all at once, within a deadline shorter than sysrepo's operational callback timeout
+        self.oru_read_timeout = self.config.o_du_oru_read_timeout_ms / 1000
+        self.oru_read_executor = ThreadPoolExecutor(max_workers=self.config.o_du_oru_read_workers, thread_name_prefix="oru-read")
+        # reads still running after their deadline are not started again, later requests wait for them instead
+        self.oru_reads: dict[str, Future] = {}
+        self.oru_read_timeouts: dict[str, int] = {}
+        self.oru_read_lock = threading.Lock()
 
         DictFactory.add_template("3gpp-managed-element", _3GPP_ManagedElementTemplate)
 
@@ -54,7 +70,7 @@ class Main(Extension):
         self.ves_pnfregistration = VesPnfRegistrationFeature()
         self.ves_pnfregistration.start()        
         
-        self.netconf.operational.subscribe_oper_data_request("o-ran-aggregation-base", "/o-ran-aggregation-base:aggregated-o-ru/*", self.o_ran_aggregation_base_oper_data_cb, oper_merge=True)
+        self.aggregation_provider.subscribe(oper_merge=True)
         logger.debug("subscribing to operational data requests: /o-ran-aggregation-base:aggregated-o-ru/*")                
                                 
         host = "::"
@@ -81,29 +97,65 @@ class Main(Extension):
         #             time.sleep(30)
         ### end sample notification from YANG Schema Mount 
         
-    def o_ran_aggregation_base_oper_data_cb(self, xpath, private_data):
-      
-      global active_sessions
-      num_of_sessions = len(list(active_sessions.keys()))
-      if num_of_sessions == 0:
-        return None
+    def get_aggregated_o_ru_xml(self) -> tuple[str | None, bool]:
+      """
+      Fetches the ietf-hardware of every connected O-RU, with concurrent <get>s which must all answer within
+      O_DU_ORU_READ_TIMEOUT_MS. Returns the aggregated XML of the O-RUs which answered in time (None when
+      there is no connected O-RU), and whether all of them did. An O-RU whose previous read is still running
+      is not asked again, its answer to that read is waited for.
+      """
+      with session_lock:
+        sessions = list(active_sessions.values())
+      if len(sessions) == 0:
+        return None, True
+
+      futures: dict[Future, str] = {}
+      with self.oru_read_lock:
+        for value in sessions:
+          hostname = value["hostname"]
+          future = self.oru_reads.get(hostname)
+          if future is None:
+            future = self.oru_read_executor.submit(self.get_o_ru_hardware_xml, value["session"])
+            self.oru_reads[hostname] = future
+            future.add_done_callback(lambda future, hostname=hostname: self.end_o_ru_read(hostname, future))
+          futures[future] = hostname
+      done, not_done = wait(futures, timeout=self.oru_read_timeout)
+
+      for future in not_done:
+        # reads still waiting for a worker are dropped, running ones cannot be interrupted
+        future.cancel()
 
       agg_base_xml = f"<aggregated-o-ru xmlns=\"urn:o-ran:agg-base:1.0\">\n"
-
-      for _, value in active_sessions.items():        
-        mgr = value["session"]
-        xml_data_str = mgr.get(filter="<filter><hw:hardware xmlns:hw=\"urn:ietf:params:xml:ns:yang:ietf-hardware\"/></filter>").data_xml        
-
-        with self.netconf.connection.get_ly_ctx() as ctx:
-          ietf_hw_xml = self.get_xml_string_from_response(xml_data_str)
-          aggregation_instance_xml = f"<aggregation><ru-instance>{value['hostname']}</ru-instance><ietf-hardware-model xmlns=\"urn:o-ran:agg-ietf-hardware:1.0\">{ietf_hw_xml}</ietf-hardware-model></aggregation>"
-          agg_base_xml += f"{aggregation_instance_xml}"
+      complete = len(not_done) == 0
+      # in the order of the sessions, so that the same O-RUs always give the same data
+      for future, hostname in futures.items():
+        if future in not_done or future.cancelled():
+          complete = False
+          with self.oru_read_lock:
+            timeouts = self.oru_read_timeouts.get(hostname, 0) + 1
+            self.oru_read_timeouts[hostname] = timeouts
+          logger.warning(f"O-RU {hostname} did not answer the ietf-hardware <get> within {self.oru_read_timeout}s, left out ({timeouts} times so far)")
+          continue
+        if future.exception() is not None:
+          complete = False
+          logger.error(f"Could not get the ietf-hardware of O-RU {hostname}, left out. Error: {future.exception()}")
+          continue
+
+        aggregation_instance_xml = f"<aggregation><ru-instance>{hostname}</ru-instance><ietf-hardware-model xmlns=\"urn:o-ran:agg-ietf-hardware:1.0\">{future.result()}</ietf-hardware-model></aggregation>"
+        agg_base_xml += f"{aggregation_instance_xml}"
         
       agg_base_xml += f"</aggregated-o-ru>"                      
       logger.debug(f"Constructed XML: {agg_base_xml}")
-                        
-      data = ctx.parse_data_mem(agg_base_xml, "xml", parse_only=True)
-      return data       
+      return agg_base_xml, complete
+
+    def end_o_ru_read(self, hostname: str, future: Future) -> None:
+      with self.oru_read_lock:
+        if self.oru_reads.get(hostname) is future:
+          del self.oru_reads[hostname]
+
+    def get_o_ru_hardware_xml(self, mgr) -> str:
+      xml_data_str = mgr.get(filter="<filter><hw:hardware xmlns:hw=\"urn:ietf:params:xml:ns:yang:ietf-hardware\"/></filter>").data_xml
+      return self.get_xml_string_from_response(xml_data_str)
 
     def handle_callhome_session(self, conn, addr, session_id):
       """
@@ -125,6 +177,7 @@ class Main(Extension):
           with session_lock:
               active_sessions[session_id] = {'address': addr, 'session': mgr, 'hostname': hostname_str}
               logger.info(f"Active sessions: {list(active_sessions.keys())}")
+          self.aggregation_provider.invalidate()
 
           mgr.create_subscription()
           
@@ -155,11 +208,13 @@ class Main(Extension):
           # Remove the session from the active_sessions dictionary
           with session_lock:
               if session_id in active_sessions:
-                  self.netconf.running.delete_item(f"/o-ran-aggregation-base:aggregated-o-ru/aggregation[ru-instance=\"{active_sessions[session_id]['hostname']}\"]")
-                  self.netconf.running.apply_changes()
+                  with self.netconf.session(Datastore.RUNNING) as sess:
+                    sess.delete_item(f"/o-ran-aggregation-base:aggregated-o-ru/aggregation[ru-instance=\"{active_sessions[session_id]['hostname']}\"]")
+                    sess.apply_changes()
                   del active_sessions[session_id]
                   logger.info(f"Session {session_id} with {addr} closed")
                   logger.debug(f"Active sessions: {list(active_sessions.keys())}")
+          self.aggregation_provider.invalidate()
 
 
     def accept_tls_connections(self, host, port, max_connections=5):
@@ -202,24 +257,25 @@ class Main(Extension):
         with self.netconf.connection.get_ly_ctx() as ctx:
           dnode = ctx.parse_op_mem("xml", notification_xml, DataType.NOTIF_NETCONF)
           # parse_op_mem removes the <notification> and <eventTime> tags and retrieves only the notification itself.
-          # we need to add them back manually
-          j_str = dnode.print_mem("json", with_siblings=True)
-          j_obj = json.loads(j_str)
-          json_ev_time = {"eventTime": event_time_element.text}     
-          json_notif = {"notifications:notification": json_ev_time | j_obj}
+          # we need to add them back manually; the notification JSON printed by libyang is spliced in as-is, without parsing it again
+          j_str = dnode.print_mem("json", with_siblings=True, pretty=False)
+          json_ev_time = serializer.dumps({"eventTime": event_time_element.text})
+          json_notif = {"notifications:notification": JsonFragment(json_ev_time[:-1] + "," + j_str.strip()[1:])}
           
-          if 'ietf-netconf-notifications:netconf-config-change' in j_obj.keys():
+          if dnode.module().name() == "ietf-netconf-notifications" and dnode.name() == "netconf-config-change":
             self.sync_running(session_id)
+          if dnode.module().name() == "ietf-hardware":
+            self.aggregation_provider.invalidate()
           self.send_ves_event_notification(json_notif, dnode.module().name(), dnode.name(), c2str(dnode.module().cdata.ns), active_sessions[session_id]['hostname'])
-          logger.debug(f"Received notification on {event_time_element.text} with content {json_notif}")          
+          logger.debug(f"Received notification on {event_time_element.text} with content {j_str}")          
           dnode.free()          
       except LibyangError as e:
         logger.error(f"Failed to get JSON object from XML: {notification_xml}. Error: {e}")
 
-    def send_ves_event_notification(self, json_notif: str, module: str, notif_name: str, namespace: str, source_hostname: str) -> None:
+    def send_ves_event_notification(self, json_notif: dict, module: str, notif_name: str, namespace: str, source_hostname: str) -> None:
       logger.debug(f"Trying to wrap {module}:{notif_name} from namespace {namespace} which came from source {source_hostname}")
       ves_event = VesEventNotificationWrapper(notif=json_notif, namespace=namespace, schema=module, notif_name=notif_name, source_oru=source_hostname)
-      self.ves.execute(ves_event)
+      self.ves.submit(ves_event)
       
 
     def sync_running(self, session_id) -> None:
@@ -242,7 +298,7 @@ class Main(Extension):
                           
           data = ctx.parse_data_mem(agg_base_xml, "xml", parse_only=True)
           
-          with self.netconf.connection.start_session("running") as sess:
+          with self.netconf.session(Datastore.RUNNING) as sess:
             sess.edit_batch_ly(data)
             sess.apply_changes()
           
@@ -255,7 +311,7 @@ class Main(Extension):
 
         _3gpp_managed_element_template.update_key(["_3gpp-common-managed-element:ManagedElement", 0, "_3gpp-nr-nrm-gnbdufunction:GNBDUFunction", 0, "attributes", "gNBDUName"], get_hostname())
 
-        with self.netconf.connection.start_session("running") as sess:                    
+        with self.netconf.session(Datastore.RUNNING) as sess:
             sess.edit_batch(_3gpp_managed_element_template.data, "_3gpp-common-managed-element")
             sess.apply_changes()
             
@@ -268,8 +324,8 @@ class Main(Extension):
       try:
         with self.netconf.connection.get_ly_ctx() as ctx:
           dnode = ctx.parse_data_mem(modified_byte_string, "xml", validate_present=True, no_state=True)
-          j_str = dnode.print_mem("json", with_siblings=True)
-          j_obj = json.loads(j_str)
+          j_str = dnode.print_mem("json", with_siblings=True, pretty=False)
+          j_obj = serializer.loads(j_str)
           dnode.free()
           return j_obj
       except LibyangError as e:
@@ -295,6 +351,37 @@ class Main(Extension):
  
         
 
+"""
+AggregatedOruProvider
+----
+Operational data of o-ran-aggregation-base: the ietf-hardware of the connected O-RUs, fetched from
+them at most every OPER_DATA_TTL_MS (and in the background for OPER_DATA_STALE_MS after that)
+instead of on every read, and again after an O-RU connected, disconnected or sent an ietf-hardware
+notification. Data missing O-RUs which did not answer in time is not kept.
+"""
+class AggregatedOruProvider(OperDataProvider):
+    def __init__(self, main: Main) -> None:
+        config = Config()
+        super().__init__("o-ran-aggregation-base", "/o-ran-aggregation-base:aggregated-o-ru/*", config.oper_data_ttl_ms / 1000, config.oper_data_stale_ms / 1000)
+        self.main = main
+
+    def load(self, xpath: str) -> str | None:
+        # the same data for all requested xpaths
+        data, complete = self.main.get_aggregated_o_ru_xml()
+        if not complete:
+            # answered, but not kept, so that the O-RUs left out are asked again on the next request
+            self.invalidate()
+        return data
+
+    def get(self, xpath: str) -> str | None:
+        return super().get(self.xpath)
+
+    def render(self, data: str | None):
+        if data is None:
+            return None
+        with self.main.netconf.connection.get_ly_ctx() as ctx:
+            return ctx.parse_data_mem(data, "xml", parse_only=True)
+
 class _3GPP_ManagedElementTemplate(BaseTemplate):
     """A dictionary template for _3gpp-common-managed-element:ManagedElement objects."""
     def create_dict(self):
@@ -401,15 +488,11 @@ class _3GPP_ManagedElementTemplate(BaseTemplate):
             }                
 
 class VesEventNotificationWrapper(VesMessage):
+    envelope: dict
+
     def __init__(self, notif: dict, namespace: str = None, schema: str = None, notif_name: str = None, source_oru: str = None):
         super().__init__()
 
-        self.data["event"]["stndDefinedFields"] = {
-              #"schemaReference": "https://gerrit.o-ran-sc.org/r/gitweb?p=scp/oam/modeling.git;a=blob;f=data-model/yang/published/o-ran/ru-fh/o-ran-file-management.yang",
-              #"data": {},
-              "stndDefinedFieldsVersion": "1.0"
-            }
-
         self.namespace = namespace
         self.domain = "stndDefined"
         self.priority = "Normal"
@@ -419,17 +502,46 @@ class VesEventNotificationWrapper(VesMessage):
         self.event_type = f"ORU-YANG/{self.schema}:{self.notif_name}"
         self.source_oru = source_oru                
 
+    def get_static_header(self, vendor: str) -> dict:
+        key = (self.schema, self.notif_name, self.source_oru, self.namespace, self.hostname, vendor)
+        with envelope_lock:
+            envelope = envelope_cache.get(key)
+            if envelope is not None:
+                envelope_cache.move_to_end(key)
+
+        if envelope is None:
+            envelope = self.build_envelope(vendor)
+            with envelope_lock:
+                envelope_cache[key] = envelope
+                while len(envelope_cache) > ENVELOPE_CACHE_SIZE:
+                    envelope_cache.popitem(last=False)
+
+        self.envelope = envelope
+        return envelope["commonEventHeader"]
+
+    def build_envelope(self, vendor: str) -> dict:
+        header = self.build_static_header(vendor)
+        header["eventName"] = self.event_type
+        if self.source_oru is not None:
+          header["sourceName"] = self.source_oru
+          header["sourceId"] = self.source_oru
+
+        return {
+            "commonEventHeader": header,
+            "stndDefinedFields": {
+                "schemaReference": "https://o-ran-sc.org/any-standard-defined-message.yaml",
+                "stndDefinedFieldsVersion": "1.0"
+            }
+        }
+
     def update(self) -> None:
+        # the envelope comes from get_static_header(), only timestamps, sequence, eventId and data change per notification
         super().update()
-        
-        ves = Ves()
-        
-        self.data["event"]["commonEventHeader"]["eventName"] = self.event_type
-        self.data["event"]["commonEventHeader"]["eventId"] = f"{self.domain}-ORU-YANG-{ves.seq_id}"
 
-        self.data["event"]["stndDefinedFields"]["data"] = self.notification
-        self.data["event"]["stndDefinedFields"]["schemaReference"] = f"https://o-ran-sc.org/any-standard-defined-message.yaml"
-        
-        if self.source_oru is not None:
-          self.data["event"]["commonEventHeader"]["sourceName"] = self.source_oru
-          self.data["event"]["commonEventHeader"]["sourceId"] = self.source_oru
+        fields = self.envelope["stndDefinedFields"].copy()
+        fields["data"] = self.notification
+        self.data["event"]["stndDefinedFields"] = fields
+
+    def set_sequence(self, sequence: int) -> None:
+        super().set_sequence(sequence)
+        self.data["event"]["commonEventHeader"]["eventId"] = f"{self.domain}-ORU-YANG-{sequence}"
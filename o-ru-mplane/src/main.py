@@ -62,8 +62,8 @@ class Main(Extension):
         o_ran_certificates_template = DictFactory.get_template("o-ran-certificates")
         o_ran_certificates_template.update_key(["o-ran-certificates", "certificate-parameters", "cert-maps", "cert-to-name", 0, "fingerprint"], self.crypto_util.get_certificate_fingerprint(self.crypto_util.root_odu_ca_cert))
 
-        self.netconf.set_data(Datastore.RUNNING, "", o_ran_certificates_template.data)
-        self.netconf.set_data(Datastore.OPERATIONAL, "", o_ran_certificates_template.data)
+        self.netconf.set_data(Datastore.RUNNING, "", o_ran_certificates_template.data, diff=True)
+        self.netconf.set_data(Datastore.OPERATIONAL, "", o_ran_certificates_template.data, diff=True)
         
 
     def start_odl_allow_thread(self):